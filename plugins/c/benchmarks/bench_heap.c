@@ -0,0 +1,93 @@
+// Times pushing random priorities and popping them all again with
+// slh_heap, against a queue that scans for the smallest element on
+// every pop.
+
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+
+#include "slh/heap.h"
+#include "slh/vec.h"
+
+// the linear scan is quadratic, skip it for large sizes
+#define MAX_LINEAR 30000
+
+static int64_t now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1000000000 + ts.tv_nsec;
+}
+
+static int cmp_int(const void *a, const void *b) {
+    int x = *(const int *)a;
+    int y = *(const int *)b;
+    return (x > y) - (x < y);
+}
+
+static int64_t time_heap(const int *values, size_t n, int64_t *duration) {
+    int64_t start = now_ns();
+    slh_heap_t *heap = slh_heap_create(sizeof(int), &cmp_int);
+    for (size_t i = 0; i < n; i++) {
+        slh_heap_push(heap, &values[i]);
+    }
+    int64_t checksum = 0;
+    int value;
+    for (size_t i = 0; slh_heap_pop(heap, &value); i++) {
+        checksum += value * (int64_t)i;
+    }
+    slh_heap_free(heap);
+    *duration = now_ns() - start;
+    return checksum;
+}
+
+static int64_t time_linear(const int *values, size_t n, int64_t *duration) {
+    int64_t start = now_ns();
+    int *queue = slh_vec_create(0, sizeof(int));
+    for (size_t i = 0; i < n; i++) {
+        queue = slh_vec_append(queue, &values[i]);
+    }
+    int64_t checksum = 0;
+    for (size_t i = 0; slh_vec_size(queue) > 0; i++) {
+        size_t smallest = 0;
+        for (size_t j = 1; j < slh_vec_size(queue); j++) {
+            if (queue[j] < queue[smallest]) {
+                smallest = j;
+            }
+        }
+        checksum += queue[smallest] * (int64_t)i;
+        // the last element takes the place of the smallest
+        slh_vec_pop(queue, &queue[smallest]);
+    }
+    slh_vec_free(queue);
+    *duration = now_ns() - start;
+    return checksum;
+}
+
+int main(void) {
+    const size_t sizes[] = {1000, 10000, 30000, 100000, 1000000};
+
+    printf("%9s %14s %14s\n", "elements", "slh_heap", "linear scan");
+    for (size_t i = 0; i < sizeof(sizes) / sizeof(sizes[0]); i++) {
+        size_t n = sizes[i];
+        int *values = malloc(n * sizeof(int));
+        for (size_t j = 0; j < n; j++) {
+            values[j] = rand() % 1000000;
+        }
+
+        int64_t heaped;
+        int64_t checksum = time_heap(values, n, &heaped);
+        printf("%9zu %11.3f ms", n, heaped / 1e6);
+        if (n <= MAX_LINEAR) {
+            int64_t scanned;
+            if (time_linear(values, n, &scanned) != checksum) {
+                printf("\nslh_heap and the linear scan disagree\n");
+                return 1;
+            }
+            printf(" %11.3f ms", scanned / 1e6);
+        }
+        printf("\n");
+        free(values);
+    }
+    return 0;
+}
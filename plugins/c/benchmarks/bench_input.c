@@ -0,0 +1,108 @@
+// Times loading generated inputs with slh_file_read_text against reading
+// a copy with fread, the way inputs used to be loaded. Mapped pages are
+// only read in once touched, so a scan over the input (counting lines)
+// is timed along with the load as well.
+
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+#include <unistd.h>
+
+#include "input.h"
+
+#define REPEAT 10
+
+static int64_t now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1000000000 + ts.tv_nsec;
+}
+
+static slh_sized_ptr_t fread_text(char *filename) {
+    FILE *file = fopen(filename, "r");
+    fseek(file, 0, SEEK_END);
+    long file_size = ftell(file);
+    rewind(file);
+
+    char *buffer = malloc(file_size + 1);
+    size_t nread = fread(buffer, 1, file_size, file);
+    buffer[nread] = '\0';
+    fclose(file);
+    return (slh_sized_ptr_t){.ptr = buffer, .size = nread};
+}
+
+static void fread_free(slh_sized_ptr_t text) { free(text.ptr); }
+
+static size_t count_lines(slh_sized_ptr_t text) {
+    size_t lines = 0;
+    for (size_t i = 0; i < text.size; ++i) {
+        lines += text.ptr[i] == '\n';
+    }
+    return lines;
+}
+
+// Lines of random numbers, like a typical puzzle input.
+static void generate_input(char *filename, size_t size) {
+    FILE *file = fopen(filename, "w");
+    size_t written = 0;
+    while (written < size) {
+        written += fprintf(file, "%d %d\n", rand() % 100000, rand() % 100000);
+    }
+    fclose(file);
+}
+
+typedef struct {
+    int64_t load;
+    int64_t scan;
+} timing_t;
+
+// Fastest load, and load followed by a scan, out of REPEAT runs.
+static timing_t time_loader(char *filename,
+                            slh_sized_ptr_t (*load)(char *filename),
+                            void (*release)(slh_sized_ptr_t text)) {
+    timing_t best = {.load = INT64_MAX, .scan = INT64_MAX};
+    size_t lines = 0;
+    for (int i = 0; i < REPEAT; ++i) {
+        int64_t start = now_ns();
+        slh_sized_ptr_t text = load(filename);
+        int64_t loaded = now_ns();
+        lines += count_lines(text);
+        int64_t scanned = now_ns();
+        release(text);
+
+        if (loaded - start < best.load) {
+            best.load = loaded - start;
+        }
+        if (scanned - start < best.scan) {
+            best.scan = scanned - start;
+        }
+    }
+    // keep the scan from being optimized away
+    if (lines == 0) {
+        printf("no lines read from %s\n", filename);
+    }
+    return best;
+}
+
+int main(void) {
+    const size_t sizes_mib[] = {1, 8, 64};
+
+    printf("%8s %14s %14s %14s %14s\n", "size", "fread load", "mmap load",
+           "fread + scan", "mmap + scan");
+    for (size_t i = 0; i < sizeof(sizes_mib) / sizeof(sizes_mib[0]); ++i) {
+        char filename[] = "/tmp/bench_input_XXXXXX";
+        close(mkstemp(filename));
+        generate_input(filename, sizes_mib[i] << 20);
+
+        timing_t copied = time_loader(filename, &fread_text, &fread_free);
+        timing_t mapped =
+            time_loader(filename, &slh_file_read_text, &slh_file_free_text);
+        unlink(filename);
+
+        printf("%5zu MiB %11.3f ms %11.3f ms %11.3f ms %11.3f ms\n",
+               sizes_mib[i], copied.load / 1e6, mapped.load / 1e6,
+               copied.scan / 1e6, mapped.scan / 1e6);
+    }
+    return 0;
+}
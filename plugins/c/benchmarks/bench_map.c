@@ -0,0 +1,83 @@
+// Times building a set of random keys and looking them all up again with
+// slh_map, against the linear scans of slh_vec_find that set style
+// puzzles used to rely on.
+
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+
+#include "slh/map.h"
+#include "slh/vec.h"
+
+// the linear scan is quadratic, skip it for large sizes
+#define MAX_LINEAR 20000
+
+static int64_t now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1000000000 + ts.tv_nsec;
+}
+
+static size_t time_map(const int64_t *keys, size_t n, int64_t *duration) {
+    int64_t start = now_ns();
+    slh_map_t *set = slh_map_create(sizeof(int64_t), 0, NULL, NULL);
+    for (size_t i = 0; i < n; i++) {
+        if (!slh_map_contains(set, &keys[i])) {
+            slh_map_put(set, &keys[i], NULL);
+        }
+    }
+    size_t found = 0;
+    for (size_t i = 0; i < n; i++) {
+        found += slh_map_contains(set, &keys[i]);
+    }
+    slh_map_free(set);
+    *duration = now_ns() - start;
+    return found;
+}
+
+static size_t time_linear(const int64_t *keys, size_t n, int64_t *duration) {
+    int64_t start = now_ns();
+    int64_t *set = slh_vec_create(0, sizeof(int64_t));
+    for (size_t i = 0; i < n; i++) {
+        if (slh_vec_find(set, &keys[i]) == -1) {
+            set = slh_vec_append(set, &keys[i]);
+        }
+    }
+    size_t found = 0;
+    for (size_t i = 0; i < n; i++) {
+        found += slh_vec_find(set, &keys[i]) != -1;
+    }
+    slh_vec_free(set);
+    *duration = now_ns() - start;
+    return found;
+}
+
+int main(void) {
+    const size_t sizes[] = {1000, 10000, 100000, 1000000};
+
+    printf("%9s %14s %14s\n", "keys", "slh_map", "slh_vec_find");
+    for (size_t i = 0; i < sizeof(sizes) / sizeof(sizes[0]); i++) {
+        size_t n = sizes[i];
+        int64_t *keys = malloc(n * sizeof(int64_t));
+        for (size_t j = 0; j < n; j++) {
+            // roughly half of the keys repeat
+            keys[j] = rand() % (n / 2 + 1);
+        }
+
+        int64_t mapped;
+        size_t found = time_map(keys, n, &mapped);
+        printf("%9zu %11.3f ms", n, mapped / 1e6);
+        if (n <= MAX_LINEAR) {
+            int64_t scanned;
+            if (time_linear(keys, n, &scanned) != found) {
+                printf("\nslh_map and slh_vec_find disagree\n");
+                return 1;
+            }
+            printf(" %11.3f ms", scanned / 1e6);
+        }
+        printf("\n");
+        free(keys);
+    }
+    return 0;
+}
@@ -0,0 +1,102 @@
+// Times parsing generated inputs of robot like lines, "p=x,y v=dx,dy",
+// with slh_scan against splitting them with strtok_r and parsing each
+// line with sscanf. Both sum up all integers so the results can be
+// checked against each other.
+
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+#include "slh/scan.h"
+#include "slh/vec.h"
+
+static int64_t now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1000000000 + ts.tv_nsec;
+}
+
+static slh_sized_ptr_t generate(size_t lines) {
+    // longest line is "p=-99999,-99999 v=-99999,-99999\n"
+    char *buffer = malloc(lines * 32 + 1);
+    size_t size = 0;
+    for (size_t i = 0; i < lines; i++) {
+        size += sprintf(buffer + size, "p=%d,%d v=%d,%d\n", rand() % 100000,
+                        rand() % 100000, rand() % 200000 - 100000,
+                        rand() % 200000 - 100000);
+    }
+    return (slh_sized_ptr_t){.ptr = buffer, .size = size};
+}
+
+static int64_t time_sscanf(slh_sized_ptr_t text, int64_t *duration) {
+    // strtok_r writes into the text, parse a copy
+    char *copy = malloc(text.size + 1);
+    memcpy(copy, text.ptr, text.size + 1);
+
+    int64_t start = now_ns();
+    int64_t sum = 0;
+    char *saveptr;
+    for (char *line = strtok_r(copy, "\n", &saveptr); line != NULL;
+         line = strtok_r(NULL, "\n", &saveptr)) {
+        int px, py, vx, vy;
+        if (sscanf(line, "p=%d,%d v=%d,%d", &px, &py, &vx, &vy) == 4) {
+            sum += px + py + vx + vy;
+        }
+    }
+    *duration = now_ns() - start;
+    free(copy);
+    return sum;
+}
+
+static int64_t time_scan_lines(slh_sized_ptr_t text, int64_t *duration) {
+    int64_t start = now_ns();
+    int64_t sum = 0;
+    slh_scanner_t scanner = slh_scanner(&text);
+    slh_sized_ptr_t line;
+    while (slh_scan_line(&scanner, &line)) {
+        slh_scanner_t ints = slh_scanner(&line);
+        int64_t value;
+        while (slh_scan_int(&ints, &value)) {
+            sum += value;
+        }
+    }
+    *duration = now_ns() - start;
+    return sum;
+}
+
+static int64_t time_scan_ints(slh_sized_ptr_t text, int64_t *duration) {
+    int64_t start = now_ns();
+    int64_t *ints = slh_scan_ints(&text, slh_vec_create(0, sizeof(int64_t)));
+    int64_t sum = 0;
+    for (size_t i = 0; i < slh_vec_size(ints); i++) {
+        sum += ints[i];
+    }
+    slh_vec_free(ints);
+    *duration = now_ns() - start;
+    return sum;
+}
+
+int main(void) {
+    const size_t sizes[] = {1000, 100000, 1000000, 4000000};
+
+    printf("%9s %14s %14s %14s\n", "lines", "sscanf", "slh_scan_int",
+           "slh_scan_ints");
+    for (size_t i = 0; i < sizeof(sizes) / sizeof(sizes[0]); i++) {
+        slh_sized_ptr_t text = generate(sizes[i]);
+
+        int64_t sscanf_ns, lines_ns, ints_ns;
+        int64_t expected = time_sscanf(text, &sscanf_ns);
+        if (time_scan_lines(text, &lines_ns) != expected ||
+            time_scan_ints(text, &ints_ns) != expected) {
+            fprintf(stderr, "sums differ for %zu lines\n", sizes[i]);
+            return 1;
+        }
+
+        printf("%9zu %11.2f ms %11.2f ms %11.2f ms\n", sizes[i], sscanf_ns / 1e6,
+               lines_ns / 1e6, ints_ns / 1e6);
+        free(text.ptr);
+    }
+    return 0;
+}
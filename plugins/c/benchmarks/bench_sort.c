@@ -0,0 +1,114 @@
+// Times sorting 10^5 and 10^6 random integers with slh_vec_sort,
+// slh_vec_sort_by_key and qsort, sorting a list of the same size with
+// slh_list_sort, and looking every value up again with
+// slh_vec_lower_bound.
+
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+#include "slh/list.h"
+#include "slh/vec.h"
+
+static int64_t now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec * 1000000000 + ts.tv_nsec;
+}
+
+static int cmp_int(const void *a, const void *b) {
+    int x = *(const int *)a;
+    int y = *(const int *)b;
+    return (x > y) - (x < y);
+}
+
+static uint64_t key_int(const void *elem) {
+    return (uint64_t)(int64_t)(*(const int *)elem) ^ (1ull << 63);
+}
+
+static int *copy_of(const int *values) {
+    int *vec = slh_vec_create(slh_vec_size(values), sizeof(int));
+    for (size_t i = 0; i < slh_vec_size(values); i++) {
+        vec = slh_vec_append(vec, &values[i]);
+    }
+    return vec;
+}
+
+static double time_vec_sort(const int *values) {
+    int *vec = copy_of(values);
+    int64_t start = now_ns();
+    slh_vec_sort(vec, &cmp_int);
+    int64_t duration = now_ns() - start;
+    slh_vec_free(vec);
+    return duration / 1e6;
+}
+
+static double time_sort_by_key(const int *values) {
+    int *vec = copy_of(values);
+    int64_t start = now_ns();
+    slh_vec_sort_by_key(vec, &key_int);
+    int64_t duration = now_ns() - start;
+    slh_vec_free(vec);
+    return duration / 1e6;
+}
+
+static double time_qsort(const int *values) {
+    int *vec = copy_of(values);
+    int64_t start = now_ns();
+    qsort(vec, slh_vec_size(vec), sizeof(int), &cmp_int);
+    int64_t duration = now_ns() - start;
+    slh_vec_free(vec);
+    return duration / 1e6;
+}
+
+static double time_list_sort(const int *values) {
+    slh_node_t *list = NULL;
+    for (size_t i = slh_vec_size(values); i > 0; i--) {
+        slh_list_prepend(&list, values[i - 1]);
+    }
+    int64_t start = now_ns();
+    slh_list_sort(&list);
+    int64_t duration = now_ns() - start;
+    slh_list_free(list);
+    return duration / 1e6;
+}
+
+static double time_lower_bound(const int *values) {
+    int *vec = copy_of(values);
+    slh_vec_sort(vec, &cmp_int);
+    size_t found = 0;
+    int64_t start = now_ns();
+    for (size_t i = 0; i < slh_vec_size(values); i++) {
+        size_t idx = slh_vec_lower_bound(vec, &values[i], &cmp_int);
+        found += vec[idx] == values[i];
+    }
+    int64_t duration = now_ns() - start;
+    if (found != slh_vec_size(values)) {
+        printf("slh_vec_lower_bound missed values\n");
+    }
+    slh_vec_free(vec);
+    return duration / 1e6;
+}
+
+int main(void) {
+    const size_t sizes[] = {100000, 1000000};
+
+    printf("%9s %12s %12s %12s %12s %12s\n", "elements", "vec_sort",
+           "sort_by_key", "qsort", "list_sort", "lower_bound");
+    for (size_t i = 0; i < sizeof(sizes) / sizeof(sizes[0]); i++) {
+        int *values = slh_vec_create(sizes[i], sizeof(int));
+        for (size_t j = 0; j < sizes[i]; j++) {
+            int value = rand() - RAND_MAX / 2;
+            values = slh_vec_append(values, &value);
+        }
+
+        printf("%9zu %9.3f ms %9.3f ms %9.3f ms %9.3f ms %9.3f ms\n",
+               sizes[i], time_vec_sort(values), time_sort_by_key(values),
+               time_qsort(values), time_list_sort(values),
+               time_lower_bound(values));
+        slh_vec_free(values);
+    }
+    return 0;
+}
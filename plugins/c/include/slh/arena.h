@@ -0,0 +1,65 @@
+#ifndef SLH_ARENA_H
+#define SLH_ARENA_H
+
+#include <stddef.h>
+
+// Bump allocator, memory is only ever released all at once by resetting
+// the arena (or a part of it, see slh_arena_mark) or freeing it.
+typedef struct slh_arena_block_t slh_arena_block_t;
+
+typedef struct {
+    slh_arena_block_t *block;
+    size_t used;
+    size_t block_size;
+} slh_arena_t;
+
+typedef struct {
+    slh_arena_block_t *block;
+    size_t used;
+} slh_arena_mark_t;
+
+// A block_size of 0 picks a default, larger allocations get their own block.
+slh_arena_t slh_arena_create(size_t block_size);
+
+void slh_arena_free(slh_arena_t *arena);
+
+// Returns size bytes aligned for any type, or NULL if memory allocation
+// failed.
+void *slh_arena_alloc(slh_arena_t *arena, size_t size);
+
+// Grows the allocation in place if it is the most recent one, otherwise
+// the contents are copied to a new allocation.
+void *slh_arena_realloc(slh_arena_t *arena, void *ptr, size_t old_size,
+                        size_t new_size);
+
+slh_arena_mark_t slh_arena_mark(const slh_arena_t *arena);
+
+// Releases everything allocated since the mark was taken.
+void slh_arena_reset(slh_arena_t *arena, slh_arena_mark_t mark);
+
+typedef struct {
+    slh_arena_t *arena;
+    slh_arena_mark_t mark;
+} slh_arena_scope_t;
+
+slh_arena_scope_t slh_arena_scope_begin(slh_arena_t *arena);
+
+void slh_arena_scope_end(slh_arena_scope_t *scope);
+
+// Releases everything allocated from the arena once the enclosing block
+// is left, e.g.
+//
+//     {
+//         SLH_ARENA_SCOPE(&arena);
+//         int *vec = slh_vec_create_in(&arena, 0, sizeof(int));
+//         ...
+//     } // vec is released here
+#define SLH_ARENA_SCOPE(arena)                                                 \
+    SLH_ARENA_SCOPE_(arena, __COUNTER__)
+#define SLH_ARENA_SCOPE_(arena, counter) SLH_ARENA_SCOPE__(arena, counter)
+#define SLH_ARENA_SCOPE__(arena, counter)                                      \
+    slh_arena_scope_t __slh_arena_scope_##counter                              \
+        __attribute__((cleanup(slh_arena_scope_end))) =                        \
+            slh_arena_scope_begin(arena)
+
+#endif // SLH_ARENA_H
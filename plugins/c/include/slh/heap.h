@@ -0,0 +1,46 @@
+#ifndef SLH_HEAP_H
+#define SLH_HEAP_H
+
+#include "slh/vec.h"
+#include <stddef.h>
+
+// 4-ary min heap, ordered by cmp. Elements are copied into the heap.
+typedef struct slh_heap_t slh_heap_t;
+
+// Identifies a pushed element for slh_heap_decrease_key, handles are
+// numbered in push order starting at 0.
+typedef size_t slh_heap_handle_t;
+
+#define SLH_HEAP_INVALID_HANDLE ((slh_heap_handle_t)-1)
+
+slh_heap_t *slh_heap_create(size_t elem_size, slh_vec_cmp_t cmp);
+
+// Builds a heap of the n elements in O(n), the handle of each element is
+// its index in the array. Returns NULL if memory allocation failed.
+slh_heap_t *slh_heap_from_array(const void *elems, size_t n, size_t elem_size,
+                                slh_vec_cmp_t cmp);
+
+void slh_heap_free(slh_heap_t *heap);
+
+size_t slh_heap_size(const slh_heap_t *heap);
+
+// Returns the handle of the element, or SLH_HEAP_INVALID_HANDLE if memory
+// allocation failed.
+slh_heap_handle_t slh_heap_push(slh_heap_t *heap, const void *elem);
+
+// Returns the smallest element, or NULL if the heap is empty.
+const void *slh_heap_peek(const slh_heap_t *heap);
+
+// Removes the smallest element, copying it to elem unless that is NULL.
+// Returns false if the heap is empty.
+bool slh_heap_pop(slh_heap_t *heap, void *elem);
+
+// Whether the element of the handle is still in the heap.
+bool slh_heap_contains(const slh_heap_t *heap, slh_heap_handle_t handle);
+
+// Replaces the element of the handle, which must still be in the heap,
+// with one that doesn't compare greater.
+void slh_heap_decrease_key(slh_heap_t *heap, slh_heap_handle_t handle,
+                           const void *elem);
+
+#endif // SLH_HEAP_H
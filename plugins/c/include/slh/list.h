@@ -1,6 +1,7 @@
 #ifndef SLH_LIST_H
 #define SLH_LIST_H
 
+#include "slh/arena.h"
 #include <stddef.h>
 #include <stdint.h>
 
@@ -11,18 +12,27 @@ typedef struct slh_node_t {
 
 slh_node_t *slh_list_create_node(int32_t value);
 
+// Nodes allocated from an arena are released with the arena, don't pass
+// them to slh_list_free.
+slh_node_t *slh_list_create_node_in(slh_arena_t *arena, int32_t value);
+
 slh_node_t *slh_list_end(slh_node_t *node);
 
 void slh_list_prepend(slh_node_t **node, int32_t value);
 
 void slh_list_append(slh_node_t **node, int32_t value);
 
+void slh_list_prepend_in(slh_arena_t *arena, slh_node_t **node, int32_t value);
+
+void slh_list_append_in(slh_arena_t *arena, slh_node_t **node, int32_t value);
+
 void slh_list_free(slh_node_t *node);
 
 void slh_list_map(slh_node_t *node, void (*map)(slh_node_t *));
 
 void slh_list_print(slh_node_t *node);
 
+// Stable merge sort by value.
 void slh_list_sort(slh_node_t **head);
 
 size_t slh_list_size(slh_node_t *node);
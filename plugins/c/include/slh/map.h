@@ -0,0 +1,65 @@
+#ifndef SLH_MAP_H
+#define SLH_MAP_H
+
+#include "slh/arena.h"
+#include <stddef.h>
+#include <stdint.h>
+
+// Open addressing hash map with robin hood probing, keys and values are
+// copied into the map. Removal shifts the following entries back instead
+// of leaving tombstones. Use a value size of 0 for a set.
+typedef struct slh_map_t slh_map_t;
+
+typedef uint64_t (*slh_map_hash_t)(const void *key);
+typedef bool (*slh_map_eq_t)(const void *a, const void *b);
+
+// A NULL hash or eq hashes and compares the key bytes, which suits
+// integers and slh_point_t. Struct keys with padding need their own.
+slh_map_t *slh_map_create(size_t key_size, size_t value_size,
+                          slh_map_hash_t hash, slh_map_eq_t eq);
+
+// Allocates the map, and grows it, from the arena. Freeing it is a no-op,
+// it is released with the arena.
+slh_map_t *slh_map_create_in(slh_arena_t *arena, size_t key_size,
+                             size_t value_size, slh_map_hash_t hash,
+                             slh_map_eq_t eq);
+
+void slh_map_free(slh_map_t *map);
+
+size_t slh_map_size(const slh_map_t *map);
+
+void slh_map_clear(slh_map_t *map);
+
+// Returns the value of the key, or NULL if it isn't in the map.
+void *slh_map_get(const slh_map_t *map, const void *key);
+
+bool slh_map_contains(const slh_map_t *map, const void *key);
+
+// Inserts or overwrites the value of the key, returning the stored value
+// or NULL if memory allocation failed.
+void *slh_map_put(slh_map_t *map, const void *key, const void *value);
+
+// Returns the value of the key, inserting a zeroed value if it isn't in
+// the map yet, or NULL if memory allocation failed.
+void *slh_map_entry(slh_map_t *map, const void *key);
+
+bool slh_map_remove(slh_map_t *map, const void *key);
+
+// Iterates over the entries, starting with *iter = 0. Returns false once
+// all entries were visited. The map mustn't be modified meanwhile.
+bool slh_map_next(const slh_map_t *map, size_t *iter, const void **key,
+                  void **value);
+
+uint64_t slh_hash_u64(uint64_t x);
+
+uint64_t slh_hash_bytes(const void *data, size_t size);
+
+// hash and eq for int64_t keys
+uint64_t slh_map_hash_int(const void *key);
+bool slh_map_eq_int(const void *a, const void *b);
+
+// hash and eq for slh_point_t keys
+uint64_t slh_map_hash_point(const void *key);
+bool slh_map_eq_point(const void *a, const void *b);
+
+#endif // SLH_MAP_H
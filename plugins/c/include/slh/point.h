@@ -0,0 +1,11 @@
+#ifndef SLH_POINT_H
+#define SLH_POINT_H
+
+#include <stdint.h>
+
+typedef struct {
+    int32_t x;
+    int32_t y;
+} slh_point_t;
+
+#endif // SLH_POINT_H
@@ -0,0 +1,44 @@
+#ifndef SLH_SCAN_H
+#define SLH_SCAN_H
+
+#include "slh/ptr.h"
+#include <stddef.h>
+#include <stdint.h>
+
+// Iterates over the input without allocating, lines and blocks are views
+// into it, e.g.
+//
+//     slh_scanner_t scanner = slh_scanner(input);
+//     slh_sized_ptr_t line;
+//     while (slh_scan_line(&scanner, &line)) {
+//         ...
+//     }
+typedef struct {
+    char *pos;
+    char *end;
+} slh_scanner_t;
+
+slh_scanner_t slh_scanner(const slh_sized_ptr_t *text);
+
+// Next line without its line ending ("\n" or "\r\n"). Returns false once
+// all lines were scanned, a trailing newline doesn't start another line.
+bool slh_scan_line(slh_scanner_t *scanner, slh_sized_ptr_t *line);
+
+// Next block of lines separated by blank lines, without the trailing
+// line ending. Returns false once all blocks were scanned.
+bool slh_scan_block(slh_scanner_t *scanner, slh_sized_ptr_t *block);
+
+// Next integer, skipping anything else, a '-' right before the digits
+// makes it negative. Returns false once there are no more integers.
+bool slh_scan_int(slh_scanner_t *scanner, int64_t *value);
+
+// Appends all integers of the text to an slh_vec of int64_t, returning
+// the vec. Returns NULL, having freed the vec, if memory allocation failed.
+int64_t *slh_scan_ints(const slh_sized_ptr_t *text, int64_t *vec);
+
+// Width and height of a grid of equally long lines. Returns false if
+// the lines differ in length.
+bool slh_scan_grid_dims(const slh_sized_ptr_t *text, size_t *width,
+                        size_t *height);
+
+#endif // SLH_SCAN_H
@@ -1,25 +1,61 @@
 #ifndef SLH_VEC_H
 #define SLH_VEC_H
 
+#include "slh/arena.h"
 #include <stddef.h>
 #include <stdint.h>
 
 void *slh_vec_create(size_t cap, size_t elem_size);
 
+// Allocates the vector, and grows it, from the arena. Freeing it is a
+// no-op, it is released with the arena.
+void *slh_vec_create_in(slh_arena_t *arena, size_t cap, size_t elem_size);
+
 void slh_vec_free(void *vec);
 
 size_t slh_vec_cap(const void *vec);
 
 size_t slh_vec_size(const void *vec);
 
+// Returns the resized vector, which may have moved. Returns NULL if memory
+// allocation failed, leaving the vector as it was.
 void *slh_vec_resize(void *vec, size_t cap);
 
 void *slh_vec_at(void *vec, size_t idx);
 
+// Returns the vector, which may have moved to grow. Returns NULL if memory
+// allocation failed, leaving the vector as it was.
 void *slh_vec_append(void *vec, const void *value);
 
+// Removes the last element, copying it to value unless that is NULL.
+// Returns false if the vector is empty.
+bool slh_vec_pop(void *vec, void *value);
+
 void slh_vec_map(void *vec, const void (*map)(void *));
 
 int slh_vec_find(void *vec, const void *value);
 
+// Returns < 0, 0 or > 0 when a is less than, equal to or greater than b.
+typedef int (*slh_vec_cmp_t)(const void *a, const void *b);
+
+// Maps an element to an unsigned key to sort by, e.g. for signed
+// integers flip the sign bit: (uint64_t)x ^ (1ull << 63).
+typedef uint64_t (*slh_vec_key_t)(const void *elem);
+
+// Sorts in place with introsort, not stable.
+void slh_vec_sort(void *vec, slh_vec_cmp_t cmp);
+
+// Stable radix sort by key, returns false if memory allocation failed.
+bool slh_vec_sort_by_key(void *vec, slh_vec_key_t key);
+
+// Index of the first element not less than the value in a sorted vector,
+// or its size if there is none.
+size_t slh_vec_lower_bound(const void *vec, const void *value,
+                           slh_vec_cmp_t cmp);
+
+// Index of the first element greater than the value in a sorted vector,
+// or its size if there is none.
+size_t slh_vec_upper_bound(const void *vec, const void *value,
+                           slh_vec_cmp_t cmp);
+
 #endif // SLH_VEC_H
@@ -1,14 +1,29 @@
+import ctypes
+import fcntl
+import hashlib
+import json
+import mmap
+import os
 import re
 import shutil
 import subprocess
 import sys
+import tempfile
+import time
 import warnings
+from collections import Counter
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import NamedTuple
 
 from slh import DayPart
 from slh import get_rootdir
 from slh import Solution
 
+from .get_slh_dir import get_slh_dir
+
 
 __all__ = [
     "LANGUAGE",
@@ -16,7 +31,11 @@ __all__ = [
     "get_src_file",
     "generate_next_files",
     "run_daypart_tests",
+    "build_solutions",
     "load_solution",
+    "sample_solution",
+    "time_solution",
+    "measure_peak_rss",
 ]
 
 
@@ -27,6 +46,23 @@ _TEMPLATE_CMAKE_FILE = _TEMPLATE_DIR / "CMakeLists.txt"
 _TEMPLATE_DAY_DIR = _TEMPLATE_DIR / "day00"
 _TEMPLATE_DAY_CMAKE_FILE = _TEMPLATE_DAY_DIR / "CMakeLists.txt"
 
+# records the inputs of the last build of each target in the shared build
+# tree, rebuilding only when the sources or the slh library change and
+# configuring only when the cmake files or the environment used to pick
+# flags change
+_BUILD_STAMP = ".slh-build.json"
+_BUILD_LOCK = ".slh-build.lock"
+_BUILD_ENV = ("CC", "CFLAGS", "LDFLAGS")
+_SOURCE_PATTERNS = ("*.c", "*.h")
+
+# opt in to calling solutions in-process, built as shared libraries
+_IN_PROCESS_ENV = "SLH_C_IN_PROCESS"
+
+# sampling frequency (Hz) passed to perf, odd to avoid lockstep sampling
+_PERF_FREQUENCY = 4999
+# e.g. "solve+0x1f", "[unknown]"
+_PERF_SYMBOL = re.compile(r"^(.*?)(\+0x[0-9a-f]+)?$")
+
 
 LANGUAGE = "c"
 
@@ -93,8 +129,19 @@ def run_daypart_tests(
     raise NotImplementedError("No testing functionality, yet!")
 
 
+def build_solutions(dayparts: list[DayPart]) -> int:
+    """
+    Build the solutions of all dayparts in one go, in parallel. Returns
+    the number of solutions that weren't up to date.
+    """
+    return _build([_get_build_target(dp) for dp in dayparts])
+
+
 def load_solution(dp: DayPart) -> Solution:
-    _build(dp)
+    target = _get_build_target(dp)
+    _build([target])
+    if target.output != _get_exe_file(dp):
+        return _load_shared_solution(target.output)
 
     def solution(inputfile: Path, /) -> int:
         # TODO: Better error reporting
@@ -108,24 +155,386 @@ def load_solution(dp: DayPart) -> Solution:
     return solution
 
 
+def time_solution(
+    dp: DayPart, inputfile: Path, count: int, /
+) -> tuple[int, list[int]] | None:
+    """
+    Call the solution `count` times within its executable, or its shared
+    library when called in-process, reading the input once. Returns the
+    answer and each call's duration in ns.
+    """
+    target = _get_build_target(dp)
+    if target.output != _get_exe_file(dp):
+        return _time_shared_solution(target.output, inputfile, count)
+
+    res = subprocess.run(
+        [_get_exe_file(dp), "--benchmark", str(count), inputfile],
+        capture_output=True,
+        check=True,
+    )
+    answer, *durations = map(int, res.stdout.split())
+    return answer, durations
+
+
+def measure_peak_rss(dp: DayPart, inputfile: Path, /) -> int | None:
+    """
+    Peak resident set size, in bytes, of the executable solving once, as
+    measured by itself, or None when called in-process.
+    """
+    target = _get_build_target(dp)
+    if target.output != _get_exe_file(dp):
+        return None
+
+    res = subprocess.run(
+        [_get_exe_file(dp), "--peak-rss", inputfile],
+        capture_output=True,
+        check=True,
+    )
+    _, peak = map(int, res.stdout.split())
+    return peak if peak >= 0 else None
+
+
+class _SizedPtr(ctypes.Structure):
+    # slh_sized_ptr_t
+    _fields_ = [("ptr", ctypes.c_void_p), ("size", ctypes.c_size_t)]
+
+
+class _Solved(ctypes.Structure):
+    # slh_solution_t
+    _fields_ = [("err", ctypes.c_char_p), ("answer", ctypes.c_int64)]
+
+
+# shared libraries by path, with the mtime they were loaded at
+_libraries: dict[Path, tuple[int, ctypes.CDLL]] = {}
+
+
+def _load_shared_solution(path: Path) -> Solution:
+    func = _load_solution_func(path)
+
+    def solution(inputfile: Path, /) -> int:
+        with _map_input(inputfile) as input:
+            solved = func(ctypes.byref(input))
+            if solved.err is not None:
+                raise RuntimeError(solved.err.decode(errors="replace"))
+        return solved.answer
+
+    return solution
+
+
+def _time_shared_solution(
+    path: Path, inputfile: Path, count: int
+) -> tuple[int, list[int]]:
+    """
+    Like `slh_main` with --benchmark, the input is mapped once and each
+    call gets a fresh copy of it, only the calls themselves are timed.
+    """
+    func = _load_solution_func(path)
+    answer = None
+    durations: list[int] = []
+    with _map_input(inputfile) as input:
+        # solutions may modify their input, including the terminating zero
+        copy = ctypes.create_string_buffer(input.size + 1)
+        arg = ctypes.byref(_SizedPtr(ctypes.addressof(copy), input.size))
+        for _ in range(count):
+            ctypes.memmove(copy, input.ptr, input.size + 1)
+
+            start = time.perf_counter_ns()
+            solved = func(arg)
+            durations.append(time.perf_counter_ns() - start)
+
+            if solved.err is not None:
+                raise RuntimeError(solved.err.decode(errors="replace"))
+            if answer is not None and solved.answer != answer:
+                raise RuntimeError("answer changed between calls")
+            answer = solved.answer
+
+    assert answer is not None, "count must be positive"
+    return answer, durations
+
+
+def _load_solution_func(path: Path) -> Callable[..., _Solved]:
+    func = _load_library(path).solution
+    func.argtypes = [ctypes.POINTER(_SizedPtr)]
+    func.restype = _Solved
+    return func
+
+
+def _load_library(path: Path) -> ctypes.CDLL:
+    mtime = path.stat().st_mtime_ns
+    match _libraries.get(path):
+        case (loaded, lib) if loaded == mtime:
+            return lib
+        case None:
+            lib = ctypes.CDLL(str(path))
+        case _:
+            # dlopen hands back the library already loaded from a path,
+            # e.g. in `slh serve`, so load the rebuilt one from a copy
+            fd, copy = tempfile.mkstemp(suffix=".so", dir=path.parent)
+            os.close(fd)
+            try:
+                shutil.copyfile(path, copy)
+                lib = ctypes.CDLL(copy)
+            finally:
+                os.unlink(copy)
+
+    _libraries[path] = (mtime, lib)
+    return lib
+
+
+@contextmanager
+def _map_input(inputfile: Path) -> Iterator[_SizedPtr]:
+    """
+    Map the input into memory, without copying it, as a zero terminated
+    string like `slh_main` provides.
+    """
+    with open(inputfile, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        buffer: bytearray | mmap.mmap
+        if size % mmap.PAGESIZE == 0:
+            # no zeroed remainder of the last page to terminate the string
+            buffer = bytearray(size + 1)
+            f.readinto(memoryview(buffer)[:size])
+        else:
+            # a private mapping, solutions are free to modify their input
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    data = ctypes.c_char.from_buffer(buffer)
+    try:
+        yield _SizedPtr(ctypes.addressof(data), size)
+    finally:
+        del data
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+
+def sample_solution(dp: DayPart, inputfile: Path, /) -> Counter[str] | None:
+    """
+    Sample the built executable with perf, returning collapsed stacks.
+    Returns None if perf isn't available or not permitted to sample.
+    """
+    perf = shutil.which("perf")
+    if perf is None:
+        warnings.warn("perf not found, only profiling the python side")
+        return None
+
+    exe = _get_exe_file(dp)
+    _build([_Target(_get_target(dp), dp, exe)])
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data = Path(tmpdir) / "perf.data"
+        try:
+            subprocess.run(
+                [
+                    perf,
+                    "record",
+                    "--freq",
+                    str(_PERF_FREQUENCY),
+                    "--call-graph",
+                    "dwarf",
+                    "--output",
+                    data,
+                    "--",
+                    exe,
+                    inputfile,
+                ],
+                capture_output=True,
+                check=True,
+            )
+            script = subprocess.run(
+                [perf, "script", "--input", data],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        except subprocess.CalledProcessError as err:
+            warnings.warn(
+                f"perf failed, only profiling the python side: {err.stderr!r}"
+            )
+            return None
+
+    return _collapse_perf_script(script)
+
+
+def _collapse_perf_script(script: str) -> Counter[str]:
+    """
+    Collapse `perf script` output, a header line followed by one frame
+    per line (innermost first) for each sample, into `outer;...;inner`
+    stacks and their sample counts.
+    """
+    stacks: Counter[str] = Counter()
+    for sample in script.split("\n\n"):
+        lines = sample.strip("\n").splitlines()
+        if not lines:
+            continue
+
+        frames = []
+        for line in lines[1:]:
+            # e.g. "    55d0c4a0b1c2 solve+0x1f (/path/to/part1)"
+            _, _, location = line.strip().partition(" ")
+            symbol, _, _ = location.rpartition(" (")
+            m = _PERF_SYMBOL.match(symbol or location)
+            assert m is not None
+            frames.append(m[1])
+
+        if frames:
+            stacks[";".join(reversed(frames))] += 1
+
+    return stacks
+
+
+class _Target(NamedTuple):
+    name: str
+    dp: DayPart
+    output: Path
+
+
+def _get_target(dp: DayPart) -> str:
+    return f"day{dp.day:02}_part{dp.part}"
+
+
 def _get_exe_file(dp: DayPart) -> Path:
     return dp.outdir / f"part{dp.part}"
 
 
-def _build(dp: DayPart, debug: bool = False) -> None:
+def _get_build_target(dp: DayPart) -> _Target:
+    name = _get_target(dp)
+    if os.environ.get(_IN_PROCESS_ENV) != "1":
+        return _Target(name, dp, _get_exe_file(dp))
+
+    shared = f"{name}_shared"
+    if shared not in (dp.outdir / "CMakeLists.txt").read_text():
+        warnings.warn(
+            f"{dp.outdir / 'CMakeLists.txt'} has no {shared} target,"
+            " running the executable instead"
+        )
+        return _Target(name, dp, _get_exe_file(dp))
+
+    return _Target(shared, dp, dp.outdir / f"part{dp.part}.so")
+
+
+def _build(targets: list[_Target], debug: bool = False) -> int:
     # TODO: Need to be able to invoke this independently
     # with a possible debug flag.
-    # build independently of run. YAGNI for now but may
-    # change so this is called by slh
-    # Perhaps this would be an optional thing for plugins
-    # to support.
     release = "debug" if debug else "release"
-    target_dir = Path(dp.outdir / "build" / f"part{dp.part}-{release}")
-    subprocess.run(
-        [sys.executable, "-m", "cmake", "-B", target_dir],
-        check=True,
+    build_dir = get_rootdir() / "build" / release
+    build_dir.mkdir(parents=True, exist_ok=True)
+
+    # concurrent runs (e.g. slh run --jobs) share the build tree
+    with open(build_dir / _BUILD_LOCK, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return _build_locked(build_dir, release, targets)
+
+
+def _build_locked(build_dir: Path, release: str, targets: list[_Target]) -> int:
+    generator = "Ninja" if shutil.which("ninja") else None
+    configure_key = _hash_inputs(
+        _cmake_inputs(),
+        [release, generator, *map(os.environ.get, _BUILD_ENV)],
     )
+    slh_library = _slh_library_inputs()
+    build_keys = {
+        target.name: _hash_inputs(
+            [*_source_inputs(target.dp), *slh_library], [configure_key]
+        )
+        for target in targets
+    }
+
+    stamp_file = build_dir / _BUILD_STAMP
+    stamp = _read_stamp(stamp_file)
+    built = {}
+    if stamp.get("configure") == configure_key:
+        built = stamp.get("targets", {})
+    stale = [
+        target.name
+        for target in targets
+        if built.get(target.name) != build_keys[target.name]
+        or not target.output.exists()
+    ]
+    if not stale:
+        return 0
+
+    cache_file = build_dir / "CMakeCache.txt"
+    if stamp.get("configure") != configure_key or not cache_file.exists():
+        # the generator can't be changed once configured
+        if stamp.get("generator", generator) != generator:
+            cache_file.unlink(missing_ok=True)
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "cmake",
+                "-S",
+                get_rootdir(),
+                "-B",
+                build_dir,
+                *(["-G", generator] if generator else []),
+            ],
+            check=True,
+        )
     subprocess.run(
-        [sys.executable, "-m", "cmake", "--build", target_dir],
+        [
+            sys.executable,
+            "-m",
+            "cmake",
+            "--build",
+            build_dir,
+            "--parallel",
+            "--target",
+            *stale,
+        ],
         check=True,
     )
+
+    built = {**built, **{target: build_keys[target] for target in stale}}
+    stamp_file.write_text(
+        json.dumps(
+            {"configure": configure_key, "generator": generator, "targets": built}
+        )
+    )
+    return len(stale)
+
+
+def _cmake_inputs() -> list[Path]:
+    # the root CMakeLists.txt adds every day directory
+    rootdir = get_rootdir()
+    return [rootdir / "CMakeLists.txt", *sorted(rootdir.glob("day??/CMakeLists.txt"))]
+
+
+def _source_inputs(dp: DayPart) -> list[Path]:
+    # any file in the day directory may be included by the part
+    return sorted(
+        path
+        for pattern in _SOURCE_PATTERNS
+        for path in dp.outdir.glob(pattern)
+    )
+
+
+def _slh_library_inputs() -> list[Path]:
+    slh_dir = get_slh_dir()
+    return sorted(
+        path
+        for path in [*slh_dir.glob("include/**/*"), *slh_dir.glob("lib/*")]
+        if path.is_file()
+    )
+
+
+def _hash_inputs(paths: list[Path], extra: list[str | None]) -> str:
+    h = hashlib.sha256()
+    for value in extra:
+        h.update(f"{value}\0".encode())
+    for path in paths:
+        h.update(f"{path}\0".encode())
+        try:
+            h.update(path.read_bytes())
+        except FileNotFoundError:
+            h.update(b"<missing>")
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _read_stamp(stamp_file: Path) -> dict[str, str]:
+    try:
+        stamp = json.loads(stamp_file.read_text())
+    except (OSError, ValueError):
+        return {}
+    return stamp if isinstance(stamp, dict) else {}
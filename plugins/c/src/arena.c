@@ -0,0 +1,97 @@
+#include "slh/arena.h"
+#include <stdalign.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define SLH_ARENA_DEFAULT_BLOCK_SIZE (64 * 1024)
+
+struct slh_arena_block_t {
+    struct slh_arena_block_t *prev;
+    size_t cap;
+    alignas(max_align_t) char data[];
+};
+
+static size_t align_up(size_t size) {
+    const size_t align = alignof(max_align_t);
+    return (size + align - 1) / align * align;
+}
+
+slh_arena_t slh_arena_create(size_t block_size) {
+    return (slh_arena_t){
+        .block = NULL,
+        .used = 0,
+        .block_size =
+            block_size == 0 ? SLH_ARENA_DEFAULT_BLOCK_SIZE : block_size,
+    };
+}
+
+void slh_arena_free(slh_arena_t *arena) {
+    slh_arena_reset(arena, (slh_arena_mark_t){.block = NULL, .used = 0});
+}
+
+void *slh_arena_alloc(slh_arena_t *arena, size_t size) {
+    size = align_up(size);
+    slh_arena_block_t *block = arena->block;
+    if (block == NULL || block->cap - arena->used < size) {
+        size_t cap = size > arena->block_size ? size : arena->block_size;
+        block = malloc(sizeof(slh_arena_block_t) + cap);
+        if (block == NULL) {
+            return NULL;
+        }
+        block->prev = arena->block;
+        block->cap = cap;
+        arena->block = block;
+        arena->used = 0;
+    }
+
+    void *ptr = block->data + arena->used;
+    arena->used += size;
+    return ptr;
+}
+
+void *slh_arena_realloc(slh_arena_t *arena, void *ptr, size_t old_size,
+                        size_t new_size) {
+    if (ptr == NULL) {
+        return slh_arena_alloc(arena, new_size);
+    }
+
+    slh_arena_block_t *block = arena->block;
+    char *start = ptr;
+    bool most_recent = block != NULL && start >= block->data &&
+                       start + align_up(old_size) == block->data + arena->used;
+    size_t offset = most_recent ? start - block->data : 0;
+    if (most_recent && offset + align_up(new_size) <= block->cap) {
+        arena->used = offset + align_up(new_size);
+        return ptr;
+    }
+    if (new_size <= old_size) {
+        return ptr;
+    }
+
+    void *moved = slh_arena_alloc(arena, new_size);
+    if (moved != NULL) {
+        memcpy(moved, ptr, old_size);
+    }
+    return moved;
+}
+
+slh_arena_mark_t slh_arena_mark(const slh_arena_t *arena) {
+    return (slh_arena_mark_t){.block = arena->block, .used = arena->used};
+}
+
+void slh_arena_reset(slh_arena_t *arena, slh_arena_mark_t mark) {
+    while (arena->block != mark.block) {
+        slh_arena_block_t *prev = arena->block->prev;
+        free(arena->block);
+        arena->block = prev;
+    }
+    arena->used = mark.used;
+}
+
+slh_arena_scope_t slh_arena_scope_begin(slh_arena_t *arena) {
+    return (slh_arena_scope_t){.arena = arena, .mark = slh_arena_mark(arena)};
+}
+
+void slh_arena_scope_end(slh_arena_scope_t *scope) {
+    slh_arena_reset(scope->arena, scope->mark);
+}
@@ -0,0 +1,221 @@
+#include "slh/heap.h"
+#include <stdlib.h>
+#include <string.h>
+
+#define SLH_HEAP_ARITY 4
+
+struct slh_heap_t {
+    size_t elemsize;
+    slh_vec_cmp_t cmp;
+    // slh_vec of the elements in heap order
+    char *elems;
+    // slh_vec of the handle of each element in elems
+    slh_heap_handle_t *handles;
+    // slh_vec of the position in elems of each handle, or
+    // SLH_HEAP_INVALID_HANDLE once popped
+    size_t *positions;
+    // element being sifted
+    char *hole;
+};
+
+slh_heap_t *slh_heap_create(size_t elem_size, slh_vec_cmp_t cmp) {
+    slh_heap_t *heap = malloc(sizeof(slh_heap_t));
+    if (heap == NULL) {
+        return NULL;
+    }
+    *heap = (slh_heap_t){
+        .elemsize = elem_size,
+        .cmp = cmp,
+        .elems = slh_vec_create(0, elem_size),
+        .handles = slh_vec_create(0, sizeof(slh_heap_handle_t)),
+        .positions = slh_vec_create(0, sizeof(size_t)),
+        .hole = malloc(elem_size),
+    };
+    if (heap->elems == NULL || heap->handles == NULL ||
+        heap->positions == NULL || heap->hole == NULL) {
+        slh_heap_free(heap);
+        return NULL;
+    }
+    return heap;
+}
+
+void slh_heap_free(slh_heap_t *heap) {
+    if (heap == NULL) {
+        return;
+    }
+    if (heap->elems != NULL) {
+        slh_vec_free(heap->elems);
+    }
+    if (heap->handles != NULL) {
+        slh_vec_free(heap->handles);
+    }
+    if (heap->positions != NULL) {
+        slh_vec_free(heap->positions);
+    }
+    free(heap->hole);
+    free(heap);
+}
+
+size_t slh_heap_size(const slh_heap_t *heap) {
+    return slh_vec_size(heap->elems);
+}
+
+static char *elem_at(const slh_heap_t *heap, size_t pos) {
+    return heap->elems + pos * heap->elemsize;
+}
+
+// Moves the element (and its handle) at from to the position to.
+static void move(slh_heap_t *heap, size_t from, size_t to) {
+    memcpy(elem_at(heap, to), elem_at(heap, from), heap->elemsize);
+    heap->handles[to] = heap->handles[from];
+    heap->positions[heap->handles[to]] = to;
+}
+
+// Places the element in the hole, with its handle, at the position.
+static void fill(slh_heap_t *heap, size_t pos, slh_heap_handle_t handle) {
+    memcpy(elem_at(heap, pos), heap->hole, heap->elemsize);
+    heap->handles[pos] = handle;
+    heap->positions[handle] = pos;
+}
+
+static void sift_up(slh_heap_t *heap, size_t pos) {
+    memcpy(heap->hole, elem_at(heap, pos), heap->elemsize);
+    slh_heap_handle_t handle = heap->handles[pos];
+    while (pos > 0) {
+        size_t parent = (pos - 1) / SLH_HEAP_ARITY;
+        if (heap->cmp(heap->hole, elem_at(heap, parent)) >= 0) {
+            break;
+        }
+        move(heap, parent, pos);
+        pos = parent;
+    }
+    fill(heap, pos, handle);
+}
+
+static void sift_down(slh_heap_t *heap, size_t pos) {
+    size_t size = slh_heap_size(heap);
+    memcpy(heap->hole, elem_at(heap, pos), heap->elemsize);
+    slh_heap_handle_t handle = heap->handles[pos];
+    for (;;) {
+        size_t first = SLH_HEAP_ARITY * pos + 1;
+        if (first >= size) {
+            break;
+        }
+        size_t last = first + SLH_HEAP_ARITY < size ? first + SLH_HEAP_ARITY
+                                                    : size;
+        size_t smallest = first;
+        for (size_t child = first + 1; child < last; child++) {
+            if (heap->cmp(elem_at(heap, child), elem_at(heap, smallest)) < 0) {
+                smallest = child;
+            }
+        }
+        if (heap->cmp(elem_at(heap, smallest), heap->hole) >= 0) {
+            break;
+        }
+        move(heap, smallest, pos);
+        pos = smallest;
+    }
+    fill(heap, pos, handle);
+}
+
+// Appends the element and its handle and position without sifting it.
+// Returns SLH_HEAP_INVALID_HANDLE, leaving the heap as it was, if memory
+// allocation failed.
+static slh_heap_handle_t push_back(slh_heap_t *heap, const void *elem,
+                                   slh_heap_handle_t handle, size_t pos) {
+    char *elems = slh_vec_append(heap->elems, elem);
+    if (elems == NULL) {
+        return SLH_HEAP_INVALID_HANDLE;
+    }
+    heap->elems = elems;
+
+    slh_heap_handle_t *handles = slh_vec_append(heap->handles, &handle);
+    if (handles == NULL) {
+        slh_vec_pop(heap->elems, NULL);
+        return SLH_HEAP_INVALID_HANDLE;
+    }
+    heap->handles = handles;
+
+    size_t *positions = slh_vec_append(heap->positions, &pos);
+    if (positions == NULL) {
+        slh_vec_pop(heap->elems, NULL);
+        slh_vec_pop(heap->handles, NULL);
+        return SLH_HEAP_INVALID_HANDLE;
+    }
+    heap->positions = positions;
+    return handle;
+}
+
+slh_heap_t *slh_heap_from_array(const void *elems, size_t n, size_t elem_size,
+                                slh_vec_cmp_t cmp) {
+    slh_heap_t *heap = slh_heap_create(elem_size, cmp);
+    if (heap == NULL) {
+        return NULL;
+    }
+
+    for (size_t i = 0; i < n; i++) {
+        const char *elem = (const char *)elems + i * elem_size;
+        if (push_back(heap, elem, i, i) == SLH_HEAP_INVALID_HANDLE) {
+            slh_heap_free(heap);
+            return NULL;
+        }
+    }
+    // sift down every parent, the last one first
+    if (n > 1) {
+        for (size_t pos = (n - 2) / SLH_HEAP_ARITY + 1; pos > 0; pos--) {
+            sift_down(heap, pos - 1);
+        }
+    }
+    return heap;
+}
+
+slh_heap_handle_t slh_heap_push(slh_heap_t *heap, const void *elem) {
+    size_t pos = slh_heap_size(heap);
+    slh_heap_handle_t handle =
+        push_back(heap, elem, slh_vec_size(heap->positions), pos);
+    if (handle == SLH_HEAP_INVALID_HANDLE) {
+        return SLH_HEAP_INVALID_HANDLE;
+    }
+
+    sift_up(heap, pos);
+    return handle;
+}
+
+const void *slh_heap_peek(const slh_heap_t *heap) {
+    return slh_heap_size(heap) == 0 ? NULL : heap->elems;
+}
+
+bool slh_heap_pop(slh_heap_t *heap, void *elem) {
+    size_t size = slh_heap_size(heap);
+    if (size == 0) {
+        return false;
+    }
+
+    if (elem != NULL) {
+        memcpy(elem, elem_at(heap, 0), heap->elemsize);
+    }
+    heap->positions[heap->handles[0]] = SLH_HEAP_INVALID_HANDLE;
+
+    // the last element takes the place of the first
+    if (size > 1) {
+        move(heap, size - 1, 0);
+    }
+    slh_vec_pop(heap->elems, NULL);
+    slh_vec_pop(heap->handles, NULL);
+    if (size > 2) {
+        sift_down(heap, 0);
+    }
+    return true;
+}
+
+bool slh_heap_contains(const slh_heap_t *heap, slh_heap_handle_t handle) {
+    return handle < slh_vec_size(heap->positions) &&
+           heap->positions[handle] != SLH_HEAP_INVALID_HANDLE;
+}
+
+void slh_heap_decrease_key(slh_heap_t *heap, slh_heap_handle_t handle,
+                           const void *elem) {
+    size_t pos = heap->positions[handle];
+    memcpy(elem_at(heap, pos), elem, heap->elemsize);
+    sift_up(heap, pos);
+}
@@ -1,53 +1,182 @@
+// mremap, on linux
+#define _GNU_SOURCE
+
+#include "input.h"
 #include "slh/ptr.h"
+#include <errno.h>
+#include <fcntl.h>
 #include <stdio.h>
 #include <stdlib.h>
+#include <string.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
 
-slh_sized_ptr_t slh_file_read_text(char *filename) {
-    FILE *file = fopen(filename, "r");
-    if (file == NULL) {
-        perror("Error opening file");
-        return slh_sized_ptr_create(0);
+// initial buffer size for inputs that can't be mapped, e.g. pipes
+#define SLH_READ_CHUNK (64 * 1024)
+
+static const slh_sized_ptr_t no_text = {.ptr = NULL, .size = 0};
+
+// Maps the file followed by a zero byte: size + 1 bytes of zeroed memory
+// are reserved and the file is mapped over the start. The mapping is
+// private, writes never reach the file.
+static slh_sized_ptr_t map_text(int fd, size_t size) {
+    char *text = mmap(NULL, size + 1, PROT_READ | PROT_WRITE,
+                      MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+    if (text == MAP_FAILED) {
+        perror("Memory mapping failed");
+        return no_text;
     }
 
-    fseek(file, 0, SEEK_END);
-    long file_size = ftell(file);
-    rewind(file);
+    if (size > 0 && mmap(text, size, PROT_READ | PROT_WRITE,
+                         MAP_PRIVATE | MAP_FIXED, fd, 0) == MAP_FAILED) {
+        perror("Memory mapping failed");
+        munmap(text, size + 1);
+        return no_text;
+    }
 
-    char *buffer = malloc(file_size + 1);
-    if (buffer == NULL) {
+    return (slh_sized_ptr_t){.ptr = text, .size = size};
+}
+
+// Grows an anonymous mapping of cap bytes to new_cap bytes, moving it if
+// needed. Returns NULL, leaving the mapping intact, if that fails.
+static char *grow_text(char *text, size_t cap, size_t new_cap) {
+#ifdef __linux__
+    char *grown = mremap(text, cap, new_cap, MREMAP_MAYMOVE);
+    return grown == MAP_FAILED ? NULL : grown;
+#else
+    char *grown = mmap(NULL, new_cap, PROT_READ | PROT_WRITE,
+                       MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+    if (grown == MAP_FAILED) {
+        return NULL;
+    }
+    memcpy(grown, text, cap);
+    munmap(text, cap);
+    return grown;
+#endif
+}
+
+// Reads inputs that can't be mapped into a growing anonymous mapping, so
+// that they are released like mapped files.
+static slh_sized_ptr_t read_text(int fd) {
+    size_t cap = SLH_READ_CHUNK;
+    char *text = mmap(NULL, cap, PROT_READ | PROT_WRITE,
+                      MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+    if (text == MAP_FAILED) {
         perror("Memory allocation failed");
-        fclose(file);
-        return slh_sized_ptr_create(0);
+        return no_text;
+    }
+
+    size_t size = 0;
+    for (;;) {
+        // keep a zero byte after the text
+        if (size + 1 == cap) {
+            char *grown = grow_text(text, cap, 2 * cap);
+            if (grown == NULL) {
+                perror("Memory allocation failed");
+                munmap(text, cap);
+                return no_text;
+            }
+            text = grown;
+            cap *= 2;
+        }
+
+        ssize_t n = read(fd, text + size, cap - 1 - size);
+        if (n == 0) {
+            break;
+        }
+        if (n == -1) {
+            if (errno == EINTR) {
+                continue;
+            }
+            perror("Error reading file");
+            munmap(text, cap);
+            return no_text;
+        }
+        size += n;
+    }
+
+    // release the pages past the text, cap is a multiple of the page size
+    size_t page = sysconf(_SC_PAGESIZE);
+    size_t used = (size + 1 + page - 1) / page * page;
+    if (used < cap) {
+        munmap(text + used, cap - used);
     }
+    return (slh_sized_ptr_t){.ptr = text, .size = size};
+}
 
-    fread(buffer, 1, file_size, file);
-    buffer[file_size] = '\0';
+slh_sized_ptr_t slh_file_read_text(char *filename) {
+    int fd = open(filename, O_RDONLY);
+    if (fd == -1) {
+        perror("Error opening file");
+        return no_text;
+    }
 
-    fclose(file);
-    return (slh_sized_ptr_t){.ptr = buffer, .size = file_size};
+    struct stat st;
+    if (fstat(fd, &st) == -1) {
+        perror("Error reading file");
+        close(fd);
+        return no_text;
+    }
+
+    slh_sized_ptr_t text =
+        S_ISREG(st.st_mode) ? map_text(fd, st.st_size) : read_text(fd);
+    // the mapping outlives the file descriptor
+    close(fd);
+    return text;
 }
 
-typedef struct {
-    char *err;
-    char *filename;
-} slh_args_t;
+void slh_file_free_text(slh_sized_ptr_t text) {
+    if (text.ptr != NULL) {
+        munmap(text.ptr, text.size + 1);
+    }
+}
 
 slh_args_t parse_args(int argc, char *argv[]) {
+    // usage: partN [--benchmark COUNT | --peak-rss] FILENAME
+    size_t count = 0;
+    bool peak_rss = false;
+    if (argc > 1 && strcmp(argv[1], "--peak-rss") == 0) {
+        peak_rss = true;
+        argc -= 1;
+        argv += 1;
+    } else if (argc > 1 && strcmp(argv[1], "--benchmark") == 0) {
+        char *end = NULL;
+        long long value = argc > 2 ? strtoll(argv[2], &end, 10) : 0;
+        if (end == NULL || end == argv[2] || *end != '\0' || value <= 0) {
+            return (slh_args_t){
+                .err = "--benchmark expects a positive count",
+                .filename = NULL,
+                .count = 0,
+                .peak_rss = false,
+            };
+        }
+        count = value;
+        argc -= 2;
+        argv += 2;
+    }
+
     switch (argc) {
     case 1:
         return (slh_args_t){
             .err = "please provide a filename",
             .filename = NULL,
+            .count = 0,
+            .peak_rss = false,
         };
     case 2:
         return (slh_args_t){
             .err = 0,
             .filename = argv[1],
+            .count = count,
+            .peak_rss = peak_rss,
         };
     default:
         return (slh_args_t){
             .err = "too many arguments, expected only one",
             .filename = NULL,
+            .count = 0,
+            .peak_rss = false,
         };
     }
 }
@@ -1,13 +1,21 @@
 #include "slh/ptr.h"
+#include <stdbool.h>
 
 #ifndef SLH_INPUT
 #define SLH_INPUT
 
+// Maps the file into memory, followed by a zero byte. Returns a null
+// pointer if it can't be read. Release with slh_file_free_text.
 slh_sized_ptr_t slh_file_read_text(char *filename);
+void slh_file_free_text(slh_sized_ptr_t text);
 
 typedef struct {
     char *err;
     char *filename;
+    // number of timed calls with --benchmark, 0 otherwise
+    size_t count;
+    // whether to report the peak resident set size, with --peak-rss
+    bool peak_rss;
 } slh_args_t;
 
 slh_args_t parse_args(int argc, char *argv[]);
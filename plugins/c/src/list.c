@@ -4,7 +4,12 @@
 #include <stdlib.h>
 
 slh_node_t *slh_list_create_node(int32_t value) {
-    slh_node_t *list = malloc(sizeof(slh_node_t));
+    return slh_list_create_node_in(NULL, value);
+}
+
+slh_node_t *slh_list_create_node_in(slh_arena_t *arena, int32_t value) {
+    slh_node_t *list = arena == NULL ? malloc(sizeof(slh_node_t))
+                                     : slh_arena_alloc(arena, sizeof(slh_node_t));
     if (list != NULL) {
         list->value = value;
         list->next = NULL;
@@ -25,14 +30,22 @@ slh_node_t *slh_list_end(slh_node_t *node) {
 }
 
 void slh_list_prepend(slh_node_t **node, int32_t value) {
-    slh_node_t *first = slh_list_create_node(value);
+    slh_list_prepend_in(NULL, node, value);
+}
+
+void slh_list_prepend_in(slh_arena_t *arena, slh_node_t **node, int32_t value) {
+    slh_node_t *first = slh_list_create_node_in(arena, value);
 
     first->next = *node;
     *node = first;
 }
 
 void slh_list_append(slh_node_t **node, int32_t value) {
-    slh_node_t *next = slh_list_create_node(value);
+    slh_list_append_in(NULL, node, value);
+}
+
+void slh_list_append_in(slh_arena_t *arena, slh_node_t **node, int32_t value) {
+    slh_node_t *next = slh_list_create_node_in(arena, value);
 
     if (*node == NULL) {
         // list is empty 'insert' single node
@@ -76,42 +89,42 @@ void slh_list_print(slh_node_t *node) {
     printf("]");
 }
 
+// Merges two sorted lists, taking from the left on ties to keep it stable.
+static slh_node_t *merge(slh_node_t *left, slh_node_t *right) {
+    slh_node_t head = {.value = 0, .next = NULL};
+    slh_node_t *tail = &head;
+    while (left != NULL && right != NULL) {
+        if (right->value < left->value) {
+            tail->next = right;
+            right = right->next;
+        } else {
+            tail->next = left;
+            left = left->next;
+        }
+        tail = tail->next;
+    }
+    tail->next = left != NULL ? left : right;
+    return head.next;
+}
+
 void slh_list_sort(slh_node_t **head) {
     if (*head == NULL || (*head)->next == NULL) {
         return;
     }
 
-    bool swapped;
-    do {
-        swapped = false;
-
-        slh_node_t *prev = NULL;
-        slh_node_t *curr = *head;
-        slh_node_t *next = curr->next;
-        while (next != NULL) {
-            if (next->value < curr->value) {
-                swapped = true;
-                // need to update up to three connections here
-                // prev->next->curr->(next->next)
-
-                if (prev == NULL) {
-                    *head = next;
-                } else {
-                    prev->next = next;
-                }
-
-                curr->next = next->next;
-                next->next = curr;
-                prev = next;
-
-            } else {
-                prev = curr;
-                curr = prev->next;
-            }
-
-            next = curr->next;
-        }
-    } while (swapped);
+    // split in halves, the slow pointer ends on the last node of the first
+    slh_node_t *slow = *head;
+    slh_node_t *fast = (*head)->next;
+    while (fast != NULL && fast->next != NULL) {
+        slow = slow->next;
+        fast = fast->next->next;
+    }
+    slh_node_t *second = slow->next;
+    slow->next = NULL;
+
+    slh_list_sort(head);
+    slh_list_sort(&second);
+    *head = merge(*head, second);
 }
 
 size_t slh_list_size(slh_node_t *node) {
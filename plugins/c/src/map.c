@@ -0,0 +1,341 @@
+#include "slh/map.h"
+#include "slh/point.h"
+#include <stdlib.h>
+#include <string.h>
+
+// the map grows once more than 7/8 of its slots are used
+#define SLH_MAP_MIN_CAP 8
+#define SLH_MAP_LOAD_NUM 7
+#define SLH_MAP_LOAD_DEN 8
+
+struct slh_map_t {
+    size_t key_size;
+    size_t value_size;
+    size_t value_offset;
+    // bytes per entry, key followed by value
+    size_t stride;
+    slh_map_hash_t hash;
+    slh_map_eq_t eq;
+    // NULL when allocated with malloc
+    slh_arena_t *arena;
+
+    size_t size;
+    size_t cap;
+    // log2(cap), the top bits of the hash pick the home slot
+    unsigned bits;
+    // distance of each entry to its home slot plus one, 0 for empty slots
+    uint32_t *dists;
+    char *entries;
+    // entry displaced while inserting
+    char *carry;
+};
+
+// largest power of two, up to 8, that the size is a multiple of
+static size_t align_of(size_t size) {
+    size_t align = size & -size;
+    return (align == 0 || align > 8) ? 8 : align;
+}
+
+static size_t round_up(size_t size, size_t align) {
+    return (size + align - 1) / align * align;
+}
+
+static void *alloc(slh_arena_t *arena, size_t size) {
+    return arena == NULL ? malloc(size) : slh_arena_alloc(arena, size);
+}
+
+static void release(slh_arena_t *arena, void *ptr) {
+    if (arena == NULL) {
+        free(ptr);
+    }
+}
+
+slh_map_t *slh_map_create(size_t key_size, size_t value_size,
+                          slh_map_hash_t hash, slh_map_eq_t eq) {
+    return slh_map_create_in(NULL, key_size, value_size, hash, eq);
+}
+
+slh_map_t *slh_map_create_in(slh_arena_t *arena, size_t key_size,
+                             size_t value_size, slh_map_hash_t hash,
+                             slh_map_eq_t eq) {
+    slh_map_t *map = alloc(arena, sizeof(slh_map_t));
+    if (map == NULL) {
+        return NULL;
+    }
+
+    size_t key_align = align_of(key_size);
+    size_t value_align = value_size == 0 ? 1 : align_of(value_size);
+    size_t value_offset = round_up(key_size, value_align);
+    size_t align = key_align > value_align ? key_align : value_align;
+
+    *map = (slh_map_t){
+        .key_size = key_size,
+        .value_size = value_size,
+        .value_offset = value_offset,
+        .stride = round_up(value_offset + value_size, align),
+        .hash = hash,
+        .eq = eq,
+        .arena = arena,
+    };
+    map->carry = alloc(arena, map->stride);
+    if (map->carry == NULL) {
+        release(arena, map);
+        return NULL;
+    }
+    return map;
+}
+
+void slh_map_free(slh_map_t *map) {
+    if (map == NULL) {
+        return;
+    }
+    release(map->arena, map->dists);
+    release(map->arena, map->entries);
+    release(map->arena, map->carry);
+    release(map->arena, map);
+}
+
+size_t slh_map_size(const slh_map_t *map) { return map->size; }
+
+void slh_map_clear(slh_map_t *map) {
+    if (map->dists != NULL) {
+        memset(map->dists, 0, map->cap * sizeof(uint32_t));
+    }
+    map->size = 0;
+}
+
+static char *entry_at(const slh_map_t *map, size_t idx) {
+    return map->entries + idx * map->stride;
+}
+
+static uint64_t hash_key(const slh_map_t *map, const void *key) {
+    if (map->hash != NULL) {
+        return map->hash(key);
+    }
+    return slh_hash_bytes(key, map->key_size);
+}
+
+static bool eq_key(const slh_map_t *map, const void *a, const void *b) {
+    if (map->eq != NULL) {
+        return map->eq(a, b);
+    }
+    return memcmp(a, b, map->key_size) == 0;
+}
+
+static size_t home_of(const slh_map_t *map, uint64_t hash) {
+    // fibonacci hashing, spreads weak user provided hashes too
+    return (hash * 0x9e3779b97f4a7c15ull) >> (64 - map->bits);
+}
+
+// Returns the slot of the key, or cap if it isn't in the map.
+static size_t find(const slh_map_t *map, const void *key) {
+    if (map->size == 0) {
+        return map->cap;
+    }
+
+    size_t mask = map->cap - 1;
+    size_t idx = home_of(map, hash_key(map, key));
+    // entries are ordered by distance, stop once ours would have been
+    for (uint32_t dist = 1; map->dists[idx] >= dist; ++dist) {
+        if (map->dists[idx] == dist && eq_key(map, entry_at(map, idx), key)) {
+            return idx;
+        }
+        idx = (idx + 1) & mask;
+    }
+    return map->cap;
+}
+
+static void swap_entry(char *a, char *b, size_t size) {
+    for (size_t i = 0; i < size; ++i) {
+        char tmp = a[i];
+        a[i] = b[i];
+        b[i] = tmp;
+    }
+}
+
+// Inserts the entry in map->carry, which mustn't be in the map yet,
+// returning where it was stored.
+static char *insert_carry(slh_map_t *map) {
+    size_t mask = map->cap - 1;
+    size_t idx = home_of(map, hash_key(map, map->carry));
+    char *stored = NULL;
+    for (uint32_t dist = 1;; ++dist, idx = (idx + 1) & mask) {
+        if (map->dists[idx] == 0) {
+            memcpy(entry_at(map, idx), map->carry, map->stride);
+            map->dists[idx] = dist;
+            map->size++;
+            return stored != NULL ? stored : entry_at(map, idx);
+        }
+
+        // take the slot from entries closer to their home
+        if (map->dists[idx] < dist) {
+            swap_entry(entry_at(map, idx), map->carry, map->stride);
+            uint32_t displaced = map->dists[idx];
+            map->dists[idx] = dist;
+            dist = displaced;
+            if (stored == NULL) {
+                stored = entry_at(map, idx);
+            }
+        }
+    }
+}
+
+static bool grow(slh_map_t *map) {
+    size_t cap = map->cap == 0 ? SLH_MAP_MIN_CAP : 2 * map->cap;
+    uint32_t *dists = alloc(map->arena, cap * sizeof(uint32_t));
+    char *entries = alloc(map->arena, cap * map->stride);
+    if (dists == NULL || entries == NULL) {
+        release(map->arena, dists);
+        release(map->arena, entries);
+        return false;
+    }
+    memset(dists, 0, cap * sizeof(uint32_t));
+
+    uint32_t *old_dists = map->dists;
+    char *old_entries = map->entries;
+    size_t old_cap = map->cap;
+
+    map->dists = dists;
+    map->entries = entries;
+    map->cap = cap;
+    map->bits = __builtin_ctzll(cap);
+    map->size = 0;
+    for (size_t i = 0; i < old_cap; ++i) {
+        if (old_dists[i] != 0) {
+            memcpy(map->carry, old_entries + i * map->stride, map->stride);
+            insert_carry(map);
+        }
+    }
+
+    release(map->arena, old_dists);
+    release(map->arena, old_entries);
+    return true;
+}
+
+// Returns the entry of the key, inserting it with a zeroed value if it
+// isn't in the map yet.
+static char *find_or_insert(slh_map_t *map, const void *key) {
+    size_t idx = find(map, key);
+    if (idx != map->cap) {
+        return entry_at(map, idx);
+    }
+
+    if ((map->size + 1) * SLH_MAP_LOAD_DEN > map->cap * SLH_MAP_LOAD_NUM &&
+        !grow(map)) {
+        return NULL;
+    }
+
+    memset(map->carry, 0, map->stride);
+    memcpy(map->carry, key, map->key_size);
+    return insert_carry(map);
+}
+
+void *slh_map_get(const slh_map_t *map, const void *key) {
+    size_t idx = find(map, key);
+    if (idx == map->cap) {
+        return NULL;
+    }
+    return entry_at(map, idx) + map->value_offset;
+}
+
+bool slh_map_contains(const slh_map_t *map, const void *key) {
+    return find(map, key) != map->cap;
+}
+
+void *slh_map_put(slh_map_t *map, const void *key, const void *value) {
+    char *entry = find_or_insert(map, key);
+    if (entry == NULL) {
+        return NULL;
+    }
+    if (map->value_size > 0) {
+        memcpy(entry + map->value_offset, value, map->value_size);
+    }
+    return entry + map->value_offset;
+}
+
+void *slh_map_entry(slh_map_t *map, const void *key) {
+    char *entry = find_or_insert(map, key);
+    if (entry == NULL) {
+        return NULL;
+    }
+    return entry + map->value_offset;
+}
+
+bool slh_map_remove(slh_map_t *map, const void *key) {
+    size_t idx = find(map, key);
+    if (idx == map->cap) {
+        return false;
+    }
+
+    // shift following entries back until one is at its home slot
+    size_t mask = map->cap - 1;
+    size_t next = (idx + 1) & mask;
+    while (map->dists[next] > 1) {
+        memcpy(entry_at(map, idx), entry_at(map, next), map->stride);
+        map->dists[idx] = map->dists[next] - 1;
+        idx = next;
+        next = (next + 1) & mask;
+    }
+    map->dists[idx] = 0;
+    map->size--;
+    return true;
+}
+
+bool slh_map_next(const slh_map_t *map, size_t *iter, const void **key,
+                  void **value) {
+    for (; *iter < map->cap; ++*iter) {
+        if (map->dists[*iter] != 0) {
+            char *entry = entry_at(map, (*iter)++);
+            *key = entry;
+            *value = entry + map->value_offset;
+            return true;
+        }
+    }
+    return false;
+}
+
+uint64_t slh_hash_u64(uint64_t x) {
+    // splitmix64 finalizer
+    x ^= x >> 30;
+    x *= 0xbf58476d1ce4e5b9ull;
+    x ^= x >> 27;
+    x *= 0x94d049bb133111ebull;
+    x ^= x >> 31;
+    return x;
+}
+
+uint64_t slh_hash_bytes(const void *data, size_t size) {
+    const unsigned char *bytes = data;
+    uint64_t hash = size;
+    // eight bytes at a time, e.g. a whole int64_t or slh_point_t
+    for (; size >= 8; bytes += 8, size -= 8) {
+        uint64_t word;
+        memcpy(&word, bytes, 8);
+        hash = slh_hash_u64(hash ^ word);
+    }
+    if (size > 0) {
+        uint64_t word = 0;
+        memcpy(&word, bytes, size);
+        hash = slh_hash_u64(hash ^ word);
+    }
+    return hash;
+}
+
+uint64_t slh_map_hash_int(const void *key) {
+    return slh_hash_u64(*(const int64_t *)key);
+}
+
+bool slh_map_eq_int(const void *a, const void *b) {
+    return *(const int64_t *)a == *(const int64_t *)b;
+}
+
+uint64_t slh_map_hash_point(const void *key) {
+    const slh_point_t *p = key;
+    return slh_hash_u64((uint64_t)(uint32_t)p->x << 32 | (uint32_t)p->y);
+}
+
+bool slh_map_eq_point(const void *a, const void *b) {
+    const slh_point_t *p = a;
+    const slh_point_t *q = b;
+    return p->x == q->x && p->y == q->y;
+}
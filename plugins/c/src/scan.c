@@ -0,0 +1,96 @@
+#include "slh/scan.h"
+#include "slh/vec.h"
+#include <string.h>
+
+slh_scanner_t slh_scanner(const slh_sized_ptr_t *text) {
+    return (slh_scanner_t){.pos = text->ptr, .end = text->ptr + text->size};
+}
+
+bool slh_scan_line(slh_scanner_t *scanner, slh_sized_ptr_t *line) {
+    if (scanner->pos >= scanner->end) {
+        return false;
+    }
+
+    char *start = scanner->pos;
+    char *newline = memchr(start, '\n', scanner->end - start);
+    char *stop = newline == NULL ? scanner->end : newline;
+    scanner->pos = newline == NULL ? scanner->end : newline + 1;
+
+    if (stop > start && stop[-1] == '\r') {
+        stop--;
+    }
+    *line = (slh_sized_ptr_t){.ptr = start, .size = stop - start};
+    return true;
+}
+
+static bool is_blank(const slh_sized_ptr_t *line) { return line->size == 0; }
+
+bool slh_scan_block(slh_scanner_t *scanner, slh_sized_ptr_t *block) {
+    slh_sized_ptr_t line;
+    // skip blank lines before the block
+    do {
+        if (!slh_scan_line(scanner, &line)) {
+            return false;
+        }
+    } while (is_blank(&line));
+
+    char *start = line.ptr;
+    char *stop = line.ptr + line.size;
+    while (slh_scan_line(scanner, &line) && !is_blank(&line)) {
+        stop = line.ptr + line.size;
+    }
+    *block = (slh_sized_ptr_t){.ptr = start, .size = stop - start};
+    return true;
+}
+
+static bool is_digit(char c) { return c >= '0' && c <= '9'; }
+
+bool slh_scan_int(slh_scanner_t *scanner, int64_t *value) {
+    char *pos = scanner->pos;
+    while (pos < scanner->end && !is_digit(*pos)) {
+        pos++;
+    }
+    if (pos == scanner->end) {
+        scanner->pos = pos;
+        return false;
+    }
+
+    bool negative = pos > scanner->pos && pos[-1] == '-';
+    int64_t result = 0;
+    for (; pos < scanner->end && is_digit(*pos); pos++) {
+        result = result * 10 + (*pos - '0');
+    }
+    scanner->pos = pos;
+    *value = negative ? -result : result;
+    return true;
+}
+
+int64_t *slh_scan_ints(const slh_sized_ptr_t *text, int64_t *vec) {
+    slh_scanner_t scanner = slh_scanner(text);
+    int64_t value;
+    while (slh_scan_int(&scanner, &value)) {
+        int64_t *grown = slh_vec_append(vec, &value);
+        if (grown == NULL) {
+            slh_vec_free(vec);
+            return NULL;
+        }
+        vec = grown;
+    }
+    return vec;
+}
+
+bool slh_scan_grid_dims(const slh_sized_ptr_t *text, size_t *width,
+                        size_t *height) {
+    slh_scanner_t scanner = slh_scanner(text);
+    slh_sized_ptr_t line;
+    *width = 0;
+    *height = 0;
+    while (slh_scan_line(&scanner, &line)) {
+        if (*height > 0 && line.size != *width) {
+            return false;
+        }
+        *width = line.size;
+        (*height)++;
+    }
+    return true;
+}
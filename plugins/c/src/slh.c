@@ -2,6 +2,9 @@
 #include "input.h"
 #include <stdio.h>
 #include <stdlib.h>
+#include <string.h>
+#include <sys/resource.h>
+#include <time.h>
 
 slh_solution_t slh_solution_err(char *err) {
     return (slh_solution_t){.err = err, .answer = 0};
@@ -11,6 +14,91 @@ slh_solution_t slh_solution_answer(int64_t answer) {
     return (slh_solution_t){.err = NULL, .answer = answer};
 }
 
+static int64_t elapsed_ns(struct timespec start, struct timespec end) {
+    return (end.tv_sec - start.tv_sec) * 1000000000 +
+           (end.tv_nsec - start.tv_nsec);
+}
+
+// Peak resident set size of this process in bytes, or -1 if unknown.
+// On linux the rusage of a process includes what it used before exec,
+// i.e. its parent's size when it forked, the high-water mark of
+// /proc/self/status only covers this program.
+static int64_t peak_rss(void) {
+#ifdef __linux__
+    FILE *status = fopen("/proc/self/status", "r");
+    if (status != NULL) {
+        char line[256];
+        long long kb = -1;
+        while (fgets(line, sizeof(line), status) != NULL) {
+            if (sscanf(line, "VmHWM: %lld kB", &kb) == 1) {
+                break;
+            }
+        }
+        fclose(status);
+        if (kb >= 0) {
+            return kb * 1024;
+        }
+    }
+#endif
+    struct rusage usage;
+    if (getrusage(RUSAGE_SELF, &usage) == -1) {
+        return -1;
+    }
+#ifdef __APPLE__
+    return usage.ru_maxrss;
+#else
+    return (int64_t)usage.ru_maxrss * 1024;
+#endif
+}
+
+// Calls the solution count times, printing the answer followed by the
+// duration of each call in nanoseconds, one per line.
+static int benchmark(const slh_sized_ptr_t *input,
+                     slh_solution_t (*solution)(const slh_sized_ptr_t *),
+                     size_t count) {
+    // solutions may modify their input, each call gets a fresh copy
+    slh_sized_ptr_t copy = slh_sized_ptr_create(input->size + 1);
+    int64_t *durations = malloc(count * sizeof(int64_t));
+    if (copy.ptr == NULL || durations == NULL) {
+        perror("Memory allocation failed");
+        free(copy.ptr);
+        free(durations);
+        return 1;
+    }
+    copy.size = input->size;
+
+    int64_t answer = 0;
+    for (size_t i = 0; i < count; ++i) {
+        memcpy(copy.ptr, input->ptr, input->size + 1);
+
+        struct timespec start, end;
+        clock_gettime(CLOCK_MONOTONIC, &start);
+        slh_solution_t solved = solution(&copy);
+        clock_gettime(CLOCK_MONOTONIC, &end);
+
+        char *err = solved.err;
+        if (err == NULL && i > 0 && solved.answer != answer) {
+            err = "answer changed between calls";
+        }
+        if (err != NULL) {
+            printf("Error: %s\n", err);
+            free(copy.ptr);
+            free(durations);
+            return 1;
+        }
+        answer = solved.answer;
+        durations[i] = elapsed_ns(start, end);
+    }
+
+    printf("%ld\n", answer);
+    for (size_t i = 0; i < count; ++i) {
+        printf("%ld\n", durations[i]);
+    }
+    free(copy.ptr);
+    free(durations);
+    return 0;
+}
+
 int slh_main(int argc, char *argv[],
              slh_solution_t (*solution)(const slh_sized_ptr_t *)) {
     slh_args_t slh_args = parse_args(argc, argv);
@@ -24,13 +112,22 @@ int slh_main(int argc, char *argv[],
         return 1;
     };
 
+    if (slh_args.count > 0) {
+        int rtc = benchmark(&input, solution, slh_args.count);
+        slh_file_free_text(input);
+        return rtc;
+    }
+
     slh_solution_t solved = solution(&input);
-    free(input.ptr);
+    slh_file_free_text(input);
     if (solved.err != NULL) {
         printf("Error: %s\n", solved.err);
         return 1;
     }
 
     printf("%ld\n", solved.answer);
+    if (slh_args.peak_rss) {
+        printf("%ld\n", peak_rss());
+    }
     return 0;
 }
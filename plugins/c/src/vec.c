@@ -9,11 +9,18 @@ typedef struct slh_vec_header_t {
     size_t size;
     size_t cap;
     size_t elemsize;
+    // NULL when allocated with malloc
+    slh_arena_t *arena;
 } slh_vec_header_t;
 
 void *slh_vec_create(size_t cap, size_t elemsize) {
+    return slh_vec_create_in(NULL, cap, elemsize);
+}
+
+void *slh_vec_create_in(slh_arena_t *arena, size_t cap, size_t elemsize) {
+    size_t bytes = sizeof(slh_vec_header_t) + elemsize * cap;
     slh_vec_header_t *header =
-        malloc(sizeof(slh_vec_header_t) + elemsize * cap);
+        arena == NULL ? malloc(bytes) : slh_arena_alloc(arena, bytes);
     if (header == NULL) {
         assert("memory allocation failed" || false);
         return NULL;
@@ -21,6 +28,7 @@ void *slh_vec_create(size_t cap, size_t elemsize) {
     header->size = 0;
     header->cap = cap;
     header->elemsize = elemsize;
+    header->arena = arena;
     return (void *)(header + 1);
 }
 
@@ -28,17 +36,30 @@ static slh_vec_header_t *slh_vec_header(const void *vec) {
     return ((slh_vec_header_t *)(vec)-1);
 }
 
-void slh_vec_free(void *vec) { free(slh_vec_header(vec)); }
+void slh_vec_free(void *vec) {
+    if (slh_vec_header(vec)->arena == NULL) {
+        free(slh_vec_header(vec));
+    }
+}
 
 size_t slh_vec_cap(const void *vec) { return slh_vec_header(vec)->cap; }
 
 size_t slh_vec_size(const void *vec) { return slh_vec_header(vec)->size; }
 
 void *slh_vec_resize(void *vec, size_t cap) {
-    size_t size = slh_vec_size(vec);
-    size_t elemsize = slh_vec_header(vec)->elemsize;
+    slh_vec_header_t *header = slh_vec_header(vec);
+    size_t bytes = sizeof(slh_vec_header_t) + cap * header->elemsize;
     slh_vec_header_t *new_header =
-        realloc(slh_vec_header(vec), sizeof(slh_vec_header_t) + cap * elemsize);
+        header->arena == NULL
+            ? realloc(header, bytes)
+            : slh_arena_realloc(header->arena, header,
+                                sizeof(slh_vec_header_t) +
+                                    header->cap * header->elemsize,
+                                bytes);
+    if (new_header == NULL) {
+        // the old allocation is still intact
+        return NULL;
+    }
     new_header->cap = cap;
     return (void *)(new_header + 1);
 }
@@ -62,6 +83,9 @@ void *slh_vec_append(void *vec, const void *value) {
     if (header->size >= header->cap) {
         auto new_cap = (header->cap == 0) ? 1 : (header->cap << 1);
         vec = slh_vec_resize(vec, new_cap);
+        if (vec == NULL) {
+            return NULL;
+        }
         return slh_vec_append(vec, value);
     }
     auto end = header->size++;
@@ -69,6 +93,18 @@ void *slh_vec_append(void *vec, const void *value) {
     return vec;
 }
 
+bool slh_vec_pop(void *vec, void *value) {
+    auto header = slh_vec_header(vec);
+    if (header->size == 0) {
+        return false;
+    }
+    header->size--;
+    if (value != NULL) {
+        memmove(value, vec + header->elemsize * header->size, header->elemsize);
+    }
+    return true;
+}
+
 void slh_vec_map(void *vec, const void (*map)(void *)) {
     auto header = slh_vec_header(vec);
     for (int i = 0; i < header->size; i++) {
@@ -87,3 +123,253 @@ int slh_vec_find(void *vec, const void *value) {
     }
     return -1;
 }
+
+// sorts ranges of up to this many elements with insertion sort
+#define SLH_VEC_INSERTION_SORT_MAX 16
+
+static char *elem_at(void *vec, size_t elemsize, size_t idx) {
+    return (char *)vec + elemsize * idx;
+}
+
+static void swap_elems(char *a, char *b, size_t elemsize) {
+    if (a == b) {
+        return;
+    }
+    // common element sizes, without a call to memcpy
+    if (elemsize == sizeof(uint32_t)) {
+        uint32_t tmp;
+        memcpy(&tmp, a, sizeof(tmp));
+        memcpy(a, b, sizeof(tmp));
+        memcpy(b, &tmp, sizeof(tmp));
+        return;
+    }
+    if (elemsize == sizeof(uint64_t)) {
+        uint64_t tmp;
+        memcpy(&tmp, a, sizeof(tmp));
+        memcpy(a, b, sizeof(tmp));
+        memcpy(b, &tmp, sizeof(tmp));
+        return;
+    }
+
+    char tmp[64];
+    while (elemsize > 0) {
+        size_t n = elemsize < sizeof(tmp) ? elemsize : sizeof(tmp);
+        memcpy(tmp, a, n);
+        memcpy(a, b, n);
+        memcpy(b, tmp, n);
+        a += n;
+        b += n;
+        elemsize -= n;
+    }
+}
+
+static void insertion_sort(char *base, size_t n, size_t elemsize,
+                           slh_vec_cmp_t cmp) {
+    for (size_t i = 1; i < n; i++) {
+        for (size_t j = i; j > 0; j--) {
+            char *prev = base + (j - 1) * elemsize;
+            if (cmp(prev, prev + elemsize) <= 0) {
+                break;
+            }
+            swap_elems(prev, prev + elemsize, elemsize);
+        }
+    }
+}
+
+static void sift_down(char *base, size_t root, size_t n, size_t elemsize,
+                      slh_vec_cmp_t cmp) {
+    for (;;) {
+        size_t child = 2 * root + 1;
+        if (child >= n) {
+            return;
+        }
+        if (child + 1 < n && cmp(base + child * elemsize,
+                                 base + (child + 1) * elemsize) < 0) {
+            child++;
+        }
+        if (cmp(base + root * elemsize, base + child * elemsize) >= 0) {
+            return;
+        }
+        swap_elems(base + root * elemsize, base + child * elemsize, elemsize);
+        root = child;
+    }
+}
+
+static void heap_sort(char *base, size_t n, size_t elemsize,
+                      slh_vec_cmp_t cmp) {
+    for (size_t i = n / 2; i > 0; i--) {
+        sift_down(base, i - 1, n, elemsize, cmp);
+    }
+    for (size_t end = n - 1; end > 0; end--) {
+        swap_elems(base, base + end * elemsize, elemsize);
+        sift_down(base, 0, end, elemsize, cmp);
+    }
+}
+
+// Partitions around the median of the first, middle and last element,
+// returning the final index of the pivot. Elements equal to the pivot
+// are spread over both sides, so duplicates don't unbalance it.
+static size_t partition(char *base, size_t n, size_t elemsize,
+                        slh_vec_cmp_t cmp) {
+    char *first = base;
+    char *mid = base + (n / 2) * elemsize;
+    char *last = base + (n - 1) * elemsize;
+    if (cmp(mid, first) < 0) {
+        swap_elems(mid, first, elemsize);
+    }
+    if (cmp(last, mid) < 0) {
+        swap_elems(last, mid, elemsize);
+        if (cmp(mid, first) < 0) {
+            swap_elems(mid, first, elemsize);
+        }
+    }
+    // the pivot stays at the front until the end
+    swap_elems(first, mid, elemsize);
+
+    size_t i = 0;
+    size_t j = n;
+    for (;;) {
+        do {
+            i++;
+        } while (i < n && cmp(base + i * elemsize, first) < 0);
+        do {
+            j--;
+        } while (cmp(base + j * elemsize, first) > 0);
+        if (i >= j) {
+            break;
+        }
+        swap_elems(base + i * elemsize, base + j * elemsize, elemsize);
+    }
+    swap_elems(first, base + j * elemsize, elemsize);
+    return j;
+}
+
+static void intro_sort(char *base, size_t n, size_t elemsize,
+                       slh_vec_cmp_t cmp, int depth) {
+    while (n > SLH_VEC_INSERTION_SORT_MAX) {
+        // quicksort is going quadratic, switch to heapsort
+        if (depth-- == 0) {
+            heap_sort(base, n, elemsize, cmp);
+            return;
+        }
+
+        size_t pivot = partition(base, n, elemsize, cmp);
+        // recurse into the smaller side to bound the stack depth
+        size_t right = n - pivot - 1;
+        if (pivot < right) {
+            intro_sort(base, pivot, elemsize, cmp, depth);
+            base += (pivot + 1) * elemsize;
+            n = right;
+        } else {
+            intro_sort(base + (pivot + 1) * elemsize, right, elemsize, cmp,
+                       depth);
+            n = pivot;
+        }
+    }
+    insertion_sort(base, n, elemsize, cmp);
+}
+
+void slh_vec_sort(void *vec, slh_vec_cmp_t cmp) {
+    const auto header = slh_vec_header(vec);
+    size_t n = header->size;
+    if (n < 2) {
+        return;
+    }
+    int depth = 2 * (64 - __builtin_clzll(n));
+    intro_sort(vec, n, header->elemsize, cmp, depth);
+}
+
+typedef struct {
+    uint64_t key;
+    size_t idx;
+} slh_vec_keyed_t;
+
+bool slh_vec_sort_by_key(void *vec, slh_vec_key_t key) {
+    const auto header = slh_vec_header(vec);
+    size_t n = header->size;
+    size_t elemsize = header->elemsize;
+    if (n < 2) {
+        return true;
+    }
+
+    slh_vec_keyed_t *keyed = malloc(2 * n * sizeof(slh_vec_keyed_t));
+    char *sorted = malloc(n * elemsize);
+    if (keyed == NULL || sorted == NULL) {
+        free(keyed);
+        free(sorted);
+        return false;
+    }
+
+    uint64_t differing = 0;
+    for (size_t i = 0; i < n; i++) {
+        keyed[i] = (slh_vec_keyed_t){.key = key(elem_at(vec, elemsize, i)),
+                                     .idx = i};
+        differing |= keyed[i].key ^ keyed[0].key;
+    }
+
+    // least significant byte first, each pass is stable
+    slh_vec_keyed_t *src = keyed;
+    slh_vec_keyed_t *dst = keyed + n;
+    for (int shift = 0; shift < 64; shift += 8) {
+        // all keys share this byte, nothing to do
+        if (((differing >> shift) & 0xff) == 0) {
+            continue;
+        }
+
+        size_t offsets[256] = {0};
+        for (size_t i = 0; i < n; i++) {
+            offsets[(src[i].key >> shift) & 0xff]++;
+        }
+        size_t total = 0;
+        for (size_t b = 0; b < 256; b++) {
+            size_t count = offsets[b];
+            offsets[b] = total;
+            total += count;
+        }
+        for (size_t i = 0; i < n; i++) {
+            dst[offsets[(src[i].key >> shift) & 0xff]++] = src[i];
+        }
+
+        slh_vec_keyed_t *tmp = src;
+        src = dst;
+        dst = tmp;
+    }
+
+    for (size_t i = 0; i < n; i++) {
+        memcpy(sorted + i * elemsize, elem_at(vec, elemsize, src[i].idx),
+               elemsize);
+    }
+    memcpy(vec, sorted, n * elemsize);
+
+    free(keyed);
+    free(sorted);
+    return true;
+}
+
+// First index whose element isn't before the value, an element is before
+// it when cmp(elem, value) < bias, 0 for lower and 1 for upper bounds.
+static size_t partition_point(const void *vec, const void *value,
+                              slh_vec_cmp_t cmp, int bias) {
+    const auto header = slh_vec_header(vec);
+    size_t lo = 0;
+    size_t hi = header->size;
+    while (lo < hi) {
+        size_t mid = lo + (hi - lo) / 2;
+        if (cmp(elem_at((void *)vec, header->elemsize, mid), value) < bias) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    return lo;
+}
+
+size_t slh_vec_lower_bound(const void *vec, const void *value,
+                           slh_vec_cmp_t cmp) {
+    return partition_point(vec, value, cmp, 0);
+}
+
+size_t slh_vec_upper_bound(const void *vec, const void *value,
+                           slh_vec_cmp_t cmp) {
+    return partition_point(vec, value, cmp, 1);
+}
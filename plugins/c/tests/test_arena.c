@@ -0,0 +1,144 @@
+#include "./testing.h"
+
+#include <stdalign.h>
+#include <stdint.h>
+#include <string.h>
+
+#include "slh/arena.h"
+#include "slh/list.h"
+#include "slh/map.h"
+#include "slh/vec.h"
+
+TEST(test_slh_arena_alloc) {
+    slh_arena_t arena = slh_arena_create(0);
+    char *a = slh_arena_alloc(&arena, 3);
+    int64_t *b = slh_arena_alloc(&arena, sizeof(int64_t));
+    assert(a != NULL && b != NULL);
+    assert((uintptr_t)b % alignof(max_align_t) == 0);
+
+    memcpy(a, "ab", 3);
+    *b = 42;
+    assert(strcmp(a, "ab") == 0);
+    assert(*b == 42);
+    slh_arena_free(&arena);
+    assert(arena.block == NULL);
+}
+
+TEST(test_slh_arena_alloc_larger_than_block) {
+    slh_arena_t arena = slh_arena_create(64);
+    char *small = slh_arena_alloc(&arena, 16);
+    char *large = slh_arena_alloc(&arena, 1000);
+    assert(small != NULL && large != NULL);
+    memset(large, 'x', 1000);
+    slh_arena_free(&arena);
+}
+
+TEST(test_slh_arena_realloc_in_place) {
+    slh_arena_t arena = slh_arena_create(1024);
+    char *ptr = slh_arena_alloc(&arena, 16);
+    memcpy(ptr, "grows in place", 15);
+
+    char *grown = slh_arena_realloc(&arena, ptr, 16, 256);
+    assert(grown == ptr);
+    assert(strcmp(grown, "grows in place") == 0);
+
+    // no longer the most recent allocation
+    slh_arena_alloc(&arena, 16);
+    char *moved = slh_arena_realloc(&arena, grown, 256, 512);
+    assert(moved != grown);
+    assert(strcmp(moved, "grows in place") == 0);
+    slh_arena_free(&arena);
+}
+
+TEST(test_slh_arena_mark_reset) {
+    slh_arena_t arena = slh_arena_create(64);
+    char *kept = slh_arena_alloc(&arena, 16);
+
+    slh_arena_mark_t mark = slh_arena_mark(&arena);
+    for (int i = 0; i < 100; i++) {
+        slh_arena_alloc(&arena, 32);
+    }
+    slh_arena_reset(&arena, mark);
+
+    assert(arena.block == mark.block);
+    assert(arena.used == mark.used);
+    // memory after the mark is handed out again
+    char *reused = slh_arena_alloc(&arena, 16);
+    assert(reused == kept + 16);
+    slh_arena_free(&arena);
+}
+
+static slh_arena_mark_t scoped_alloc(slh_arena_t *arena) {
+    SLH_ARENA_SCOPE(arena);
+    for (int i = 0; i < 100; i++) {
+        slh_arena_alloc(arena, 32);
+    }
+    return slh_arena_mark(arena);
+}
+
+TEST(test_slh_arena_scope) {
+    slh_arena_t arena = slh_arena_create(64);
+    slh_arena_alloc(&arena, 16);
+    slh_arena_mark_t before = slh_arena_mark(&arena);
+
+    slh_arena_mark_t inside = scoped_alloc(&arena);
+    assert(inside.block != before.block);
+
+    {
+        SLH_ARENA_SCOPE(&arena);
+        SLH_ARENA_SCOPE(&arena);
+        slh_arena_alloc(&arena, 1000);
+    }
+
+    assert(arena.block == before.block);
+    assert(arena.used == before.used);
+    slh_arena_free(&arena);
+}
+
+TEST(test_slh_vec_create_in) {
+    slh_arena_t arena = slh_arena_create(0);
+    int *vec = slh_vec_create_in(&arena, 0, sizeof(int));
+    for (int i = 0; i < 1000; i++) {
+        vec = slh_vec_append(vec, &i);
+    }
+
+    assert(slh_vec_size(vec) == 1000);
+    for (int i = 0; i < 1000; i++) {
+        assert(vec[i] == i);
+    }
+    // released with the arena
+    slh_vec_free(vec);
+    slh_arena_free(&arena);
+}
+
+TEST(test_slh_list_create_in) {
+    slh_arena_t arena = slh_arena_create(0);
+    slh_node_t *list = NULL;
+    for (int i = 0; i < 100; i++) {
+        slh_list_append_in(&arena, &list, i);
+        slh_list_prepend_in(&arena, &list, -i);
+    }
+
+    assert(slh_list_size(list) == 200);
+    assert(list->value == -99);
+    assert(slh_list_end(list)->value == 99);
+    slh_arena_free(&arena);
+}
+
+TEST(test_slh_map_create_in) {
+    slh_arena_t arena = slh_arena_create(0);
+    slh_map_t *map =
+        slh_map_create_in(&arena, sizeof(int64_t), sizeof(int64_t), NULL, NULL);
+    for (int64_t i = 0; i < 1000; i++) {
+        slh_map_put(map, &i, &(int64_t){-i});
+    }
+
+    assert(slh_map_size(map) == 1000);
+    for (int64_t i = 0; i < 1000; i++) {
+        assert(*(int64_t *)slh_map_get(map, &i) == -i);
+    }
+    slh_map_free(map);
+    slh_arena_free(&arena);
+}
+
+MAIN(test_arena)
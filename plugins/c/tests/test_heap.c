@@ -0,0 +1,129 @@
+#include "./testing.h"
+
+#include <stdlib.h>
+
+#include "slh/heap.h"
+
+static int cmp_int(const void *a, const void *b) {
+    int x = *(const int *)a;
+    int y = *(const int *)b;
+    return (x > y) - (x < y);
+}
+
+TEST(test_slh_heap_empty) {
+    slh_heap_t *heap = slh_heap_create(sizeof(int), &cmp_int);
+    assert(heap != NULL);
+    assert(slh_heap_size(heap) == 0);
+    assert(slh_heap_peek(heap) == NULL);
+    bool popped = slh_heap_pop(heap, NULL);
+    assert(!popped);
+    slh_heap_free(heap);
+}
+
+TEST(test_slh_heap_pops_in_order) {
+    slh_heap_t *heap = slh_heap_create(sizeof(int), &cmp_int);
+    for (int i = 0; i < 1000; i++) {
+        int value = rand() % 100;
+        slh_heap_handle_t handle = slh_heap_push(heap, &value);
+        assert(handle == (slh_heap_handle_t)i);
+    }
+    assert(slh_heap_size(heap) == 1000);
+
+    int prev = -1;
+    int value;
+    for (int i = 0; i < 1000; i++) {
+        assert(*(const int *)slh_heap_peek(heap) >= prev);
+        bool popped = slh_heap_pop(heap, &value);
+        assert(popped);
+        assert(value >= prev);
+        prev = value;
+    }
+    assert(slh_heap_size(heap) == 0);
+    slh_heap_free(heap);
+}
+
+TEST(test_slh_heap_interleaved) {
+    slh_heap_t *heap = slh_heap_create(sizeof(int), &cmp_int);
+    int values[] = {5, 3, 8};
+    for (int i = 0; i < 3; i++) {
+        slh_heap_push(heap, &values[i]);
+    }
+
+    int value;
+    slh_heap_pop(heap, &value);
+    assert(value == 3);
+    slh_heap_push(heap, &(int){1});
+    slh_heap_push(heap, &(int){9});
+    slh_heap_pop(heap, &value);
+    assert(value == 1);
+    slh_heap_pop(heap, &value);
+    assert(value == 5);
+    slh_heap_pop(heap, &value);
+    assert(value == 8);
+    slh_heap_pop(heap, &value);
+    assert(value == 9);
+    slh_heap_free(heap);
+}
+
+TEST(test_slh_heap_from_array) {
+    int values[1000];
+    for (int i = 0; i < 1000; i++) {
+        values[i] = rand() % 1000;
+    }
+
+    slh_heap_t *heap = slh_heap_from_array(values, 1000, sizeof(int), &cmp_int);
+    assert(slh_heap_size(heap) == 1000);
+    for (size_t i = 0; i < 1000; i++) {
+        assert(slh_heap_contains(heap, i));
+    }
+
+    int prev = -1;
+    int value;
+    while (slh_heap_pop(heap, &value)) {
+        assert(value >= prev);
+        prev = value;
+    }
+    slh_heap_free(heap);
+}
+
+typedef struct {
+    int64_t dist;
+    int32_t node;
+} queued_t;
+
+static int cmp_dist(const void *a, const void *b) {
+    int64_t x = ((const queued_t *)a)->dist;
+    int64_t y = ((const queued_t *)b)->dist;
+    return (x > y) - (x < y);
+}
+
+TEST(test_slh_heap_decrease_key) {
+    slh_heap_t *heap = slh_heap_create(sizeof(queued_t), &cmp_dist);
+    slh_heap_handle_t handles[100];
+    for (int32_t node = 0; node < 100; node++) {
+        handles[node] = slh_heap_push(heap, &(queued_t){1000 + node, node});
+    }
+
+    // reverse the order of the odd nodes, ahead of all even ones
+    for (int32_t node = 1; node < 100; node += 2) {
+        slh_heap_decrease_key(heap, handles[node], &(queued_t){100 - node, node});
+    }
+
+    queued_t queued;
+    for (int32_t node = 99; node > 0; node -= 2) {
+        bool popped = slh_heap_pop(heap, &queued);
+        assert(popped);
+        assert(queued.node == node);
+        assert(!slh_heap_contains(heap, handles[node]));
+    }
+    for (int32_t node = 0; node < 100; node += 2) {
+        assert(slh_heap_contains(heap, handles[node]));
+        bool popped = slh_heap_pop(heap, &queued);
+        assert(popped);
+        assert(queued.node == node);
+    }
+    assert(!slh_heap_contains(heap, SLH_HEAP_INVALID_HANDLE));
+    slh_heap_free(heap);
+}
+
+MAIN(test_heap)
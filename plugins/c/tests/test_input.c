@@ -0,0 +1,173 @@
+#include "./testing.h"
+
+#include <stdlib.h>
+#include <string.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+#include "input.h"
+
+// Writes size bytes of the repeated pattern to a new temporary file,
+// whose name is written to filename.
+static void write_temp_file(char filename[static 32], const char *pattern,
+                            size_t size) {
+    strcpy(filename, "/tmp/test_input_XXXXXX");
+    int fd = mkstemp(filename);
+    assert(fd != -1);
+    for (size_t i = 0; i < size; ++i) {
+        ssize_t written = write(fd, &pattern[i % strlen(pattern)], 1);
+        assert(written == 1);
+    }
+    close(fd);
+}
+
+TEST(test_file_read_text) {
+    char filename[32];
+    write_temp_file(filename, "12\n34\n", 6);
+
+    slh_sized_ptr_t text = slh_file_read_text(filename);
+    unlink(filename);
+    assert(text.ptr != NULL);
+    assert(text.size == 6);
+    assert(strcmp(text.ptr, "12\n34\n") == 0);
+    slh_file_free_text(text);
+}
+
+TEST(test_file_read_text_page_sized) {
+    // no remainder of the last page is left to hold the zero byte
+    size_t size = sysconf(_SC_PAGESIZE);
+    char filename[32];
+    write_temp_file(filename, "abc", size);
+
+    slh_sized_ptr_t text = slh_file_read_text(filename);
+    unlink(filename);
+    assert(text.size == size);
+    assert(text.ptr[size - 1] == "abc"[(size - 1) % 3]);
+    assert(text.ptr[size] == '\0');
+    slh_file_free_text(text);
+}
+
+TEST(test_file_read_text_empty) {
+    char filename[32];
+    write_temp_file(filename, "", 0);
+
+    slh_sized_ptr_t text = slh_file_read_text(filename);
+    unlink(filename);
+    assert(text.ptr != NULL);
+    assert(text.size == 0);
+    assert(text.ptr[0] == '\0');
+    slh_file_free_text(text);
+}
+
+TEST(test_file_read_text_is_private) {
+    char filename[32];
+    write_temp_file(filename, "abc", 3);
+
+    slh_sized_ptr_t text = slh_file_read_text(filename);
+    text.ptr[0] = 'x';
+    slh_file_free_text(text);
+
+    text = slh_file_read_text(filename);
+    unlink(filename);
+    assert(strcmp(text.ptr, "abc") == 0);
+    slh_file_free_text(text);
+}
+
+TEST(test_file_read_text_pipe) {
+    // larger than the pipe buffer and the initial read buffer
+    const size_t size = 200 * 1024;
+    int fds[2];
+    assert(pipe(fds) == 0);
+
+    pid_t pid = fork();
+    assert(pid != -1);
+    if (pid == 0) {
+        close(fds[0]);
+        char chunk[1024];
+        memset(chunk, 'x', sizeof(chunk));
+        for (size_t i = 0; i < size / sizeof(chunk); ++i) {
+            ssize_t written = write(fds[1], chunk, sizeof(chunk));
+            assert(written == sizeof(chunk));
+        }
+        _exit(0);
+    }
+    close(fds[1]);
+
+    char filename[32];
+    snprintf(filename, sizeof(filename), "/dev/fd/%d", fds[0]);
+    slh_sized_ptr_t text = slh_file_read_text(filename);
+    close(fds[0]);
+    waitpid(pid, NULL, 0);
+
+    assert(text.ptr != NULL);
+    assert(text.size == size);
+    assert(text.ptr[0] == 'x' && text.ptr[size - 1] == 'x');
+    assert(text.ptr[size] == '\0');
+    slh_file_free_text(text);
+}
+
+TEST(test_file_read_text_missing) {
+    slh_sized_ptr_t text = slh_file_read_text("/nonexistent/input.txt");
+    assert(text.ptr == NULL);
+    assert(text.size == 0);
+}
+
+TEST(test_parse_args_filename) {
+    char *argv[] = {"part1", "input.txt"};
+    slh_args_t args = parse_args(2, argv);
+    assert(args.err == NULL);
+    assert(strcmp(args.filename, "input.txt") == 0);
+    assert(args.count == 0);
+    assert(!args.peak_rss);
+}
+
+TEST(test_parse_args_missing_filename) {
+    char *argv[] = {"part1"};
+    slh_args_t args = parse_args(1, argv);
+    assert(args.err != NULL);
+}
+
+TEST(test_parse_args_too_many) {
+    char *argv[] = {"part1", "input.txt", "other.txt"};
+    slh_args_t args = parse_args(3, argv);
+    assert(args.err != NULL);
+}
+
+TEST(test_parse_args_benchmark) {
+    char *argv[] = {"part1", "--benchmark", "20", "input.txt"};
+    slh_args_t args = parse_args(4, argv);
+    assert(args.err == NULL);
+    assert(strcmp(args.filename, "input.txt") == 0);
+    assert(args.count == 20);
+}
+
+TEST(test_parse_args_benchmark_invalid_count) {
+    char *zero[] = {"part1", "--benchmark", "0", "input.txt"};
+    assert(parse_args(4, zero).err != NULL);
+
+    char *garbage[] = {"part1", "--benchmark", "20x", "input.txt"};
+    assert(parse_args(4, garbage).err != NULL);
+
+    char *missing[] = {"part1", "--benchmark"};
+    assert(parse_args(2, missing).err != NULL);
+}
+
+TEST(test_parse_args_benchmark_missing_filename) {
+    char *argv[] = {"part1", "--benchmark", "20"};
+    slh_args_t args = parse_args(3, argv);
+    assert(args.err != NULL);
+}
+
+TEST(test_parse_args_peak_rss) {
+    char *argv[] = {"part1", "--peak-rss", "input.txt"};
+    slh_args_t args = parse_args(3, argv);
+    assert(args.err == NULL);
+    assert(strcmp(args.filename, "input.txt") == 0);
+    assert(args.count == 0);
+    assert(args.peak_rss);
+
+    char *missing[] = {"part1", "--peak-rss"};
+    assert(parse_args(2, missing).err != NULL);
+}
+
+MAIN(test_input)
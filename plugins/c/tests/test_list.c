@@ -99,6 +99,35 @@ TEST(test_slh_list_sort) {
     slh_list_free(node);
 }
 
+TEST(test_slh_list_sort_is_stable) {
+    slh_node_t *node = NULL;
+    for (int i = 0; i < 1000; ++i) {
+        slh_list_append(&node, (i * 7919) % 10);
+    }
+    slh_node_t *original[1000];
+    for (int i = 0; i < 1000; ++i) {
+        original[i] = slh_list_index(node, i);
+    }
+
+    slh_list_sort(&node);
+
+    assert(slh_list_size(node) == 1000);
+    for (slh_node_t *n = node; n->next != NULL; n = n->next) {
+        assert(n->value <= n->next->value);
+        // equal values keep their order
+        if (n->value == n->next->value) {
+            int before = -1, after = -1;
+            for (int i = 0; i < 1000; ++i) {
+                before = original[i] == n ? i : before;
+                after = original[i] == n->next ? i : after;
+            }
+            assert(before < after);
+        }
+    }
+
+    slh_list_free(node);
+}
+
 TEST(test_slh_list_size) {
     slh_node_t *node = NULL;
     assert(slh_list_size(node) == 0);
@@ -0,0 +1,194 @@
+#include "./testing.h"
+
+#include <stdint.h>
+#include <string.h>
+
+#include "slh/map.h"
+#include "slh/point.h"
+
+TEST(test_slh_map_create_empty) {
+    slh_map_t *map = slh_map_create(sizeof(int64_t), sizeof(int64_t), NULL, NULL);
+    assert(map != NULL);
+    assert(slh_map_size(map) == 0);
+    assert(slh_map_get(map, &(int64_t){1}) == NULL);
+    assert(!slh_map_contains(map, &(int64_t){1}));
+    bool removed = slh_map_remove(map, &(int64_t){1});
+    assert(!removed);
+    slh_map_free(map);
+}
+
+TEST(test_slh_map_put_get) {
+    slh_map_t *map = slh_map_create(sizeof(int64_t), sizeof(int64_t), NULL, NULL);
+    for (int64_t i = 0; i < 1000; i++) {
+        int64_t *value = slh_map_put(map, &i, &(int64_t){i * i});
+        assert(value != NULL && *value == i * i);
+    }
+    assert(slh_map_size(map) == 1000);
+
+    for (int64_t i = 0; i < 1000; i++) {
+        int64_t *value = slh_map_get(map, &i);
+        assert(value != NULL && *value == i * i);
+    }
+    assert(slh_map_get(map, &(int64_t){-1}) == NULL);
+    assert(slh_map_get(map, &(int64_t){1000}) == NULL);
+    slh_map_free(map);
+}
+
+TEST(test_slh_map_put_overwrites) {
+    slh_map_t *map = slh_map_create(sizeof(int64_t), sizeof(int64_t), NULL, NULL);
+    slh_map_put(map, &(int64_t){7}, &(int64_t){1});
+    slh_map_put(map, &(int64_t){7}, &(int64_t){2});
+    assert(slh_map_size(map) == 1);
+    assert(*(int64_t *)slh_map_get(map, &(int64_t){7}) == 2);
+    slh_map_free(map);
+}
+
+TEST(test_slh_map_entry_counts) {
+    slh_map_t *map = slh_map_create(sizeof(int32_t), sizeof(int32_t), NULL, NULL);
+    int32_t values[] = {3, 1, 3, 3, 2, 1};
+    for (size_t i = 0; i < sizeof(values) / sizeof(values[0]); i++) {
+        int32_t *count = slh_map_entry(map, &values[i]);
+        (*count)++;
+    }
+
+    assert(slh_map_size(map) == 3);
+    assert(*(int32_t *)slh_map_get(map, &(int32_t){1}) == 2);
+    assert(*(int32_t *)slh_map_get(map, &(int32_t){2}) == 1);
+    assert(*(int32_t *)slh_map_get(map, &(int32_t){3}) == 3);
+    slh_map_free(map);
+}
+
+TEST(test_slh_map_remove) {
+    slh_map_t *map = slh_map_create(sizeof(int64_t), sizeof(int64_t), NULL, NULL);
+    for (int64_t i = 0; i < 1000; i++) {
+        slh_map_put(map, &i, &i);
+    }
+
+    for (int64_t i = 0; i < 1000; i += 2) {
+        bool removed = slh_map_remove(map, &i);
+        assert(removed);
+        removed = slh_map_remove(map, &i);
+        assert(!removed);
+    }
+
+    assert(slh_map_size(map) == 500);
+    for (int64_t i = 0; i < 1000; i++) {
+        int64_t *value = slh_map_get(map, &i);
+        if (i % 2 == 0) {
+            assert(value == NULL);
+        } else {
+            assert(value != NULL && *value == i);
+        }
+    }
+    slh_map_free(map);
+}
+
+TEST(test_slh_map_reinsert_after_remove) {
+    slh_map_t *map = slh_map_create(sizeof(int64_t), sizeof(int64_t), NULL, NULL);
+    // churn through many more keys than the map ever holds at once
+    for (int64_t i = 0; i < 10000; i++) {
+        slh_map_put(map, &i, &i);
+        if (i >= 10) {
+            bool removed = slh_map_remove(map, &(int64_t){i - 10});
+            assert(removed);
+        }
+    }
+
+    assert(slh_map_size(map) == 10);
+    for (int64_t i = 9990; i < 10000; i++) {
+        assert(*(int64_t *)slh_map_get(map, &i) == i);
+    }
+    slh_map_free(map);
+}
+
+TEST(test_slh_map_clear) {
+    slh_map_t *map = slh_map_create(sizeof(int64_t), 0, NULL, NULL);
+    for (int64_t i = 0; i < 100; i++) {
+        slh_map_put(map, &i, NULL);
+    }
+
+    slh_map_clear(map);
+    assert(slh_map_size(map) == 0);
+    assert(!slh_map_contains(map, &(int64_t){5}));
+
+    slh_map_put(map, &(int64_t){5}, NULL);
+    assert(slh_map_contains(map, &(int64_t){5}));
+    slh_map_free(map);
+}
+
+TEST(test_slh_map_point_set) {
+    slh_map_t *map = slh_map_create(sizeof(slh_point_t), 0,
+                                    &slh_map_hash_point, &slh_map_eq_point);
+    for (int32_t x = -10; x < 10; x++) {
+        for (int32_t y = -10; y < 10; y++) {
+            slh_map_put(map, &(slh_point_t){x, y}, NULL);
+        }
+    }
+
+    assert(slh_map_size(map) == 400);
+    assert(slh_map_contains(map, &(slh_point_t){-10, 9}));
+    assert(!slh_map_contains(map, &(slh_point_t){10, 0}));
+    slh_map_free(map);
+}
+
+static uint64_t hash_string(const void *key) {
+    const char *s = *(const char *const *)key;
+    return slh_hash_bytes(s, strlen(s));
+}
+
+static bool eq_string(const void *a, const void *b) {
+    return strcmp(*(const char *const *)a, *(const char *const *)b) == 0;
+}
+
+TEST(test_slh_map_custom_hash) {
+    slh_map_t *map =
+        slh_map_create(sizeof(char *), sizeof(int), &hash_string, &eq_string);
+    slh_map_put(map, &(char *){"one"}, &(int){1});
+    slh_map_put(map, &(char *){"two"}, &(int){2});
+
+    char key[] = "two";
+    assert(*(int *)slh_map_get(map, &(char *){key}) == 2);
+    assert(slh_map_get(map, &(char *){"three"}) == NULL);
+    slh_map_free(map);
+}
+
+static uint64_t constant_hash(const void *key) { return 0; }
+
+TEST(test_slh_map_colliding_hash) {
+    slh_map_t *map = slh_map_create(sizeof(int64_t), sizeof(int64_t),
+                                    &constant_hash, &slh_map_eq_int);
+    for (int64_t i = 0; i < 100; i++) {
+        slh_map_put(map, &i, &i);
+    }
+    for (int64_t i = 0; i < 100; i += 3) {
+        bool removed = slh_map_remove(map, &i);
+        assert(removed);
+    }
+    for (int64_t i = 0; i < 100; i++) {
+        assert(slh_map_contains(map, &i) == (i % 3 != 0));
+    }
+    slh_map_free(map);
+}
+
+TEST(test_slh_map_next) {
+    slh_map_t *map = slh_map_create(sizeof(int64_t), sizeof(int64_t), NULL, NULL);
+    for (int64_t i = 0; i < 100; i++) {
+        slh_map_put(map, &i, &(int64_t){2 * i});
+    }
+
+    size_t iter = 0;
+    const void *key;
+    void *value;
+    size_t count = 0;
+    int64_t sum = 0;
+    while (slh_map_next(map, &iter, &key, &value)) {
+        assert(*(int64_t *)value == 2 * *(const int64_t *)key);
+        sum += *(const int64_t *)key;
+        count++;
+    }
+    assert(count == 100);
+    assert(sum == 99 * 100 / 2);
+    slh_map_free(map);
+}
+
+MAIN(test_map)
@@ -0,0 +1,235 @@
+import json
+import subprocess
+
+import pytest
+from slh import _daypart
+from slh import DayPart
+from slh_c import _plugin
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """
+    A project with two days, built by a stubbed cmake which records the
+    commands it was run with.
+    """
+    rootdir = tmp_path / "aoc1994"
+    for day in ("day01", "day02"):
+        (rootdir / day).mkdir(parents=True)
+        (rootdir / day / "CMakeLists.txt").write_text("add_executable(...)\n")
+        (rootdir / day / "part1.c").write_text("int main() {}\n")
+        (rootdir / day / "part2.c").write_text("int main() {}\n")
+    (rootdir / "CMakeLists.txt").write_text("add_subdirectory(...)\n")
+
+    slh_dir = tmp_path / "slh"
+    (slh_dir / "include" / "slh").mkdir(parents=True)
+    (slh_dir / "lib").mkdir()
+    (slh_dir / "include" / "slh" / "vec.h").write_text("// vec\n")
+    (slh_dir / "lib" / "libslh.a").write_bytes(b"lib")
+
+    monkeypatch.setattr(_daypart, "get_rootdir", lambda: rootdir)
+    monkeypatch.setattr(_plugin, "get_rootdir", lambda: rootdir)
+    for env in (*_plugin._BUILD_ENV, _plugin._IN_PROCESS_ENV):
+        monkeypatch.delenv(env, raising=False)
+    monkeypatch.setattr(_plugin, "get_slh_dir", lambda: slh_dir)
+    monkeypatch.setattr(_plugin.shutil, "which", lambda cmd: None)
+
+    commands = []
+
+    def run(args, check):
+        args = [str(arg) for arg in args[3:]]
+        commands.append(args)
+        if args[0] == "-S":
+            build_dir = rootdir / "build" / "release"
+            (build_dir / "CMakeCache.txt").touch()
+        else:
+            for target in args[args.index("--target") + 1 :]:
+                day, part = target.removesuffix("_shared").split("_")
+                (rootdir / day / part).touch()
+        return subprocess.CompletedProcess(args, 0)
+
+    monkeypatch.setattr(_plugin.subprocess, "run", run)
+    return rootdir, commands
+
+
+def _build(*dayparts):
+    return _plugin._build([_plugin._get_build_target(dp) for dp in dayparts])
+
+
+def _configured(commands):
+    return [args for args in commands if args[0] == "-S"]
+
+
+def _built(commands):
+    return [args[args.index("--target") + 1 :] for args in commands if "--build" in args]
+
+
+def test_build_configures_and_builds(project):
+    rootdir, commands = project
+
+    assert _build(DayPart(1, 1), DayPart(1, 2)) == 2
+
+    assert _configured(commands) == [
+        ["-S", str(rootdir), "-B", str(rootdir / "build" / "release")]
+    ]
+    assert _built(commands) == [["day01_part1", "day01_part2"]]
+
+
+def test_build_skips_up_to_date_targets(project):
+    rootdir, commands = project
+    dayparts = [DayPart(1, 1), DayPart(1, 2), DayPart(2, 1)]
+    _build(*dayparts)
+    commands.clear()
+
+    assert _build(*dayparts) == 0
+    assert commands == []
+
+    # parts may include any file of their day
+    (rootdir / "day01" / "part2.c").write_text("int main() { return 1; }\n")
+    assert _build(*dayparts) == 2
+    assert _configured(commands) == []
+    assert _built(commands) == [["day01_part1", "day01_part2"]]
+
+
+def test_build_only_builds_requested_targets(project):
+    _, commands = project
+    _build(DayPart(1, 1))
+    commands.clear()
+
+    assert _build(DayPart(1, 1), DayPart(2, 1)) == 1
+    assert _configured(commands) == []
+    assert _built(commands) == [["day02_part1"]]
+
+
+def test_build_rebuilds_missing_output(project):
+    rootdir, commands = project
+    _build(DayPart(1, 1))
+    commands.clear()
+
+    (rootdir / "day01" / "part1").unlink()
+    _build(DayPart(1, 1))
+
+    assert _configured(commands) == []
+    assert _built(commands) == [["day01_part1"]]
+
+
+def test_build_rebuilds_when_slh_library_changes(project):
+    _, commands = project
+    _build(DayPart(1, 1))
+    commands.clear()
+
+    (_plugin.get_slh_dir() / "lib" / "libslh.a").write_bytes(b"rebuilt")
+    _build(DayPart(1, 1))
+
+    assert _configured(commands) == []
+    assert _built(commands) == [["day01_part1"]]
+
+
+def test_build_reconfigures_when_cmake_inputs_change(project):
+    rootdir, commands = project
+    _build(DayPart(1, 1))
+    commands.clear()
+
+    (rootdir / "day01" / "CMakeLists.txt").write_text("add_library(...)\n")
+    _build(DayPart(1, 1))
+
+    assert len(_configured(commands)) == 1
+    assert _built(commands) == [["day01_part1"]]
+
+
+def test_build_reconfigures_when_flags_change(project, monkeypatch):
+    _, commands = project
+    _build(DayPart(1, 1))
+    commands.clear()
+
+    monkeypatch.setenv("CFLAGS", "-O3")
+    _build(DayPart(1, 1))
+
+    assert len(_configured(commands)) == 1
+    assert _built(commands) == [["day01_part1"]]
+
+
+def test_build_generator_switch_clears_cache(project, monkeypatch):
+    rootdir, commands = project
+    _build(DayPart(1, 1))
+    commands.clear()
+    cache_file = rootdir / "build" / "release" / "CMakeCache.txt"
+    cache_file.write_text("CMAKE_GENERATOR:INTERNAL=Unix Makefiles\n")
+
+    monkeypatch.setattr(_plugin.shutil, "which", lambda cmd: f"/usr/bin/{cmd}")
+    _build(DayPart(1, 1))
+
+    [configure] = _configured(commands)
+    assert configure[-2:] == ["-G", "Ninja"]
+    # recreated by the stubbed configure, the old cache is gone
+    assert cache_file.read_text() == ""
+    assert _built(commands) == [["day01_part1"]]
+
+
+@pytest.mark.parametrize("stamp", ["", "{not json", "[]", '"targets"'], ids=repr)
+def test_build_with_corrupt_stamp(project, stamp):
+    rootdir, commands = project
+    _build(DayPart(1, 1))
+    commands.clear()
+    stamp_file = rootdir / "build" / "release" / _plugin._BUILD_STAMP
+    stamp_file.write_text(stamp)
+
+    _build(DayPart(1, 1))
+
+    assert len(_configured(commands)) == 1
+    assert _built(commands) == [["day01_part1"]]
+    assert json.loads(stamp_file.read_text())["targets"].keys() == {"day01_part1"}
+
+
+def test_build_holds_lock(project, monkeypatch):
+    rootdir, commands = project
+    events = []
+
+    def flock(f, operation):
+        events.append(("flock", f.name, operation))
+
+    monkeypatch.setattr(_plugin.fcntl, "flock", flock)
+    monkeypatch.setattr(
+        _plugin, "_build_locked", lambda *args: events.append(("build", *args[1:]))
+    )
+    targets = [_plugin._get_build_target(DayPart(1, 1))]
+    _plugin._build(targets)
+
+    lock_file = rootdir / "build" / "release" / _plugin._BUILD_LOCK
+    assert events == [
+        ("flock", str(lock_file), _plugin.fcntl.LOCK_EX),
+        ("build", "release", targets),
+    ]
+
+
+def test_hash_inputs(tmp_path):
+    a = tmp_path / "a.c"
+    a.write_text("a")
+    key = _plugin._hash_inputs([a], ["release"])
+
+    assert _plugin._hash_inputs([a], ["release"]) == key
+    assert _plugin._hash_inputs([a], ["debug"]) != key
+    assert _plugin._hash_inputs([a], ["release", None]) != key
+
+    a.write_text("b")
+    assert _plugin._hash_inputs([a], ["release"]) != key
+
+    a.unlink()
+    missing = _plugin._hash_inputs([a], ["release"])
+    assert missing != key
+    a.write_text("")
+    assert _plugin._hash_inputs([a], ["release"]) != missing
+
+
+def test_read_stamp(tmp_path):
+    stamp_file = tmp_path / "stamp.json"
+    assert _plugin._read_stamp(stamp_file) == {}
+
+    stamp_file.write_text('{"configure": "abc"}')
+    assert _plugin._read_stamp(stamp_file) == {"configure": "abc"}
+
+    stamp_file.write_text("{not json")
+    assert _plugin._read_stamp(stamp_file) == {}
+
+    stamp_file.write_text("[1, 2]")
+    assert _plugin._read_stamp(stamp_file) == {}
@@ -0,0 +1,122 @@
+#include "./testing.h"
+
+#include <stdint.h>
+#include <string.h>
+
+#include "slh/scan.h"
+#include "slh/vec.h"
+
+static slh_sized_ptr_t text_of(const char *str) {
+    return (slh_sized_ptr_t){.ptr = (char *)str, .size = strlen(str)};
+}
+
+static bool equals(slh_sized_ptr_t view, const char *str) {
+    return view.size == strlen(str) && memcmp(view.ptr, str, view.size) == 0;
+}
+
+TEST(test_slh_scan_line) {
+    slh_sized_ptr_t text = text_of("ab\n\ncde\n");
+    slh_scanner_t scanner = slh_scanner(&text);
+    slh_sized_ptr_t line;
+    bool found = slh_scan_line(&scanner, &line);
+    assert(found && equals(line, "ab"));
+    found = slh_scan_line(&scanner, &line);
+    assert(found && equals(line, ""));
+    found = slh_scan_line(&scanner, &line);
+    assert(found && equals(line, "cde"));
+    found = slh_scan_line(&scanner, &line);
+    assert(!found);
+}
+
+TEST(test_slh_scan_line_no_trailing_newline) {
+    slh_sized_ptr_t text = text_of("ab\r\ncde");
+    slh_scanner_t scanner = slh_scanner(&text);
+    slh_sized_ptr_t line;
+    bool found = slh_scan_line(&scanner, &line);
+    assert(found && equals(line, "ab"));
+    found = slh_scan_line(&scanner, &line);
+    assert(found && equals(line, "cde"));
+    found = slh_scan_line(&scanner, &line);
+    assert(!found);
+}
+
+TEST(test_slh_scan_line_empty) {
+    slh_sized_ptr_t text = text_of("");
+    slh_scanner_t scanner = slh_scanner(&text);
+    slh_sized_ptr_t line;
+    bool found = slh_scan_line(&scanner, &line);
+    assert(!found);
+}
+
+TEST(test_slh_scan_block) {
+    slh_sized_ptr_t text = text_of("a\nb\n\nc\n\n\nd\ne\n");
+    slh_scanner_t scanner = slh_scanner(&text);
+    slh_sized_ptr_t block;
+    bool found = slh_scan_block(&scanner, &block);
+    assert(found && equals(block, "a\nb"));
+    found = slh_scan_block(&scanner, &block);
+    assert(found && equals(block, "c"));
+    found = slh_scan_block(&scanner, &block);
+    assert(found && equals(block, "d\ne"));
+    found = slh_scan_block(&scanner, &block);
+    assert(!found);
+
+    // lines of a block are scanned with a scanner of their own
+    slh_scanner_t lines = slh_scanner(&block);
+    slh_sized_ptr_t line;
+    found = slh_scan_line(&lines, &line);
+    assert(found && equals(line, "d"));
+    found = slh_scan_line(&lines, &line);
+    assert(found && equals(line, "e"));
+    found = slh_scan_line(&lines, &line);
+    assert(!found);
+}
+
+TEST(test_slh_scan_int) {
+    slh_sized_ptr_t text = text_of("p=-3,14 v=+2-7 x9");
+    slh_scanner_t scanner = slh_scanner(&text);
+    int64_t value;
+    bool found = slh_scan_int(&scanner, &value);
+    assert(found && value == -3);
+    found = slh_scan_int(&scanner, &value);
+    assert(found && value == 14);
+    found = slh_scan_int(&scanner, &value);
+    assert(found && value == 2);
+    found = slh_scan_int(&scanner, &value);
+    assert(found && value == -7);
+    found = slh_scan_int(&scanner, &value);
+    assert(found && value == 9);
+    found = slh_scan_int(&scanner, &value);
+    assert(!found);
+}
+
+TEST(test_slh_scan_ints) {
+    slh_sized_ptr_t text = text_of("Game 12: 3 blue, 4 red\n-1 -\n9223372036854775807");
+    int64_t *ints = slh_scan_ints(&text, slh_vec_create(0, sizeof(int64_t)));
+    assert(slh_vec_size(ints) == 5);
+    assert(ints[0] == 12);
+    assert(ints[1] == 3);
+    assert(ints[2] == 4);
+    assert(ints[3] == -1);
+    assert(ints[4] == INT64_MAX);
+    slh_vec_free(ints);
+}
+
+TEST(test_slh_scan_grid_dims) {
+    size_t width, height;
+    slh_sized_ptr_t grid = text_of("#..\n.#.\n..#\n.#.\n");
+    bool valid = slh_scan_grid_dims(&grid, &width, &height);
+    assert(valid);
+    assert(width == 3 && height == 4);
+
+    slh_sized_ptr_t untrailed = text_of("#..\n.#.");
+    valid = slh_scan_grid_dims(&untrailed, &width, &height);
+    assert(valid);
+    assert(width == 3 && height == 2);
+
+    slh_sized_ptr_t ragged = text_of("#..\n.#\n");
+    valid = slh_scan_grid_dims(&ragged, &width, &height);
+    assert(!valid);
+}
+
+MAIN(test_scan)
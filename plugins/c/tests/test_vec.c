@@ -1,5 +1,8 @@
 #include "./testing.h"
 
+#include <stdint.h>
+#include <stdlib.h>
+
 #include "slh/vec.h"
 
 TEST(test_slh_vec_create_empty) {
@@ -65,6 +68,42 @@ TEST(test_slh_vec_append) {
     slh_vec_free(vec);
 }
 
+TEST(test_slh_vec_resize_failure) {
+    int *vec = slh_vec_create(0, sizeof(int));
+    for (int i = 0; i < 3; i++) {
+        vec = slh_vec_append(vec, &i);
+    }
+
+    // far more than can be allocated, the vector is left as it was
+    void *resized = slh_vec_resize(vec, SIZE_MAX / 4 / sizeof(int));
+    assert(resized == nullptr);
+    assert(slh_vec_size(vec) == 3);
+    assert(slh_vec_cap(vec) == 4);
+    for (int i = 0; i < 3; i++) {
+        assert(vec[i] == i);
+    }
+    slh_vec_free(vec);
+}
+
+TEST(test_slh_vec_pop) {
+    int *vec = slh_vec_create(0, sizeof(int));
+    for (int i = 0; i < 3; i++) {
+        vec = slh_vec_append(vec, &i);
+    }
+
+    int value;
+    bool popped = slh_vec_pop(vec, &value);
+    assert(popped && value == 2);
+    popped = slh_vec_pop(vec, NULL);
+    assert(popped);
+    popped = slh_vec_pop(vec, &value);
+    assert(popped && value == 0);
+    popped = slh_vec_pop(vec, &value);
+    assert(!popped);
+    assert(slh_vec_size(vec) == 0);
+    slh_vec_free(vec);
+}
+
 TEST(test_slh_vec_find) {
     int *vec = slh_vec_create(10, sizeof(int));
     for (int i = 0; i < 10; i++) {
@@ -82,4 +121,108 @@ TEST(test_slh_vec_find) {
     slh_vec_free(vec);
 }
 
+static int cmp_int(const void *a, const void *b) {
+    int x = *(const int *)a;
+    int y = *(const int *)b;
+    return (x > y) - (x < y);
+}
+
+static bool is_sorted(const int *vec) {
+    for (size_t i = 1; i < slh_vec_size(vec); i++) {
+        if (vec[i - 1] > vec[i]) {
+            return false;
+        }
+    }
+    return true;
+}
+
+static int *random_ints(size_t n, int modulo) {
+    int *vec = slh_vec_create(n, sizeof(int));
+    for (size_t i = 0; i < n; i++) {
+        int value = rand() % modulo - modulo / 2;
+        vec = slh_vec_append(vec, &value);
+    }
+    return vec;
+}
+
+TEST(test_slh_vec_sort) {
+    // few and many duplicates, small and large enough for quicksort
+    const size_t sizes[] = {0, 1, 2, 15, 100, 10000};
+    const int modulos[] = {3, 1000000};
+    for (size_t i = 0; i < sizeof(sizes) / sizeof(sizes[0]); i++) {
+        for (size_t j = 0; j < sizeof(modulos) / sizeof(modulos[0]); j++) {
+            int *vec = random_ints(sizes[i], modulos[j]);
+            slh_vec_sort(vec, &cmp_int);
+            assert(slh_vec_size(vec) == sizes[i]);
+            assert(is_sorted(vec));
+            slh_vec_free(vec);
+        }
+    }
+}
+
+TEST(test_slh_vec_sort_sorted_and_reversed) {
+    int *ascending = slh_vec_create(10000, sizeof(int));
+    int *descending = slh_vec_create(10000, sizeof(int));
+    for (int i = 0; i < 10000; i++) {
+        ascending = slh_vec_append(ascending, &i);
+        descending = slh_vec_append(descending, &(int){10000 - i});
+    }
+
+    slh_vec_sort(ascending, &cmp_int);
+    slh_vec_sort(descending, &cmp_int);
+    assert(is_sorted(ascending));
+    assert(is_sorted(descending));
+    slh_vec_free(ascending);
+    slh_vec_free(descending);
+}
+
+typedef struct {
+    int32_t key;
+    int32_t order;
+} keyed_t;
+
+static uint64_t key_of(const void *elem) {
+    return (uint64_t)(int64_t)((const keyed_t *)elem)->key ^ (1ull << 63);
+}
+
+TEST(test_slh_vec_sort_by_key) {
+    keyed_t *vec = slh_vec_create(0, sizeof(keyed_t));
+    for (int32_t i = 0; i < 10000; i++) {
+        keyed_t value = {.key = rand() % 200 - 100, .order = i};
+        vec = slh_vec_append(vec, &value);
+    }
+
+    bool sorted = slh_vec_sort_by_key(vec, &key_of);
+    assert(sorted);
+
+    for (size_t i = 1; i < slh_vec_size(vec); i++) {
+        assert(vec[i - 1].key <= vec[i].key);
+        // stable, equal keys keep their order
+        if (vec[i - 1].key == vec[i].key) {
+            assert(vec[i - 1].order < vec[i].order);
+        }
+    }
+    slh_vec_free(vec);
+}
+
+TEST(test_slh_vec_bounds) {
+    int *vec = slh_vec_create(0, sizeof(int));
+    int values[] = {1, 3, 3, 3, 7};
+    for (size_t i = 0; i < 5; i++) {
+        vec = slh_vec_append(vec, &values[i]);
+    }
+
+    assert(slh_vec_lower_bound(vec, &(int){0}, &cmp_int) == 0);
+    assert(slh_vec_upper_bound(vec, &(int){0}, &cmp_int) == 0);
+    assert(slh_vec_lower_bound(vec, &(int){1}, &cmp_int) == 0);
+    assert(slh_vec_upper_bound(vec, &(int){1}, &cmp_int) == 1);
+    assert(slh_vec_lower_bound(vec, &(int){3}, &cmp_int) == 1);
+    assert(slh_vec_upper_bound(vec, &(int){3}, &cmp_int) == 4);
+    assert(slh_vec_lower_bound(vec, &(int){5}, &cmp_int) == 4);
+    assert(slh_vec_upper_bound(vec, &(int){5}, &cmp_int) == 4);
+    assert(slh_vec_lower_bound(vec, &(int){8}, &cmp_int) == 5);
+    assert(slh_vec_upper_bound(vec, &(int){8}, &cmp_int) == 5);
+    slh_vec_free(vec);
+}
+
 MAIN(test_vec)
@@ -0,0 +1,71 @@
+"""
+Times common operations on a 1000x1000 character grid with Grid against
+FrozenGrid.
+
+Run with `python benchmarks/bench_grid.py` from plugins/python.
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+from collections.abc import Callable
+
+from slh_python.grid import Grid
+from slh_python.parser import FrozenGrid
+
+SIZE = 1000
+
+
+def _text() -> str:
+    rng = random.Random(0)
+    return "".join(
+        "".join(rng.choice(".#") for _ in range(SIZE)) + "\n" for _ in range(SIZE)
+    )
+
+
+def _lookup_all(g: FrozenGrid[str] | Grid[str]) -> int:
+    count = 0
+    for y in range(SIZE):
+        for x in range(SIZE):
+            count += g[x, y] == "#"
+    return count
+
+
+def _fill(g: Grid[str]) -> None:
+    for y in range(SIZE):
+        for x in range(SIZE):
+            g[x, y] = "."
+
+
+def _time(fn: Callable[[], object]) -> str:
+    best = min(timeit.repeat(fn, number=1, repeat=3))
+    return f"{best * 1000:10.1f} ms"
+
+
+def main() -> None:
+    text = _text()
+    frozen = FrozenGrid.from_str(text)
+    grid = Grid.from_str(text)
+    assert _lookup_all(frozen) == _lookup_all(grid)
+    assert grid.rotate(1).freeze() == frozen.rotate(1)
+
+    rows = [
+        ("from_str", lambda: FrozenGrid.from_str(text), lambda: Grid.from_str(text)),
+        ("g[x, y] (10^6 lookups)", lambda: _lookup_all(frozen), lambda: _lookup_all(grid)),
+        ("transpose", frozen.transpose, grid.transpose),
+        ("rotate(1)", lambda: frozen.rotate(1), lambda: grid.rotate(1)),
+        ("hreflect", frozen.hreflect, grid.hreflect),
+        ("iter_values", lambda: sum(1 for _ in frozen.iter_values()),
+         lambda: sum(1 for _ in grid.iter_values())),
+        ("g[x, y] = v (10^6 writes)", None, lambda: _fill(grid.copy())),
+    ]
+
+    print(f"{'operation':<26} {'FrozenGrid':>13} {'Grid':>13}")
+    for name, frozen_fn, grid_fn in rows:
+        frozen_time = "-" if frozen_fn is None else _time(frozen_fn)
+        print(f"{name:<26} {frozen_time:>13} {_time(grid_fn):>13}")
+
+
+if __name__ == "__main__":
+    main()
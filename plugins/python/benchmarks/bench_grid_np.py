@@ -0,0 +1,91 @@
+"""
+Times game of life generations and flood distances on a character grid
+cell by cell with Grid against the vectorized grid_np kernels.
+
+Run with `python benchmarks/bench_grid_np.py` from plugins/python, numpy
+needs to be installed.
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+from collections import deque
+from collections.abc import Callable
+
+from slh_python import grid_np
+from slh_python.grid import Grid
+from slh_python.parser import Point
+
+SIZE = 200
+STEPS = 10
+
+
+def _text() -> str:
+    rng = random.Random(0)
+    # an open first row, so the flood from (0, 0) reaches most of the grid
+    rows = ["." * SIZE]
+    rows += ("".join(rng.choice("...#") for _ in range(SIZE)) for _ in range(SIZE - 1))
+    return "".join(f"{row}\n" for row in rows)
+
+
+def _life_python(grid: Grid[str]) -> Grid[str]:
+    for _ in range(STEPS):
+        new = grid.copy()
+        for p, c in grid.enum_values():
+            n = sum(grid.get(q) == "#" for q in p.iter_neighbors())
+            new[p] = "#" if n == 3 or (n == 2 and c == "#") else "."
+        grid = new
+    return grid
+
+
+def _spread_python(grid: Grid[str]) -> dict[Point, int]:
+    distances = {Point(0, 0): 0}
+    queue = deque([Point(0, 0)])
+    while queue:
+        p = queue.popleft()
+        for q in p.iter_neighbors(diagonals=False):
+            if q not in distances and grid.get(q, "#") != "#":
+                distances[q] = distances[p] + 1
+                queue.append(q)
+    return distances
+
+
+def _time(fn: Callable[[], object]) -> str:
+    best = min(timeit.repeat(fn, number=1, repeat=3))
+    return f"{best * 1000:10.1f} ms"
+
+
+def main() -> None:
+    text = _text()
+    grid = Grid.from_str(text)
+    a = grid_np.from_str(text)
+
+    alive = grid_np.simulate(a == "#", grid_np.step_life, STEPS)
+    assert grid_np.find_all(alive, True) == [
+        p for p, c in _life_python(grid).enum_values() if c == "#"
+    ]
+    distances = grid_np.spread(a != "#", [(0, 0)])
+    assert int((distances >= 0).sum()) == len(_spread_python(grid))
+
+    rows = [
+        (
+            f"life, {STEPS} generations",
+            lambda: _life_python(grid),
+            lambda: grid_np.simulate(a == "#", grid_np.step_life, STEPS),
+        ),
+        (
+            "flood distances",
+            lambda: _spread_python(grid),
+            lambda: grid_np.spread(a != "#", [(0, 0)]),
+        ),
+    ]
+
+    print(f"{SIZE}x{SIZE} grid")
+    print(f"{'operation':<22} {'Grid':>13} {'grid_np':>13}")
+    for name, python_fn, numpy_fn in rows:
+        print(f"{name:<22} {_time(python_fn):>13} {_time(numpy_fn):>13}")
+
+
+if __name__ == "__main__":
+    main()
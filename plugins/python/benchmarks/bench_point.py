@@ -0,0 +1,86 @@
+"""
+Microbenchmarks of Point against packed ints from PointCodec, for the
+steps grid puzzles repeat in their hot loops, on a 500x500 grid.
+
+Run with `python benchmarks/bench_point.py` from plugins/python.
+"""
+
+from __future__ import annotations
+
+import timeit
+from collections.abc import Callable
+
+from slh_python.parser import FrozenGrid
+from slh_python.parser import Point
+
+SIZE = 500
+
+
+def _time(fn: Callable[[], object]) -> str:
+    best = min(timeit.repeat(fn, number=1, repeat=3))
+    return f"{best * 1000:10.1f} ms"
+
+
+def main() -> None:
+    grid = FrozenGrid.from_str(("." * SIZE + "\n") * SIZE)
+    codec = grid.codec()
+    cells = grid.cells()
+    points = [Point(x, y) for y in range(SIZE) for x in range(SIZE)]
+    packed = [codec.encode(p) for p in points]
+
+    def step_points() -> None:
+        for p in points:
+            p + (1, 0)
+
+    def step_packed() -> None:
+        for i in packed:
+            i + 1
+
+    def neighbors_points() -> int:
+        return sum(
+            grid.in_bounds(q) for p in points for q in p.iter_neighbors(diagonals=False)
+        )
+
+    def neighbors_packed() -> int:
+        return sum(len(codec.neighbors4(i)) for i in packed)
+
+    def steps_packed() -> int:
+        return sum(len(codec.steps4(i)) for i in packed)
+
+    def lookup_points() -> int:
+        return sum(grid[p] == "." for p in points)
+
+    def lookup_packed() -> int:
+        return sum(cells[i] == "." for i in packed)
+
+    def visit_points() -> int:
+        seen = set()
+        for p in points:
+            seen.add(p)
+        return len(seen)
+
+    def visit_packed() -> int:
+        seen = bytearray(len(cells))
+        for i in packed:
+            seen[i] = 1
+        return sum(seen)
+
+    assert neighbors_points() == neighbors_packed() == steps_packed()
+
+    rows = [
+        ("step p + (1, 0)", step_points, step_packed),
+        ("in bounds neighbors", neighbors_points, neighbors_packed),
+        ("in bounds steps", None, steps_packed),
+        ("grid[p]", lookup_points, lookup_packed),
+        ("mark visited", visit_points, visit_packed),
+    ]
+
+    print(f"{SIZE * SIZE} points")
+    print(f"{'operation':<22} {'Point':>13} {'packed':>13}")
+    for name, points_fn, packed_fn in rows:
+        points_time = "-" if points_fn is None else _time(points_fn)
+        print(f"{name:<22} {points_time:>13} {_time(packed_fn):>13}")
+
+
+if __name__ == "__main__":
+    main()
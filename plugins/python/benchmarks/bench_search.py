@@ -0,0 +1,110 @@
+"""
+Times shortest path searches across a random 500x500 maze with the search
+module against the hand-rolled Point and FrozenGrid searches puzzles used
+to have.
+
+Run with `python benchmarks/bench_search.py` from plugins/python.
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+import timeit
+from collections import deque
+from collections.abc import Callable
+
+from slh_python.parser import FrozenGrid
+from slh_python.parser import Point
+from slh_python.search import GridGraph
+from slh_python.search import astar
+from slh_python.search import bfs
+from slh_python.search import dijkstra
+
+SIZE = 500
+
+
+def _maze() -> str:
+    rng = random.Random(0)
+    # walls on a quarter of the cells, with an open border so the
+    # corners are connected
+    rows = []
+    for y in range(SIZE):
+        if y in (0, SIZE - 1):
+            rows.append("1" * SIZE)
+        else:
+            inner = "".join(rng.choice("123#") for _ in range(SIZE - 2))
+            rows.append(f"1{inner}1")
+    return "".join(f"{row}\n" for row in rows)
+
+
+def _bfs_points(grid: FrozenGrid[str], start: Point, end: Point) -> int:
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        p = queue.popleft()
+        if p == end:
+            return distances[p]
+        for q in p.iter_neighbors(diagonals=False):
+            if grid.in_bounds(q) and q not in distances and grid[q] != "#":
+                distances[q] = distances[p] + 1
+                queue.append(q)
+    raise ValueError("end not reachable")
+
+
+def _dijkstra_points(grid: FrozenGrid[str], start: Point, end: Point) -> int:
+    distances = {start: 0}
+    queue = [(0, start)]
+    while queue:
+        d, p = heapq.heappop(queue)
+        if p == end:
+            return d
+        if d > distances[p]:
+            continue
+        for q in p.iter_neighbors(diagonals=False):
+            if not grid.in_bounds(q) or grid[q] == "#":
+                continue
+            nd = d + int(grid[q])
+            if nd < distances.get(q, nd + 1):
+                distances[q] = nd
+                heapq.heappush(queue, (nd, q))
+    raise ValueError("end not reachable")
+
+
+def _time(fn: Callable[[], object]) -> str:
+    best = min(timeit.repeat(fn, number=1, repeat=3))
+    return f"{best * 1000:10.1f} ms"
+
+
+def main() -> None:
+    grid = FrozenGrid.from_str(_maze())
+    start, end = Point(0, 0), Point(SIZE - 1, SIZE - 1)
+    graph = GridGraph(grid, cost=lambda c: int(c) if c != "#" else 0)
+    s, e = graph.index(start), graph.index(end)
+
+    assert _bfs_points(grid, start, end) == bfs(s, graph.neighbors, e).distance()
+    expected = _dijkstra_points(grid, start, end)
+    assert expected == dijkstra(s, graph.weighted, e).distance()
+    assert expected == astar(s, graph.weighted, e, graph.manhattan(e)).distance()
+
+    rows = [
+        ("bfs", lambda: _bfs_points(grid, start, end),
+         lambda: bfs(s, graph.neighbors, e)),
+        ("dijkstra", lambda: _dijkstra_points(grid, start, end),
+         lambda: dijkstra(s, graph.weighted, e)),
+        ("astar (manhattan)", None,
+         lambda: astar(s, graph.weighted, e, graph.manhattan(e))),
+        ("bfs, all paths", None,
+         lambda: bfs(s, graph.neighbors, e, all_paths=True)),
+        ("GridGraph(grid)", None, lambda: GridGraph(grid)),
+    ]
+
+    print(f"{SIZE}x{SIZE} maze, corner to corner")
+    print(f"{'search':<20} {'Point':>13} {'search':>13}")
+    for name, points_fn, search_fn in rows:
+        points_time = "-" if points_fn is None else _time(points_fn)
+        print(f"{name:<20} {points_time:>13} {_time(search_fn):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Times summing the numbers of a generated 100 MB input, one per line, by
+reading it into a str for collect_lines against streaming it with
+stream_lines from the open file and from a MappedInput. Every variant
+runs in a process of its own to report its peak memory.
+
+Run with `python benchmarks/bench_stream.py` from plugins/python.
+"""
+
+from __future__ import annotations
+
+import random
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from slh_python.mapped import MappedInput
+from slh_python.parser import collect_lines
+from slh_python.parser import stream_lines
+
+SIZE = 100 * 1024 * 1024
+
+
+def _collect(path: Path) -> int:
+    return sum(collect_lines(path.read_text(), int))
+
+
+def _stream_file(path: Path) -> int:
+    with path.open() as f:
+        return sum(stream_lines(f, int))
+
+
+def _stream_mapped(path: Path) -> int:
+    with MappedInput.open(path) as s:
+        return sum(stream_lines(s, int))
+
+
+_VARIANTS = {
+    "collect_lines(read_text())": _collect,
+    "stream_lines(file)": _stream_file,
+    "stream_lines(MappedInput)": _stream_mapped,
+}
+
+
+def _generate(path: Path) -> None:
+    rng = random.Random(0)
+    with path.open("w") as f:
+        written = 0
+        while written < SIZE:
+            chunk = "".join(f"{rng.randrange(10**9)}\n" for _ in range(100_000))
+            written += f.write(chunk)
+
+
+def _run(name: str, path: Path) -> None:
+    start = time.perf_counter()
+    total = _VARIANTS[name](path)
+    duration = time.perf_counter() - start
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(total, duration, peak_kib)
+
+
+def main() -> None:
+    with TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "input.txt"
+        _generate(path)
+
+        print(f"{path.stat().st_size / 2**20:.0f} MiB input")
+        print(f"{'variant':<28} {'duration':>10} {'peak':>10}")
+        totals = set()
+        for name in _VARIANTS:
+            out = subprocess.run(
+                [sys.executable, __file__, name, path],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            total, duration, peak_kib = out.split()
+            totals.add(total)
+            print(f"{name:<28} {float(duration):8.2f} s {int(peak_kib) / 1024:6.0f} MiB")
+
+        assert len(totals) == 1
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        _run(sys.argv[1], Path(sys.argv[2]))
+    else:
+        main()
@@ -1,2 +1,5 @@
+from .grid import *
+from .mapped import *
 from .math import *
 from .parser import *
+from .search import *
@@ -1,3 +1,4 @@
+import functools
 import importlib
 import re
 import warnings
@@ -8,6 +9,9 @@ from slh import DayPart
 from slh import get_rootdir
 from slh import Solution
 
+from .mapped import MAPPED_INPUT_ATTR
+from .mapped import MappedInput
+
 
 __all__ = [
     "get_all_dayparts",
@@ -75,9 +79,20 @@ def run_daypart_tests(
 def load_solution(dp: DayPart) -> Solution:
     mod = importlib.import_module(f"day{dp.day:02}.part{dp.part}")
 
+    # solutions decorated with mapped_input opted into the input being
+    # mapped into memory instead of read
+    if getattr(mod.solution, MAPPED_INPUT_ATTR, False):
+        @functools.wraps(mod.solution)
+        def mapped_solution(inputfile: Path, /) -> int:
+            with MappedInput.open(inputfile) as inputdata:
+                return mod.solution(inputdata)
+
+        return mapped_solution
+
     # In aoc2023 I had the main entry point take a string instead of
     # a file path. So here we handle this by reading the filename
     # and passing down the filename contents.
+    @functools.wraps(mod.solution)
     def solution(inputfile: Path, /) -> int:
         inputdata = inputfile.read_text()
         return mod.solution(inputdata)
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+from array import array
+from array import typecodes
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import MutableSequence
+from collections.abc import Sequence
+from itertools import chain
+from typing import final
+from typing import overload
+
+from .parser import FrozenGrid
+from .parser import Point
+from .parser import PointCodec
+
+
+# array of unicode characters, "u" is deprecated from 3.13 on
+_CHAR_TYPECODE = "w" if "w" in typecodes else "u"
+
+
+@final
+class Grid[T]:
+    """
+    Mutable grid stored flat, in row-major order.
+
+    Values are looked up by `(x, y)` with plain index arithmetic. For
+    character grids, from `Grid.from_str(s)`, the values are stored in
+    an array of characters instead of a list of strings.
+
+    `transpose`, `rotate`, `hreflect` and `vreflect` return views sharing
+    the values with the grid they were created from, only which value an
+    `(x, y)` refers to changes. Use `copy` for an independent grid.
+    """
+
+    __slots__ = ("_data", "_width", "_height", "_start", "_xstep", "_ystep")
+
+    def __init__(
+        self,
+        data: MutableSequence[T],
+        width: int,
+        height: int,
+        *,
+        start: int = 0,
+        xstep: int = 1,
+        ystep: int | None = None,
+    ) -> None:
+        self._data = data
+        self._width = width
+        self._height = height
+        self._start = start
+        self._xstep = xstep
+        self._ystep = width if ystep is None else ystep
+
+    @classmethod
+    def from_iter(
+        cls,
+        grid: Iterable[Iterable[T]],
+        /,
+        typecode: str | None = None,
+    ) -> Grid[T]:
+        """
+        Create a grid from its rows, e.g. a FrozenGrid. Values are stored
+        in an array of the typecode (e.g. "b" or "q") if one is provided.
+        """
+        rows = [list(row) for row in grid]
+        width = len(rows[0]) if rows else 0
+        if any(len(row) != width for row in rows):
+            raise ValueError("rows of a grid must have the same length")
+
+        values = chain.from_iterable(rows)
+        data = list(values) if typecode is None else array(typecode, values)
+        return cls(data, width, len(rows))  # type: ignore
+
+    @overload
+    @classmethod
+    def from_str(cls, s: str) -> Grid[str]:
+        ...
+
+    @overload
+    @classmethod
+    def from_str(cls, s: str, p: Callable[[str], T]) -> Grid[T]:
+        ...
+
+    @classmethod
+    def from_str(cls, s: str, p: Callable[[str], T] | None = None) -> Grid[T] | Grid[str]:
+        lines = s.splitlines()
+        if p is not None:
+            return cls.from_iter(map(p, line) for line in lines)
+
+        width = len(lines[0]) if lines else 0
+        data = array(_CHAR_TYPECODE, "".join(lines))
+        if len(data) != width * len(lines):
+            raise ValueError("rows of a grid must have the same length")
+        return Grid(data, width, len(lines))  # type: ignore
+
+    def freeze(self) -> FrozenGrid[T]:
+        return FrozenGrid.from_iter(self.iter_rows())
+
+    def copy(self) -> Grid[T]:
+        """
+        Copy the grid into new storage, in the row-major order of this
+        view.
+        """
+        data = self._data[:] if self._is_contiguous() else self._values()
+        return Grid(data, self._width, self._height)
+
+    def codec(self) -> PointCodec:
+        return PointCodec(self._width, self._height)
+
+    def cells(self) -> MutableSequence[T]:
+        """
+        The values in row-major order, to be indexed by packed points.
+        Writes go to the grid, which mustn't be a view, `copy` it first.
+        """
+        if not self._is_contiguous():
+            raise ValueError("cells of a grid view aren't in row-major order, copy it first")
+        return self._data
+
+    def row_len(self) -> int:
+        return self._height
+
+    def col_len(self) -> int:
+        return self._width
+
+    def __getitem__(self, key: tuple[int, int]) -> T:
+        x, y = key
+        if 0 <= x < self._width and 0 <= y < self._height:
+            return self._data[self._start + x * self._xstep + y * self._ystep]
+        raise IndexError(f"{key!r} is outside of the grid")
+
+    def __setitem__(self, key: tuple[int, int], value: T) -> None:
+        x, y = key
+        if 0 <= x < self._width and 0 <= y < self._height:
+            self._data[self._start + x * self._xstep + y * self._ystep] = value
+        else:
+            raise IndexError(f"{key!r} is outside of the grid")
+
+    def get(self, key: tuple[int, int], default: T | None = None) -> T | None:
+        x, y = key
+        if 0 <= x < self._width and 0 <= y < self._height:
+            return self._data[self._start + x * self._xstep + y * self._ystep]
+        return default
+
+    def iter_rows(self) -> Iterator[Sequence[T]]:
+        for y in range(self._height):
+            yield self._line(self._start + y * self._ystep, self._xstep, self._width)
+
+    def iter_cols(self) -> Iterator[Sequence[T]]:
+        for x in range(self._width):
+            yield self._line(self._start + x * self._xstep, self._ystep, self._height)
+
+    def iter_values(self) -> Iterator[T]:
+        if self._is_contiguous():
+            return iter(self._data)
+        return chain.from_iterable(self.iter_rows())
+
+    def enum_values(self) -> Iterator[tuple[Point, T]]:
+        for y, row in enumerate(self.iter_rows()):
+            for x, c in enumerate(row):
+                yield Point(x, y), c
+
+    def transpose(self) -> Grid[T]:
+        return Grid(
+            self._data,
+            self._height,
+            self._width,
+            start=self._start,
+            xstep=self._ystep,
+            ystep=self._xstep,
+        )
+
+    def rotate(self, turns: int) -> Grid[T]:
+        """rotate grid by 90° turns, +/- turns corresponds to ccw/cw rotation"""
+        match turns % 4:
+            case 0:
+                return self._view(self._start, self._xstep, self._ystep)
+            case 1:
+                return self.transpose().vreflect()
+            case 2:
+                return self.hreflect().vreflect()
+            case 3:
+                return self.vreflect().transpose()
+
+        raise TypeError(f"Invalid turns: {turns}")
+
+    def hreflect(self) -> Grid[T]:
+        start = self._start + (self._width - 1) * self._xstep
+        return self._view(start, -self._xstep, self._ystep)
+
+    def vreflect(self) -> Grid[T]:
+        start = self._start + (self._height - 1) * self._ystep
+        return self._view(start, self._xstep, -self._ystep)
+
+    def in_bounds(self, p: Point) -> bool:
+        return 0 <= p.x < self._width and 0 <= p.y < self._height
+
+    def on_edge(self, p: Point) -> bool:
+        return (
+            p.y <= 0
+            or p.x <= 0
+            or p.y >= self._height - 1
+            or p.x >= self._width - 1
+        )
+
+    def find(self, t: T, /) -> Point:
+        for p, c in self.enum_values():
+            if c == t:
+                return p
+        raise ValueError(f"value {t!r} not located in grid")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return (
+            self._width == other._width
+            and self._height == other._height
+            and all(a == b for a, b in zip(self.iter_values(), other.iter_values()))
+        )
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return '\n'.join("".join(str(c) for c in row) for row in self.iter_rows())
+
+    def _view(self, start: int, xstep: int, ystep: int) -> Grid[T]:
+        return Grid(
+            self._data, self._width, self._height, start=start, xstep=xstep, ystep=ystep
+        )
+
+    def _is_contiguous(self) -> bool:
+        return (
+            self._start == 0
+            and self._xstep == 1
+            and self._ystep == self._width
+            and len(self._data) == self._width * self._height
+        )
+
+    def _line(self, start: int, step: int, count: int) -> Sequence[T]:
+        if count == 0:
+            return self._data[0:0]
+        stop: int | None = start + step * count
+        # a reversed line ending at the first value, -1 would wrap around
+        if stop is not None and stop < 0:
+            stop = None
+        return self._data[start:stop:step]
+
+    def _values(self) -> MutableSequence[T]:
+        values = self._data[0:0]
+        for row in self.iter_rows():
+            values += row  # type: ignore
+        return values
+
+
+__all__ = [
+    "Grid",
+]
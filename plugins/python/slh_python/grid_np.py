@@ -0,0 +1,196 @@
+"""
+NumPy versions of the grid operations, for cellular automaton and flood
+style puzzles that would otherwise run cell by cell.
+
+Grids are 2d arrays indexed by `[y, x]`, character grids hold `str`
+values so they compare like FrozenGrid values, e.g. `grid == "#"`.
+
+NumPy is optional, without it importing this module raises an
+ImportError saying so:
+
+    try:
+        from slh_python import grid_np
+    except ImportError:
+        grid_np = None
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from collections.abc import Iterable
+from typing import Any
+
+try:
+    import numpy as np
+except ModuleNotFoundError as err:
+    raise ModuleNotFoundError(
+        "slh_python.grid_np requires numpy, install it with `pip install numpy`",
+        name=err.name,
+    ) from err
+
+from .grid import Grid
+from .parser import FrozenGrid
+from .parser import Point
+
+
+type Array = np.ndarray[Any, Any]
+
+
+_NEIGHBORS = ((0, -1), (-1, 0), (1, 0), (0, 1))
+_DIAGONALS = ((-1, -1), (1, -1), (-1, 1), (1, 1))
+
+
+def from_str(s: str, p: Callable[[str], Any] | None = None) -> Array:
+    """
+    Load a grid from the input. Characters are stored as one character
+    strings, or passed through the parser `p`. Digit grids parsed with
+    `int` are converted without calling it for every character.
+    """
+    lines = s.splitlines()
+    height = len(lines)
+    width = len(lines[0]) if lines else 0
+    if any(len(line) != width for line in lines):
+        raise ValueError("rows of a grid must have the same length")
+
+    if width == 0:
+        return np.empty((height, 0), dtype="<U1")
+
+    chars = np.array(lines, dtype=f"<U{width}").view("<U1").reshape(height, width)
+    if p is None:
+        return chars
+    if p is int and chars.size and np.all((chars >= "0") & (chars <= "9")):
+        return chars.view("<u4").astype(np.int64) - ord("0")
+    return np.vectorize(p, otypes=[object])(chars)
+
+
+def from_grid[T](grid: FrozenGrid[T] | Grid[T]) -> Array:
+    return np.array([list(row) for row in grid.iter_rows()])
+
+
+def to_frozen(a: Array) -> FrozenGrid[Any]:
+    return FrozenGrid.from_iter(a.tolist())
+
+
+def find_all(a: Array, t: Any, /) -> list[Point]:
+    """
+    Locations of the value in row-major order, e.g. `find_all(mask, True)`.
+    """
+    ys, xs = np.nonzero(a == t)
+    return [Point(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+
+
+def transpose(a: Array) -> Array:
+    return a.T
+
+
+def rotate(a: Array, turns: int) -> Array:
+    """rotate grid by 90° turns, +/- turns corresponds to ccw/cw rotation"""
+    return np.rot90(a, turns)
+
+
+def hreflect(a: Array) -> Array:
+    return a[:, ::-1]
+
+
+def vreflect(a: Array) -> Array:
+    return a[::-1]
+
+
+def neighbor_counts(mask: Array, diagonals: bool = True, wrap: bool = False) -> Array:
+    """
+    Number of true neighbors of every cell. Cells outside of the grid
+    count as false, unless the grid wraps around.
+    """
+    offsets = _NEIGHBORS + _DIAGONALS if diagonals else _NEIGHBORS
+    cells = mask.astype(np.uint8)
+    counts = np.zeros(mask.shape, dtype=np.uint8)
+    if wrap:
+        for dx, dy in offsets:
+            counts += np.roll(cells, (-dy, -dx), axis=(0, 1))
+        return counts
+
+    height, width = mask.shape
+    padded = np.pad(cells, 1)
+    for dx, dy in offsets:
+        counts += padded[1 + dy : 1 + dy + height, 1 + dx : 1 + dx + width]
+    return counts
+
+
+def step_life(
+    alive: Array,
+    born: Iterable[int] = (3,),
+    survive: Iterable[int] = (2, 3),
+    *,
+    diagonals: bool = True,
+    wrap: bool = False,
+) -> Array:
+    """
+    One generation of a life like automaton, dead cells with a number of
+    alive neighbors in `born` come alive, alive cells with a number in
+    `survive` stay alive.
+    """
+    rules = np.zeros((2, 9), dtype=np.bool_)
+    rules[0, list(born)] = True
+    rules[1, list(survive)] = True
+    return rules[alive.astype(np.uint8), neighbor_counts(alive, diagonals, wrap)]
+
+
+def simulate(state: Array, step: Callable[[Array], Array], steps: int) -> Array:
+    """
+    Apply the step to the state the number of times, e.g.
+    `simulate(alive, step_life, 100)`. Stops early once the state no
+    longer changes.
+    """
+    for _ in range(steps):
+        new = step(state)
+        if np.array_equal(new, state):
+            break
+        state = new
+    return state
+
+
+def spread(
+    passable: Array,
+    sources: Iterable[tuple[int, int]],
+    steps: int | None = None,
+    *,
+    diagonals: bool = False,
+) -> Array:
+    """
+    Distances from the closest source to every passable cell, found by
+    growing the reached cells one step at a time, -1 for cells that
+    weren't reached (within the steps).
+    """
+    distances = np.full(passable.shape, -1, dtype=np.int64)
+    reached = np.zeros(passable.shape, dtype=np.bool_)
+    for x, y in sources:
+        reached[y, x] = True
+    reached &= passable
+    distances[reached] = 0
+
+    distance = 0
+    while steps is None or distance < steps:
+        grown = (reached | (neighbor_counts(reached, diagonals) > 0)) & passable
+        new = grown & ~reached
+        if not new.any():
+            break
+        distance += 1
+        distances[new] = distance
+        reached = grown
+    return distances
+
+
+__all__ = [
+    "from_str",
+    "from_grid",
+    "to_frozen",
+    "find_all",
+    "transpose",
+    "rotate",
+    "hreflect",
+    "vreflect",
+    "neighbor_counts",
+    "step_life",
+    "simulate",
+    "spread",
+]
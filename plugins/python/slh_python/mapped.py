@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import functools
+import mmap
+from collections.abc import Callable
+from pathlib import Path
+from types import TracebackType
+from typing import final
+
+
+# set on solutions taking a MappedInput, checked by the python plugin
+MAPPED_INPUT_ATTR = "__slh_mapped_input__"
+
+
+@final
+class MappedInput:
+    """
+    The puzzle input mapped into memory instead of read into a str. It
+    is a buffer, so it can be streamed from without copying it:
+
+        @mapped_input
+        def solution(s: MappedInput) -> int:
+            return sum(stream_lines(s, int))
+    """
+
+    __slots__ = ("_buffer",)
+
+    def __init__(self, buffer: bytes | mmap.mmap) -> None:
+        self._buffer = buffer
+
+    @classmethod
+    def open(cls, path: Path) -> MappedInput:
+        with path.open("rb") as f:
+            try:
+                return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            except ValueError:
+                # empty files can't be mapped
+                return cls(b"")
+
+    @classmethod
+    def from_str(cls, s: str) -> MappedInput:
+        return cls(s.encode())
+
+    def text(self) -> str:
+        """
+        Decode the whole input, e.g. for parsers that need a str.
+        """
+        return str(self._buffer, "utf-8")
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            try:
+                self._buffer.close()
+            except BufferError:
+                # views of the input outlived the solution, leave the
+                # mapping to the garbage collector
+                pass
+
+    def __buffer__(self, flags: int, /) -> memoryview:
+        return memoryview(self._buffer)
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __enter__(self) -> MappedInput:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def mapped_input[R](solution: Callable[[MappedInput], R]) -> Callable[[MappedInput | str], R]:
+    """
+    Make the python plugin pass the solution a MappedInput instead of a
+    str. A str, e.g. an example input in a test, is wrapped into one.
+    """
+
+    @functools.wraps(solution)
+    def wrapper(s: MappedInput | str, /) -> R:
+        if isinstance(s, str):
+            s = MappedInput.from_str(s)
+        return solution(s)
+
+    setattr(wrapper, MAPPED_INPUT_ATTR, True)
+    return wrapper
+
+
+__all__ = [
+    "MappedInput",
+    "mapped_input",
+]
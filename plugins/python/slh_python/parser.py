@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import operator
+import re
+from collections.abc import Buffer
 from collections.abc import Callable
 from collections.abc import Iterable
 from collections.abc import Iterator
 from collections.abc import Sequence
 from dataclasses import dataclass
+from itertools import chain
 from typing import final
+from typing import IO
 from typing import NamedTuple
 from typing import overload
 from typing import SupportsIndex
@@ -123,6 +127,114 @@ def collect_block_statements[T](
     return [parser_used(block) for block in s.split("\n\n")]
 
 
+# input to stream lines and blocks from, e.g. a MappedInput or an open file
+type Source = str | Buffer | IO[str] | IO[bytes]
+
+# characters (or bytes) of the input decoded and split at a time
+_CHUNK_SIZE = 1 << 20
+_NEWLINE = re.compile(rb"\n")
+
+
+def stream_lines[T](
+    source: Source,
+    parser: Callable[[str], T],
+    *,
+    debug: bool = False,
+) -> Iterator[T]:
+    """
+    Like collect_lines, but parses the lines one by one as they are
+    iterated, without splitting the whole input up front.
+    """
+    if debug:
+        def parser_used(s: str, /) -> T:
+            rslt = parser(s)
+            print(f"{s} -> {rslt}")
+            return rslt
+    else:
+        parser_used = parser
+
+    return map(parser_used, _iter_lines(source))
+
+
+def stream_block_lines[T](
+    source: Source,
+    parser: Callable[[str], T],
+    *,
+    debug: bool = False,
+) -> Iterator[list[T]]:
+    """
+    Like collect_block_lines, but parses the blocks one by one as they
+    are iterated.
+    """
+    for block in _iter_blocks(source):
+        rslt = collect_lines(block, parser, debug=debug)
+        if debug:
+            print(f"block -> {rslt}")
+        yield rslt
+
+
+def stream_block_statements[T](
+    source: Source,
+    parser: Callable[[str], T],
+    *,
+    debug: bool = False,
+) -> Iterator[T]:
+    """
+    Like collect_block_statements, but parses the blocks one by one as
+    they are iterated.
+    """
+    if debug:
+        def parser_used(block: str, /) -> T:
+            rslt = parser(block)
+            print(f"{block}\n  gives: {rslt}")
+            return rslt
+    else:
+        parser_used = parser
+
+    return map(parser_used, _iter_blocks(source))
+
+
+def _iter_lines(source: Source) -> Iterator[str]:
+    return chain.from_iterable(piece.splitlines() for piece in _iter_pieces(source))
+
+
+def _iter_blocks(source: Source) -> Iterator[str]:
+    block: list[str] = []
+    for line in _iter_lines(source):
+        if line:
+            block.append(line)
+        elif block:
+            yield "\n".join(block)
+            block = []
+    if block:
+        yield "\n".join(block)
+
+
+def _iter_pieces(source: Source) -> Iterator[str]:
+    """
+    The input decoded a chunk at a time, each piece ending with a line.
+    """
+    if isinstance(source, str):
+        start = 0
+        while start < len(source):
+            end = source.find("\n", start + _CHUNK_SIZE) + 1 or len(source)
+            yield source[start:end]
+            start = end
+    elif isinstance(source, Buffer):
+        # re searches the buffer in place, only each piece is decoded
+        view = memoryview(source).cast("B")
+        start = 0
+        while start < len(view):
+            newline = _NEWLINE.search(view, start + _CHUNK_SIZE)
+            end = newline.end() if newline else len(view)
+            yield str(view[start:end], "utf-8")
+            start = end
+    else:
+        while piece := source.read(_CHUNK_SIZE):
+            piece += source.readline()
+            yield piece if isinstance(piece, str) else piece.decode()
+
+
 class Point(NamedTuple):
     x: int = 0
     y: int = 0
@@ -159,6 +271,92 @@ class Point(NamedTuple):
                     continue
                 yield self + (dx, dy)
 
+# directions of PointCodec offsets and bounds mask bits, the four
+# orthogonal ones first
+_DIRECTIONS = ((0, -1), (-1, 0), (1, 0), (0, 1), (-1, -1), (1, -1), (-1, 1), (1, 1))
+
+
+@final
+class PointCodec:
+    """
+    Packs the points of a grid into ints, `y * width + x`, so hot loops
+    can stay in plain ints instead of creating a Point per step:
+
+        codec = grid.codec()
+        cells = grid.cells()
+        i = codec.encode(start)
+        for step in codec.steps4(i):
+            if cells[i + step] != "#":
+                ...
+
+    `offsets4` and `offsets8` are what a step in each direction adds to
+    a packed point, up, left, right and down first. Bit k of `masks[i]`
+    is set when step k from point i stays within the grid, `steps4` and
+    `steps8` are those offsets.
+    """
+
+    __slots__ = ("width", "height", "offsets4", "offsets8", "masks", "_by_mask")
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.offsets8 = tuple(dy * width + dx for dx, dy in _DIRECTIONS)
+        self.offsets4 = self.offsets8[:4]
+        self.masks = self._bounds_masks()
+        # the offsets staying within the grid, for every mask
+        self._by_mask = tuple(
+            tuple(o for k, o in enumerate(self.offsets8) if mask >> k & 1)
+            for mask in range(256)
+        )
+
+    def encode(self, p: tuple[int, int]) -> int:
+        x, y = p
+        return y * self.width + x
+
+    def decode(self, i: int) -> Point:
+        y, x = divmod(i, self.width)
+        return Point(x, y)
+
+    def in_bounds(self, p: tuple[int, int]) -> bool:
+        x, y = p
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def steps4(self, i: int) -> tuple[int, ...]:
+        """
+        Offsets of the orthogonal steps from point i staying within the
+        grid, looked up without allocating.
+        """
+        return self._by_mask[self.masks[i] & 0xF]
+
+    def steps8(self, i: int) -> tuple[int, ...]:
+        return self._by_mask[self.masks[i]]
+
+    def neighbors4(self, i: int) -> list[int]:
+        return [i + o for o in self._by_mask[self.masks[i] & 0xF]]
+
+    def neighbors8(self, i: int) -> list[int]:
+        return [i + o for o in self._by_mask[self.masks[i]]]
+
+    def _bounds_masks(self) -> bytes:
+        def axis_masks(size: int, axis: int) -> list[int]:
+            def mask(c: int) -> int:
+                return sum(
+                    1 << k
+                    for k, d in enumerate(_DIRECTIONS)
+                    if 0 <= c + d[axis] < size
+                )
+
+            # only the first and last coordinates lose steps
+            if size <= 2:
+                return [mask(c) for c in range(size)]
+            return [mask(0)] + [mask(1)] * (size - 2) + [mask(size - 1)]
+
+        xmasks = axis_masks(self.width, 0)
+        ymasks = axis_masks(self.height, 1)
+        rows = {ymask: bytes(ymask & xmask for xmask in xmasks) for ymask in set(ymasks)}
+        return b"".join(rows[ymask] for ymask in ymasks)
+
+
 def _point_operation(
     point: Point,
     other: tuple[int, int] | int,
@@ -299,6 +497,15 @@ class FrozenGrid[T](Sequence[Sequence[T]]):
             or p.x >= self.col_len() - 1
         )
 
+    def codec(self) -> PointCodec:
+        return PointCodec(self.col_len(), self.row_len())
+
+    def cells(self) -> Array:
+        """
+        The values in row-major order, to be indexed by packed points.
+        """
+        return tuple(self.iter_values())
+
     def find(self, t: T, /) -> Point:
         for y, row in self.enum_rows():
             for x, c in enumerate(row):
@@ -311,6 +518,10 @@ __all__ = [
     "collect_lines",
     "collect_block_lines",
     "collect_block_statements",
+    "stream_lines",
+    "stream_block_lines",
+    "stream_block_statements",
     "Point",
+    "PointCodec",
     "FrozenGrid",
 ]
@@ -0,0 +1,456 @@
+"""
+Shortest path searches: `bfs`, `bfs01` (edges costing 0 or 1), `dijkstra`
+and `astar`.
+
+States are anything hashable, `neighbors(state)` yields the next states,
+with the cost of getting there for the weighted searches. The goal is a
+state or a predicate, the search stops once it is reached. Without a goal
+every reachable state is searched.
+
+States are numbered as they are discovered, so the frontier only holds
+ints and states never need to be comparable. For grids `GridGraph` goes
+one step further, its states are the packed cell indices themselves:
+
+    graph = GridGraph(grid)
+    result = bfs(graph.index(start), graph.neighbors, graph.index(end))
+    path = [graph.point(i) for i in result.path()]
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import final
+
+from .grid import Grid
+from .parser import FrozenGrid
+from .parser import Point
+
+
+type Goal[S] = S | Callable[[S], bool] | None
+
+
+@final
+@dataclass(frozen=True)
+class SearchResult[S]:
+    """
+    Distances and shortest path parents of the searched states. With an
+    early exit only the distances up to the goal's are final.
+    """
+
+    # the goal state that was reached, None if no goal was reached
+    goal: S | None
+    _states: list[S]
+    _ids: dict[S, int]
+    _dist: list[int]
+    # every parent on a shortest path with all_paths, otherwise one
+    _parents: list[list[int]]
+
+    def __contains__(self, state: object) -> bool:
+        return state in self._ids
+
+    def distance(self, state: S | None = None) -> int:
+        """
+        Distance to the state, the goal by default. Raises KeyError if
+        it wasn't reached.
+        """
+        return self._dist[self._id(state)]
+
+    def distances(self) -> dict[S, int]:
+        return dict(zip(self._states, self._dist))
+
+    def path(self, state: S | None = None) -> list[S]:
+        """
+        A shortest path from the start to the state, the goal by default.
+        """
+        i = self._id(state)
+        path = [self._states[i]]
+        while parents := self._parents[i]:
+            i = parents[0]
+            path.append(self._states[i])
+        path.reverse()
+        return path
+
+    def all_paths(self, state: S | None = None) -> Iterator[list[S]]:
+        """
+        Every shortest path from the start to the state, the goal by
+        default. Needs a search with `all_paths=True`.
+        """
+        stack = [[self._id(state)]]
+        while stack:
+            ids = stack.pop()
+            if ids[-1] == 0:
+                yield [self._states[i] for i in reversed(ids)]
+                continue
+            # states joined by free steps are each other's parents
+            stack.extend(
+                [*ids, parent] for parent in self._parents[ids[-1]] if parent not in ids
+            )
+
+    def on_shortest_paths(self, state: S | None = None) -> set[S]:
+        """
+        States on any shortest path to the state, the goal by default,
+        i.e. the states of `all_paths`. Needs a search with `all_paths=True`.
+
+        States joined by free steps are each other's parents, a state only
+        reached by going around such a loop isn't on any path. The paths
+        through each loop are tried, which is cheap as long as the loops
+        are small, e.g. turning on the spot.
+        """
+        goal = self._id(state)
+        parents = self._parents
+        seen = {goal}
+        stack = [goal]
+        while stack:
+            for parent in parents[stack.pop()]:
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+
+        on_paths = set(seen)
+        for loop in _loops(seen, parents):
+            on_paths -= loop
+            on_paths |= _on_paths_through(loop, seen, parents, goal)
+        return {self._states[i] for i in on_paths}
+
+    def _id(self, state: S | None) -> int:
+        if state is None:
+            if self.goal is None:
+                raise ValueError("no goal was reached, provide a state")
+            state = self.goal
+        return self._ids[state]
+
+
+def _loops(ids: set[int], parents: list[list[int]]) -> Iterator[set[int]]:
+    """
+    The strongly connected components of more than one state in the
+    graph of the states' parents, found with Tarjan's algorithm.
+    """
+    index: dict[int, int] = {}
+    low: dict[int, int] = {}
+    stack: list[int] = []
+    on_stack: set[int] = set()
+    for root in ids:
+        if root in index:
+            continue
+
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(parents[root]))]
+        while work:
+            i, remaining = work[-1]
+            for parent in remaining:
+                if parent not in index:
+                    index[parent] = low[parent] = len(index)
+                    stack.append(parent)
+                    on_stack.add(parent)
+                    work.append((parent, iter(parents[parent])))
+                    break
+                if parent in on_stack:
+                    low[i] = min(low[i], index[parent])
+            else:
+                work.pop()
+                if work:
+                    child = work[-1][0]
+                    low[child] = min(low[child], low[i])
+                if low[i] != index[i]:
+                    continue
+
+                component = set()
+                while (j := stack.pop()) != i:
+                    on_stack.remove(j)
+                    component.add(j)
+                on_stack.remove(i)
+                if component:
+                    component.add(i)
+                    yield component
+
+
+def _on_paths_through(
+    loop: set[int], seen: set[int], parents: list[list[int]], goal: int
+) -> set[int]:
+    """
+    States of the loop on a simple path through it, from one entered from
+    outside of the loop (or the goal) to one leaving it. Paths outside of
+    the loop can't return to it, so any such path extends to a shortest
+    path.
+    """
+    entries = {goal} & loop
+    entries.update(p for i in seen - loop for p in parents[i] if p in loop)
+    exits = {i for i in loop if any(p not in loop for p in parents[i])}
+
+    on_paths: set[int] = set()
+    for entry in entries:
+        if len(on_paths) == len(loop):
+            break
+        path = [entry]
+        if entry in exits:
+            on_paths.add(entry)
+        remaining = [iter(parents[entry])]
+        while remaining:
+            for parent in remaining[-1]:
+                if parent in loop and parent not in path:
+                    path.append(parent)
+                    if parent in exits:
+                        on_paths.update(path)
+                    remaining.append(iter(parents[parent]))
+                    break
+            else:
+                remaining.pop()
+                path.pop()
+    return on_paths
+
+
+class _Search[S]:
+    """
+    Numbers the discovered states and keeps track of their distances
+    and parents.
+    """
+
+    def __init__(self, start: S, goal: Goal[S], all_paths: bool) -> None:
+        self.states = [start]
+        self.ids = {start: 0}
+        self.dist = [0]
+        self.parents: list[list[int]] = [[]]
+        self.all_paths = all_paths
+        self.goal: S | None = None
+        if goal is None:
+            self._is_goal: Callable[[S], bool] = lambda _: False
+        elif callable(goal):
+            self._is_goal = goal
+        else:
+            self._is_goal = lambda state: state == goal
+
+    def reached(self, i: int) -> bool:
+        """
+        Check whether the popped state is the goal, recording it.
+        """
+        if self.goal is None and self._is_goal(self.states[i]):
+            self.goal = self.states[i]
+            return True
+        return False
+
+    def relax(self, i: int, state: S, d: int) -> int | None:
+        """
+        Record reaching the state from state i with distance d, returning
+        its id if that is shorter than before.
+        """
+        j = self.ids.get(state)
+        if j is None:
+            j = self.ids[state] = len(self.states)
+            self.states.append(state)
+            self.dist.append(d)
+            self.parents.append([i])
+            return j
+
+        if d < self.dist[j]:
+            self.dist[j] = d
+            self.parents[j] = [i]
+            return j
+        if (
+            d == self.dist[j]
+            and self.all_paths
+            and j != 0
+            and i not in self.parents[j]
+        ):
+            self.parents[j].append(i)
+        return None
+
+    def result(self) -> SearchResult[S]:
+        return SearchResult(self.goal, self.states, self.ids, self.dist, self.parents)
+
+
+def bfs[S](
+    start: S,
+    neighbors: Callable[[S], Iterable[S]],
+    goal: Goal[S] = None,
+    *,
+    all_paths: bool = False,
+) -> SearchResult[S]:
+    """
+    Breadth first search, every step costs 1.
+    """
+    search = _Search(start, goal, all_paths)
+    states, dist = search.states, search.dist
+    frontier = deque([0])
+    while frontier:
+        i = frontier.popleft()
+        # all parents of the goal were popped before it
+        if search.reached(i):
+            break
+
+        d = dist[i] + 1
+        for state in neighbors(states[i]):
+            j = search.relax(i, state, d)
+            if j is not None:
+                frontier.append(j)
+
+    return search.result()
+
+
+def bfs01[S](
+    start: S,
+    neighbors: Callable[[S], Iterable[tuple[S, int]]],
+    goal: Goal[S] = None,
+    *,
+    all_paths: bool = False,
+) -> SearchResult[S]:
+    """
+    Breadth first search where steps cost 0 or 1, e.g. turning for free.
+    """
+    search = _Search(start, goal, all_paths)
+    states, dist = search.states, search.dist
+    frontier = deque([(0, 0)])
+    stop = None
+    while frontier:
+        d, i = frontier.popleft()
+        if d > dist[i]:
+            continue
+        if stop is not None and d > stop:
+            break
+        if search.reached(i):
+            if not all_paths:
+                break
+            # free steps may still reach the goal from states this far
+            stop = d
+
+        for state, cost in neighbors(states[i]):
+            j = search.relax(i, state, d + cost)
+            if j is None:
+                continue
+            if cost == 0:
+                frontier.appendleft((d, j))
+            else:
+                frontier.append((d + cost, j))
+
+    return search.result()
+
+
+def dijkstra[S](
+    start: S,
+    neighbors: Callable[[S], Iterable[tuple[S, int]]],
+    goal: Goal[S] = None,
+    *,
+    all_paths: bool = False,
+) -> SearchResult[S]:
+    """
+    Dijkstra's search, costs mustn't be negative.
+    """
+    return astar(start, neighbors, goal, None, all_paths=all_paths)
+
+
+def astar[S](
+    start: S,
+    neighbors: Callable[[S], Iterable[tuple[S, int]]],
+    goal: Goal[S],
+    heuristic: Callable[[S], int] | None,
+    *,
+    all_paths: bool = False,
+) -> SearchResult[S]:
+    """
+    A* search, the heuristic estimates the remaining cost to the goal and
+    mustn't overestimate it. With `all_paths` it must be consistent too,
+    e.g. the manhattan distance on a grid.
+    """
+    search = _Search(start, goal, all_paths)
+    states, dist = search.states, search.dist
+    frontier = [(0, 0, 0)]
+    stop = None
+    while frontier:
+        estimate, d, i = heapq.heappop(frontier)
+        if d > dist[i]:
+            continue
+        if stop is not None and estimate > stop:
+            break
+        if search.reached(i):
+            if not all_paths:
+                break
+            # free steps may still reach the goal from states this close
+            stop = d
+
+        for state, cost in neighbors(states[i]):
+            j = search.relax(i, state, d + cost)
+            if j is not None:
+                estimate = d + cost
+                if heuristic is not None:
+                    estimate += heuristic(state)
+                heapq.heappush(frontier, (estimate, d + cost, j))
+
+    return search.result()
+
+
+@final
+class GridGraph[T]:
+    """
+    The cells of a grid as a graph for the searches. States are the
+    packed points of `codec`, see `index` and `point`.
+
+    Cells are passable unless they are a "#" by default, the cost of a
+    weighted step is the cost of the cell stepped onto.
+    """
+
+    def __init__(
+        self,
+        grid: FrozenGrid[T] | Grid[T],
+        passable: Callable[[T], bool] = lambda c: c != "#",
+        cost: Callable[[T], int] | None = None,
+        *,
+        diagonals: bool = False,
+    ) -> None:
+        values = list(grid.iter_values())
+        self.codec = grid.codec()
+        self.width = self.codec.width
+        self.height = self.codec.height
+        self._open = bytearray(map(passable, values))
+        self._costs = [1] * len(values) if cost is None else list(map(cost, values))
+        self._steps = self.codec.steps8 if diagonals else self.codec.steps4
+
+    def index(self, p: tuple[int, int]) -> int:
+        return self.codec.encode(p)
+
+    def point(self, i: int) -> Point:
+        return self.codec.decode(i)
+
+    def neighbors(self, i: int) -> list[int]:
+        """
+        The passable cells next to the cell.
+        """
+        is_open = self._open
+        return [i + step for step in self._steps(i) if is_open[i + step]]
+
+    def weighted(self, i: int) -> list[tuple[int, int]]:
+        """
+        The passable cells next to the cell, with their cost.
+        """
+        is_open = self._open
+        costs = self._costs
+        return [(j, costs[j]) for step in self._steps(i) if is_open[j := i + step]]
+
+    def manhattan(self, target: int) -> Callable[[int], int]:
+        """
+        Heuristic for astar, the manhattan distance to the target cell.
+        Only admissible for steps costing at least 1, without diagonals.
+        """
+        ty, tx = divmod(target, self.width)
+        w = self.width
+
+        def heuristic(i: int) -> int:
+            y, x = divmod(i, w)
+            return abs(x - tx) + abs(y - ty)
+
+        return heuristic
+
+
+__all__ = [
+    "bfs",
+    "bfs01",
+    "dijkstra",
+    "astar",
+    "SearchResult",
+    "GridGraph",
+]
@@ -0,0 +1,167 @@
+import pytest
+from slh_python.grid import Grid
+from slh_python.parser import FrozenGrid
+from slh_python.parser import Point
+
+
+def _grid():
+    """
+    12
+    34
+    56
+    """
+    return Grid.from_iter(((1, 2), (3, 4), (5, 6)))
+
+
+def _rows(g):
+    return [tuple(row) for row in g.iter_rows()]
+
+
+def test_from_str():
+    g = Grid.from_str("#.\n.#\n..\n")
+    assert g.row_len() == 3
+    assert g.col_len() == 2
+    assert g[0, 0] == "#"
+    assert g[1, 0] == "."
+    assert g[1, 1] == "#"
+    assert repr(g) == "#.\n.#\n.."
+
+
+def test_from_str_with_parser():
+    g = Grid.from_str("12\n34\n", int)
+    assert _rows(g) == [(1, 2), (3, 4)]
+
+
+def test_from_str_ragged():
+    with pytest.raises(ValueError):
+        Grid.from_str("##\n#\n")
+
+
+def test_from_iter_typecode():
+    g = Grid.from_iter(((1, 2), (3, 4)), "b")
+    assert g[1, 1] == 4
+    g[1, 1] = -1
+    assert _rows(g) == [(1, 2), (3, -1)]
+
+
+def test_getitem_setitem():
+    g = _grid()
+    assert g[Point(1, 2)] == 6
+    g[0, 1] = 9
+    assert g[0, 1] == 9
+    assert _rows(g) == [(1, 2), (9, 4), (5, 6)]
+
+
+@pytest.mark.parametrize("key", [(2, 0), (0, 3), (-1, 0), (0, -1)])
+def test_getitem_out_of_bounds(key):
+    g = _grid()
+    with pytest.raises(IndexError):
+        g[key]
+    with pytest.raises(IndexError):
+        g[key] = 0
+    assert g.get(key) is None
+    assert g.get(key, 0) == 0
+
+
+def test_freeze_and_back():
+    fg = FrozenGrid(((1, 2), (3, 4), (5, 6)))
+    g = Grid.from_iter(fg)
+    assert _rows(g) == list(fg.iter_rows())
+    assert g.freeze() == fg
+
+
+def test_iter_cols():
+    assert [tuple(col) for col in _grid().iter_cols()] == [(1, 3, 5), (2, 4, 6)]
+
+
+def test_iter_values():
+    assert list(_grid().iter_values()) == [1, 2, 3, 4, 5, 6]
+    assert list(_grid().vreflect().iter_values()) == [5, 6, 3, 4, 1, 2]
+
+
+def test_enum_values():
+    assert list(_grid().enum_values())[3] == (Point(1, 1), 4)
+
+
+def test_transpose():
+    assert _rows(_grid().transpose()) == [(1, 3, 5), (2, 4, 6)]
+
+
+@pytest.mark.parametrize("turns", range(-4, 5))
+def test_rotate_matches_frozen_grid(turns):
+    fg = FrozenGrid(((1, 2), (3, 4), (5, 6)))
+    assert _grid().rotate(turns).freeze() == fg.rotate(turns)
+
+
+def test_reflect_matches_frozen_grid():
+    fg = FrozenGrid(((1, 2), (3, 4), (5, 6)))
+    assert _grid().hreflect().freeze() == fg.hreflect()
+    assert _grid().vreflect().freeze() == fg.vreflect()
+    assert _grid().hreflect().vreflect().transpose().freeze() == (
+        fg.hreflect().vreflect().transpose()
+    )
+
+
+def test_views_share_values():
+    g = _grid()
+    r = g.rotate(1)
+    """
+    12
+    34   ->   246
+    56        135
+    """
+    r[0, 0] = 0
+    assert g[1, 0] == 0
+
+
+def test_copy():
+    g = _grid()
+    c = g.rotate(1).copy()
+    c[0, 0] = 0
+    assert g[1, 0] == 2
+    assert _rows(c) == [(0, 4, 6), (1, 3, 5)]
+
+
+def test_copy_char_grid():
+    g = Grid.from_str("ab\ncd\n")
+    c = g.transpose().copy()
+    assert repr(c) == "ac\nbd"
+    c[0, 0] = "x"
+    assert g[0, 0] == "a"
+
+
+def test_eq():
+    assert _grid() == Grid.from_iter([[1, 2], [3, 4], [5, 6]])
+    assert _grid() != _grid().transpose()
+    assert _grid().rotate(2) == _grid().hreflect().vreflect()
+
+
+def test_find():
+    g = Grid.from_str("..\n.S\n")
+    assert g.find("S") == Point(1, 1)
+    with pytest.raises(ValueError):
+        g.find("E")
+
+
+def test_in_bounds_and_on_edge():
+    g = Grid.from_str("...\n...\n...\n")
+    assert g.in_bounds(Point(2, 2))
+    assert not g.in_bounds(Point(3, 0))
+    assert g.on_edge(Point(0, 1))
+    assert not g.on_edge(Point(1, 1))
+
+
+def test_cells():
+    g = Grid.from_str("ab\ncd\n")
+    codec = g.codec()
+    cells = g.cells()
+    assert cells[codec.encode((1, 1))] == "d"
+    cells[codec.encode((0, 1))] = "x"
+    assert g[0, 1] == "x"
+
+
+def test_cells_of_view():
+    g = Grid.from_str("ab\ncd\n").transpose()
+    with pytest.raises(ValueError):
+        g.cells()
+    assert list(g.copy().cells()) == ["a", "c", "b", "d"]
@@ -0,0 +1,143 @@
+import importlib
+import sys
+
+import pytest
+from slh_python.grid import Grid
+from slh_python.parser import FrozenGrid
+from slh_python.parser import Point
+
+
+@pytest.fixture
+def grid_np():
+    pytest.importorskip("numpy")
+    from slh_python import grid_np
+
+    return grid_np
+
+
+def test_import_without_numpy(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    monkeypatch.delitem(sys.modules, "slh_python.grid_np", raising=False)
+    with pytest.raises(ImportError, match="requires numpy"):
+        importlib.import_module("slh_python.grid_np")
+
+
+def test_from_str(grid_np):
+    a = grid_np.from_str("#..\n.#.\n")
+    assert a.shape == (2, 3)
+    assert a[0, 0] == "#"
+    assert a[1, 0] == "."
+    assert a.tolist() == [["#", ".", "."], [".", "#", "."]]
+
+
+def test_from_str_digits(grid_np):
+    a = grid_np.from_str("019\n284\n", int)
+    assert a.tolist() == [[0, 1, 9], [2, 8, 4]]
+
+
+def test_from_str_with_parser(grid_np):
+    a = grid_np.from_str("#.\n.#\n", lambda c: c == "#")
+    assert a.tolist() == [[True, False], [False, True]]
+
+
+def test_from_str_ragged(grid_np):
+    with pytest.raises(ValueError):
+        grid_np.from_str("##\n#\n")
+
+
+def test_from_str_empty(grid_np):
+    assert grid_np.from_str("").shape == (0, 0)
+
+
+def test_grid_conversions(grid_np):
+    fg = FrozenGrid.from_str("ab\ncd\nef\n")
+    a = grid_np.from_grid(fg)
+    assert a.tolist() == grid_np.from_str("ab\ncd\nef\n").tolist()
+    assert grid_np.from_grid(Grid.from_iter(fg)).tolist() == a.tolist()
+    assert grid_np.to_frozen(a) == fg
+
+
+def test_find_all(grid_np):
+    a = grid_np.from_str("#..\n.##\n")
+    assert grid_np.find_all(a, "#") == [Point(0, 0), Point(1, 1), Point(2, 1)]
+    assert grid_np.find_all(a == ".", True) == [Point(1, 0), Point(2, 0), Point(0, 1)]
+    assert grid_np.find_all(a, "x") == []
+
+
+@pytest.mark.parametrize("turns", range(-4, 5))
+def test_rotate_matches_frozen_grid(grid_np, turns):
+    fg = FrozenGrid(((1, 2), (3, 4), (5, 6)))
+    a = grid_np.from_grid(fg)
+    assert grid_np.to_frozen(grid_np.rotate(a, turns)) == fg.rotate(turns)
+
+
+def test_reflect_and_transpose_are_views(grid_np):
+    fg = FrozenGrid(((1, 2), (3, 4), (5, 6)))
+    a = grid_np.from_grid(fg)
+    assert grid_np.to_frozen(grid_np.hreflect(a)) == fg.hreflect()
+    assert grid_np.to_frozen(grid_np.vreflect(a)) == fg.vreflect()
+    assert grid_np.to_frozen(grid_np.transpose(a)) == fg.transpose()
+    for view in (grid_np.hreflect(a), grid_np.vreflect(a), grid_np.rotate(a, 1)):
+        assert view.base is a or view.base is a.base
+
+
+def test_neighbor_counts(grid_np):
+    mask = grid_np.from_str("#.#\n...\n##.\n") == "#"
+    assert grid_np.neighbor_counts(mask).tolist() == [
+        [0, 2, 0],
+        [3, 4, 2],
+        [1, 1, 1],
+    ]
+    assert grid_np.neighbor_counts(mask, diagonals=False).tolist() == [
+        [0, 2, 0],
+        [2, 1, 1],
+        [1, 1, 1],
+    ]
+
+
+def test_neighbor_counts_wrap(grid_np):
+    mask = grid_np.from_str("#..\n...\n...\n") == "#"
+    assert grid_np.neighbor_counts(mask, wrap=True).tolist() == [
+        [0, 1, 1],
+        [1, 1, 1],
+        [1, 1, 1],
+    ]
+
+
+def test_step_life_blinker(grid_np):
+    alive = grid_np.from_str(".....\n..#..\n..#..\n..#..\n.....\n") == "#"
+    turned = grid_np.step_life(alive)
+    assert grid_np.find_all(turned, True) == [Point(1, 2), Point(2, 2), Point(3, 2)]
+    assert (grid_np.step_life(turned) == alive).all()
+
+
+def test_simulate(grid_np):
+    alive = grid_np.from_str(".....\n..#..\n..#..\n..#..\n.....\n") == "#"
+    assert (grid_np.simulate(alive, grid_np.step_life, 10) == alive).all()
+
+    # a block is stable, the simulation stops once nothing changes
+    calls = []
+
+    def step(state):
+        calls.append(state)
+        return grid_np.step_life(state)
+
+    block = grid_np.from_str("....\n.##.\n.##.\n....\n") == "#"
+    assert (grid_np.simulate(block, step, 100) == block).all()
+    assert len(calls) == 1
+
+
+def test_spread(grid_np):
+    passable = grid_np.from_str("...\n##.\n...\n#..\n") != "#"
+    distances = grid_np.spread(passable, [(0, 0)])
+    assert distances.tolist() == [
+        [0, 1, 2],
+        [-1, -1, 3],
+        [6, 5, 4],
+        [-1, 6, 5],
+    ]
+    assert grid_np.spread(passable, [(0, 0)], steps=2).tolist()[1:] == [
+        [-1, -1, -1],
+        [-1, -1, -1],
+        [-1, -1, -1],
+    ]
@@ -0,0 +1,87 @@
+import importlib
+import sys
+
+import pytest
+from slh import DayPart
+from slh_python._plugin import load_solution
+from slh_python.mapped import MappedInput
+from slh_python.mapped import mapped_input
+from slh_python.parser import stream_block_lines
+from slh_python.parser import stream_lines
+
+
+def test_open(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("1\n2\n\n3\n")
+    with MappedInput.open(path) as s:
+        assert len(s) == 7
+        assert s.text() == "1\n2\n\n3\n"
+        assert bytes(memoryview(s)) == b"1\n2\n\n3\n"
+        assert list(stream_lines(s, str)) == ["1", "2", "", "3"]
+        assert list(stream_block_lines(s, int)) == [[1, 2], [3]]
+
+
+def test_open_empty(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("")
+    with MappedInput.open(path) as s:
+        assert len(s) == 0
+        assert list(stream_lines(s, str)) == []
+
+
+def test_close_with_views_left(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("1\n")
+    s = MappedInput.open(path)
+    view = memoryview(s)
+    s.close()
+    assert bytes(view) == b"1\n"
+
+
+def test_mapped_input_wraps_str():
+    @mapped_input
+    def solution(s):
+        assert isinstance(s, MappedInput)
+        return sum(stream_lines(s, int))
+
+    assert solution("1\n2\n") == 3
+    assert solution(MappedInput.from_str("3\n")) == 3
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / "day01").mkdir()
+    (tmp_path / "day01" / "__init__.py").touch()
+    (tmp_path / "input.txt").write_text("1\n2\n3\n")
+    importlib.invalidate_caches()
+    yield tmp_path
+    for name in ("day01", "day01.part1", "day01.part2"):
+        sys.modules.pop(name, None)
+
+
+def test_load_solution_maps_input_for_opted_in_solutions(project):
+    (project / "day01" / "part1.py").write_text(
+        """\
+from slh_python import MappedInput, mapped_input, stream_lines
+
+@mapped_input
+def solution(s):
+    assert isinstance(s, MappedInput)
+    return sum(stream_lines(s, int))
+"""
+    )
+    solution = load_solution(DayPart(1, 1))
+    assert solution(project / "input.txt") == 6
+
+
+def test_load_solution_reads_input_by_default(project):
+    (project / "day01" / "part2.py").write_text(
+        """\
+def solution(s):
+    assert isinstance(s, str)
+    return len(s)
+"""
+    )
+    solution = load_solution(DayPart(1, 2))
+    assert solution(project / "input.txt") == 6
@@ -1,10 +1,18 @@
+import array
+import io
+
 import pytest
+from slh_python import parser
 from slh_python.parser import (
     FrozenGrid,
     Point,
+    PointCodec,
     collect_block_lines,
     collect_block_statements,
     collect_lines,
+    stream_block_lines,
+    stream_block_statements,
+    stream_lines,
 )
 
 
@@ -130,6 +138,106 @@ def test_iter_neighbors_no_diagonals():
     assert observed_neighbors == expected_neighbors
 
 
+def _sources(s):
+    yield s
+    yield s.encode()
+    yield memoryview(s.encode())
+    yield array.array("B", s.encode())
+    yield io.StringIO(s)
+    yield io.BytesIO(s.encode())
+
+
+@pytest.mark.parametrize("s", ["1 2\n3 4\n\n5 6\n", "1 2\n3 4\n\n5 6", ""])
+def test_stream_lines_matches_collect_lines(s):
+    def parser(x):
+        return tuple(map(int, x.split()))
+
+    for source in _sources(s):
+        lines = stream_lines(source, parser)
+        assert not isinstance(lines, list)
+        assert list(lines) == collect_lines(s, parser)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5])
+def test_stream_across_chunks(monkeypatch, chunk_size):
+    monkeypatch.setattr(parser, "_CHUNK_SIZE", chunk_size)
+    s = "12\n3\n\n\n456\n7\n\n89"
+    for source in _sources(s):
+        assert list(stream_lines(source, str)) == s.splitlines()
+    for source in _sources(s):
+        assert list(stream_block_lines(source, int)) == [[12, 3], [456, 7], [89]]
+
+
+def test_stream_lines_is_lazy():
+    parsed = []
+    lines = stream_lines("1\n2\n3\n", lambda x: parsed.append(x) or int(x))
+    assert next(lines) == 1
+    assert parsed == ["1"]
+
+
+@pytest.mark.parametrize("s", ["1\n2\n\n3\n", "1\n2\n\n3", "1\n2\n\n\n3\n\n"])
+def test_stream_block_lines(s):
+    for source in _sources(s):
+        assert list(stream_block_lines(source, int)) == [[1, 2], [3]]
+
+
+def test_stream_block_statements():
+    s = "a\nb\n\nc\n"
+    assert list(stream_block_statements(s, str)) == ["a\nb", "c"]
+    for source in _sources(s):
+        assert list(stream_block_statements(source, len)) == [3, 1]
+
+
+def test_codec_encode_decode():
+    codec = PointCodec(4, 3)
+    assert codec.encode(Point(1, 2)) == 9
+    assert codec.decode(9) == Point(1, 2)
+    assert all(codec.encode(codec.decode(i)) == i for i in range(12))
+
+
+def test_codec_offsets():
+    codec = PointCodec(4, 3)
+    i = codec.encode((1, 1))
+    assert [codec.decode(i + o) for o in codec.offsets4] == [
+        (1, 0),
+        (0, 1),
+        (2, 1),
+        (1, 2),
+    ]
+    assert {codec.decode(i + o) for o in codec.offsets8} == set(
+        Point(1, 1).iter_neighbors()
+    )
+
+
+@pytest.mark.parametrize("width, height", [(1, 1), (1, 3), (3, 1), (2, 2), (4, 3)])
+def test_codec_neighbors_match_iter_neighbors(width, height):
+    codec = PointCodec(width, height)
+    assert len(codec.masks) == width * height
+    for i in range(width * height):
+        p = codec.decode(i)
+        for diagonals, neighbors in ((False, codec.neighbors4), (True, codec.neighbors8)):
+            expected = {
+                q for q in p.iter_neighbors(diagonals) if codec.in_bounds(q)
+            }
+            assert {codec.decode(j) for j in neighbors(i)} == expected
+
+
+def test_codec_steps():
+    codec = PointCodec(3, 3)
+    assert codec.steps4(0) == (1, 3)
+    assert codec.steps8(0) == (1, 3, 4)
+    assert codec.steps4(4) == codec.offsets4
+    assert codec.steps8(4) == codec.offsets8
+
+
+def test_grid_codec_and_cells():
+    g = FrozenGrid.from_str("ab\ncd\nef\n")
+    codec = g.codec()
+    assert (codec.width, codec.height) == (2, 3)
+    cells = g.cells()
+    assert cells[codec.encode((1, 2))] == g[1, 2] == "f"
+
+
 def test_is_hashable():
     g = ((1, 2), (3, 4))
     assert len({FrozenGrid(g), FrozenGrid(g)}) == 1
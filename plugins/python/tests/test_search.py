@@ -0,0 +1,218 @@
+import pytest
+from slh_python.grid import Grid
+from slh_python.parser import FrozenGrid
+from slh_python.parser import Point
+from slh_python.search import GridGraph
+from slh_python.search import astar
+from slh_python.search import bfs
+from slh_python.search import bfs01
+from slh_python.search import dijkstra
+
+
+MAZE = """\
+S..#....
+.#.#.##.
+.#...#..
+.####.#.
+......#E
+"""
+
+
+def _line(n):
+    def neighbors(i):
+        return [j for j in (i - 1, i + 1) if 0 <= j < n]
+
+    return neighbors
+
+
+def test_bfs_distances():
+    result = bfs(0, _line(5))
+    assert result.goal is None
+    assert result.distances() == {0: 0, 1: 1, 2: 2, 3: 3, 4: 4}
+    assert result.distance(3) == 3
+    assert 4 in result
+    assert 5 not in result
+
+
+def test_bfs_goal_exits_early():
+    seen = []
+
+    def neighbors(i):
+        seen.append(i)
+        return [i + 1, i + 2]
+
+    result = bfs(0, neighbors, 10)
+    assert result.goal == 10
+    assert result.distance() == 5
+    assert max(seen) < 10
+
+
+def test_bfs_goal_predicate():
+    result = bfs(1, lambda i: [i * 2, i * 3], lambda i: i > 100)
+    assert result.goal > 100
+    assert result.distance() == 5
+
+
+def test_bfs_unreachable_goal():
+    result = bfs(0, _line(3), 7)
+    assert result.goal is None
+    with pytest.raises(ValueError):
+        result.path()
+    with pytest.raises(KeyError):
+        result.distance(7)
+
+
+def test_path():
+    result = bfs(0, _line(5), 4)
+    assert result.path() == [0, 1, 2, 3, 4]
+    assert result.path(2) == [0, 1, 2]
+    assert result.path(0) == [0]
+
+
+def test_all_paths_on_a_square():
+    """
+    0 1
+    2 3
+    """
+    edges = {0: [1, 2], 1: [0, 3], 2: [0, 3], 3: [1, 2]}
+    result = bfs(0, edges.__getitem__, 3, all_paths=True)
+    assert sorted(result.all_paths()) == [[0, 1, 3], [0, 2, 3]]
+    assert result.on_shortest_paths() == {0, 1, 2, 3}
+
+    single = bfs(0, edges.__getitem__, 3)
+    assert len(list(single.all_paths())) == 1
+
+
+def test_states_need_not_be_comparable():
+    start = frozenset({0})
+
+    def neighbors(state):
+        return [state | {len(state)}]
+
+    result = dijkstra(start, lambda s: [(n, 1) for n in neighbors(s)], lambda s: len(s) == 4)
+    assert result.goal == frozenset({0, 1, 2, 3})
+    assert result.distance() == 3
+
+
+def _turning(grid):
+    """
+    States are (position, direction), moving costs 1, turning is free.
+    """
+    graph = GridGraph(grid)
+    directions = (1, graph.width, -1, -graph.width)
+
+    def neighbors(state):
+        i, d = state
+        yield (i, (d + 1) % 4), 0
+        yield (i, (d - 1) % 4), 0
+        j = i + directions[d]
+        if j in graph.neighbors(i):
+            yield (j, d), 1
+
+    return graph, neighbors
+
+
+@pytest.mark.parametrize("search", [bfs01, dijkstra])
+def test_zero_cost_steps(search):
+    grid = FrozenGrid.from_str(MAZE)
+    graph, neighbors = _turning(grid)
+    end = graph.index(grid.find("E"))
+    result = search((0, 0), neighbors, lambda s: s[0] == end, all_paths=True)
+    assert result.distance() == 15
+    assert bfs(0, graph.neighbors, end).distance() == 15
+    paths = list(result.all_paths())
+    assert paths
+    assert all(path[-1] == result.goal for path in paths)
+
+
+@pytest.mark.parametrize("search", [bfs01, dijkstra])
+def test_on_shortest_paths_matches_all_paths(search):
+    grid = FrozenGrid.from_str(MAZE)
+    graph, neighbors = _turning(grid)
+    end = graph.index(grid.find("E"))
+    result = search((0, 0), neighbors, lambda s: s[0] == end, all_paths=True)
+    on_paths = {state for path in result.all_paths() for state in path}
+    assert result.on_shortest_paths() == on_paths
+
+
+@pytest.mark.parametrize("search", [bfs01, dijkstra])
+def test_on_shortest_paths_skips_free_loops(search):
+    # "c" can only be reached from "a" and back for free, no path visits it
+    edges = {"s": [("a", 1)], "a": [("c", 0), ("g", 1)], "c": [("a", 0)], "g": []}
+    result = search("s", edges.__getitem__, "g", all_paths=True)
+    assert list(result.all_paths()) == [["s", "a", "g"]]
+    assert result.on_shortest_paths() == {"s", "a", "g"}
+
+
+def test_bfs01_matches_dijkstra():
+    grid = FrozenGrid.from_str(MAZE)
+    _, neighbors = _turning(grid)
+    assert bfs01((0, 0), neighbors).distances() == dijkstra((0, 0), neighbors).distances()
+
+
+def test_grid_graph_bfs():
+    grid = FrozenGrid.from_str(MAZE)
+    graph = GridGraph(grid)
+    start = graph.index(grid.find("S"))
+    end = graph.index(grid.find("E"))
+    result = bfs(start, graph.neighbors, end)
+    assert result.distance() == 15
+    path = [graph.point(i) for i in result.path()]
+    assert path[0] == Point(0, 0)
+    assert path[-1] == Point(7, 4)
+    assert all(a.is_adjacent_to(b) for a, b in zip(path, path[1:]))
+    assert all(grid[p] != "#" for p in path)
+
+
+def test_grid_graph_all_shortest_paths():
+    grid = Grid.from_str("....\n.#..\n....\n")
+    graph = GridGraph(grid)
+    result = bfs(0, graph.neighbors, graph.index((3, 2)), all_paths=True)
+    assert result.distance() == 5
+    assert len(list(result.all_paths())) == 4
+    on_paths = {graph.point(i) for i in result.on_shortest_paths()}
+    assert Point(1, 1) not in on_paths
+    assert len(on_paths) == 11
+
+
+def test_grid_graph_diagonals():
+    grid = FrozenGrid.from_str("...\n...\n...\n")
+    assert bfs(0, GridGraph(grid).neighbors, 8).distance() == 4
+    assert bfs(0, GridGraph(grid, diagonals=True).neighbors, 8).distance() == 2
+    assert sorted(GridGraph(grid, diagonals=True).neighbors(4)) == [0, 1, 2, 3, 5, 6, 7, 8]
+    assert sorted(GridGraph(grid).neighbors(3)) == [0, 4, 6]
+
+
+def test_grid_graph_costs():
+    grid = FrozenGrid.from_str("1163\n1381\n2136\n", int)
+    graph = GridGraph(grid, lambda _: True, lambda c: c)
+    end = graph.index((3, 2))
+    result = dijkstra(0, graph.weighted, end)
+    assert result.distance() == 13
+    assert [graph.point(i) for i in result.path()] == [
+        Point(0, 0),
+        Point(0, 1),
+        Point(0, 2),
+        Point(1, 2),
+        Point(2, 2),
+        Point(3, 2),
+    ]
+
+
+def test_astar_matches_dijkstra():
+    grid = FrozenGrid.from_str(MAZE)
+    graph = GridGraph(grid)
+    end = graph.index(grid.find("E"))
+    expected = dijkstra(0, graph.weighted, end)
+    result = astar(0, graph.weighted, end, graph.manhattan(end))
+    assert result.distance() == expected.distance() == 15
+    assert len(result.distances()) <= len(expected.distances())
+
+
+def test_astar_all_paths_matches_bfs():
+    grid = Grid.from_str("....\n.#..\n....\n")
+    graph = GridGraph(grid)
+    end = graph.index((3, 2))
+    result = astar(0, graph.weighted, end, graph.manhattan(end), all_paths=True)
+    expected = bfs(0, graph.neighbors, end, all_paths=True)
+    assert sorted(result.all_paths()) == sorted(expected.all_paths())
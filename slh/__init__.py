@@ -1,16 +1,24 @@
-from . import next
-from . import run
-from . import submit
+import importlib
+from types import ModuleType
+from typing import TYPE_CHECKING
+
 from ._daypart import DayPart
 from ._plugins import Plugin
 from ._plugins import Solution
 from ._random_shit import HandledError
 from ._random_shit import get_rootdir
 
+if TYPE_CHECKING:
+    from . import next
+    from . import run
+    from . import serve
+    from . import submit
+
 
 __all__ = [
     "next",
     "run",
+    "serve",
     "submit",
     "DayPart",
     "HandledError",
@@ -18,3 +26,13 @@ __all__ = [
     "Solution",
     "get_rootdir",
 ]
+
+
+# command modules are heavy to import, only import them when accessed
+_LAZY_SUBMODULES = ("next", "run", "serve", "submit")
+
+
+def __getattr__(name: str) -> ModuleType:
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,3 +1,4 @@
+import importlib
 from argparse import ArgumentParser
 from collections.abc import Callable
 from dataclasses import dataclass
@@ -10,13 +11,38 @@ class Command:
     fill_parser: Callable[[ArgumentParser], None]
 
 
+@dataclass(frozen=True)
+class CommandStub:
+    """
+    A command whose module, which registers the actual command,
+    is only imported once the command is selected.
+    """
+
+    name: str
+    module: str
+
+    def load(self) -> Command:
+        importlib.import_module(self.module)
+        for cmd in _commands:
+            if cmd.name == self.name:
+                return cmd
+        raise AssertionError(f"{self.module} did not register {self.name!r}")
+
+
 _commands: list[Command] = []
 
+_command_stubs = [
+    CommandStub("next", "slh.next"),
+    CommandStub("run", "slh.run"),
+    CommandStub("serve", "slh.serve"),
+    CommandStub("submit", "slh.submit"),
+]
+
 
 def register_command(cmd: Command) -> None:
     assert cmd.name not in (c.name for c in _commands)
     _commands.append(cmd)
 
 
-def get_commands() -> list[Command]:
-    return _commands.copy()
+def get_command_stubs() -> list[CommandStub]:
+    return _command_stubs.copy()
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import time
+from collections.abc import Iterable
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from functools import lru_cache
+from pathlib import Path
+
+from ._daypart import DayPart
+from ._random_shit import get_rootdir
+from ._random_shit import HandledError
+from ._random_shit import read_git_head
+from ._stats import summarize
+
+
+__all__ = [
+    "Entry",
+    "Comparison",
+    "history_file",
+    "append_entry",
+    "load_entries",
+    "compare_to_baseline",
+    "get_commit",
+]
+
+
+_HISTORY_FILE_NAME = ".slh-history.jsonl"
+
+# number of most recent entries the baseline is computed from
+_BASELINE_WINDOW = 5
+
+# like `git rev-parse --short` in all but the largest repos
+_SHORT_HASH_LENGTH = 7
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Entry:
+    """
+    A single recorded execution of a daypart's solution.
+    """
+
+    day: int
+    part: int
+    language: str
+    commit: str | None
+    samples: tuple[int, ...]
+    peak_memory: int | None = None
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def daypart(self) -> DayPart:
+        return DayPart(self.day, self.part)
+
+    @property
+    def duration(self) -> float:
+        """
+        Median duration in ns, outliers excluded.
+        """
+        return summarize(self.samples).median
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, s: str) -> Entry:
+        data = json.loads(s)
+        data["samples"] = tuple(data["samples"])
+        return cls(**data)
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    baseline: float
+    latest: float
+
+    @property
+    def change(self) -> float:
+        """
+        Relative change of the latest duration, e.g. 0.1 is 10% slower.
+        """
+        return self.latest / self.baseline - 1 if self.baseline else 0.0
+
+    def regressed(self, threshold: float) -> bool:
+        return self.change > threshold
+
+
+def history_file() -> Path:
+    return get_rootdir() / _HISTORY_FILE_NAME
+
+
+def append_entry(entry: Entry) -> None:
+    with open(history_file(), "a") as f:
+        f.write(f"{entry.to_json()}\n")
+
+
+def load_entries(
+    dayparts: Iterable[DayPart] | None = None,
+    language: str | None = None,
+) -> list[Entry]:
+    """
+    Read recorded entries, oldest first, optionally
+    filtered by daypart and language.
+    """
+    wanted = None if dayparts is None else set(dayparts)
+
+    try:
+        lines = history_file().read_text().splitlines()
+    except FileNotFoundError:
+        return []
+
+    entries = []
+    for lineno, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            entry = Entry.from_json(line)
+        except (ValueError, TypeError, KeyError) as err:
+            raise HandledError(
+                f"{history_file()}:{lineno} contains an invalid entry"
+            ) from err
+
+        if wanted is not None and entry.daypart not in wanted:
+            continue
+        if language is not None and entry.language != language:
+            continue
+        entries.append(entry)
+
+    return entries
+
+
+def compare_to_baseline(latest: Entry, previous: list[Entry]) -> Comparison | None:
+    """
+    Compare the latest entry against the baseline, the median duration
+    of the most recent matching entries. Returns None if there is no
+    recorded baseline yet.
+    """
+    matching = [
+        e
+        for e in previous
+        if e.daypart == latest.daypart and e.language == latest.language
+    ]
+    if not matching:
+        return None
+
+    recent = matching[-_BASELINE_WINDOW:]
+    baseline = statistics.median(e.duration for e in recent)
+    return Comparison(baseline, latest.duration)
+
+
+@lru_cache(maxsize=1)
+def get_commit() -> str | None:
+    """
+    Short hash of the checked out commit, None outside of a git repo.
+    """
+    if commit := read_git_head(get_rootdir()):
+        return commit[:_SHORT_HASH_LENGTH]
+
+    # e.g. $GIT_DIR is set, let git decide, abbreviated the same way
+    # rather than by core.abbrev so that commits are recorded consistently
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=get_rootdir(),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        return None
+    return result.stdout.strip()[:_SHORT_HASH_LENGTH]
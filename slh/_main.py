@@ -1,14 +1,16 @@
 import inspect
+import sys
 from argparse import _SubParsersAction
 from argparse import ArgumentParser
 from collections.abc import Callable
 from collections.abc import Sequence
 
 from ._commands import Command
-from ._commands import get_commands
+from ._commands import get_command_stubs
 
 
 def main(argv: Sequence[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
     parser = ArgumentParser(
         prog="slh",
         description="Santa's Little Helper (slh): scripts for Advent of Code (https://adventofcode.com).",
@@ -18,8 +20,14 @@ def main(argv: Sequence[str] | None = None) -> int:
         required=True,
     )
 
-    for command in get_commands():
-        _add_command_parser(subparsers, command)
+    # only the selected command is imported, the
+    # others just need to be known to the parser
+    selected = next((arg for arg in argv if not arg.startswith("-")), None)
+    for stub in get_command_stubs():
+        if stub.name == selected:
+            _add_command_parser(subparsers, stub.load())
+        else:
+            subparsers.add_parser(stub.name)
 
     args, unknown_args = parser.parse_known_args(argv)
     args.unknown_args = unknown_args
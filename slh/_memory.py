@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import resource
+import sys
+import tracemalloc
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from types import CodeType
+
+
+__all__ = [
+    "Allocation",
+    "MemoryUsage",
+    "peak_rss",
+    "reset_peak_rss",
+    "trace_allocations",
+    "AllocationTracer",
+]
+
+
+# frames below this depth are not needed to attribute an allocation to a line
+_TRACEBACK_DEPTH = 1
+
+_IGNORED_FILES = (
+    tracemalloc.__file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Allocation:
+    site: str
+    size: int
+    count: int
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryUsage:
+    peak_rss: int
+    """
+    Peak resident set size, in bytes, of the solution: of the process(es)
+    it runs, or how much the process running it in-process grew.
+    """
+    traced_peak: int | None = None
+    """
+    Peak memory, in bytes, allocated by python code while solving.
+    """
+    top_allocations: list[Allocation] = field(default_factory=list)
+    """
+    Largest allocation sites still alive when the solution returned.
+    """
+
+
+def reset_peak_rss() -> int:
+    """
+    Start measuring the peak resident set size of this process from
+    now on, returning the baseline to pass to `peak_rss`. A forked
+    process would otherwise report the memory of its parent.
+    """
+    try:
+        # linux resets the high-water mark to the current size
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        # elsewhere growth is measured over the peak so far instead
+        pass
+    return _maxrss(resource.RUSAGE_SELF)
+
+
+def peak_rss(baseline: int = 0) -> int:
+    """
+    Peak resident set size, in bytes, of the largest child process that
+    has been waited on, or how much this process grew over the baseline
+    (see `reset_peak_rss`), whichever is larger. Linux counts what a
+    child used before it exec'd too, i.e. the size of its parent then,
+    see `measure_peak_rss` of the plugins for executables.
+    """
+    return max(
+        _maxrss(resource.RUSAGE_SELF) - baseline,
+        _maxrss(resource.RUSAGE_CHILDREN),
+    )
+
+
+class AllocationTracer:
+    """
+    Snapshots traced allocations whenever the traced function returns,
+    while its locals are still alive, keeping the largest snapshot.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._largest = -1
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self.traced_peak = 0
+
+    def on_return(self, code: CodeType, offset: int, retval: object) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self._largest:
+            self._largest = current
+            self._snapshot = tracemalloc.take_snapshot()
+
+    def top_allocations(self, root: Path | None = None) -> list[Allocation]:
+        """
+        Largest allocation sites of the snapshot, only those in files
+        under root if provided, e.g. not the harness reading the input.
+        """
+        if self._snapshot is None:
+            return []
+
+        filters = [tracemalloc.Filter(False, f) for f in _IGNORED_FILES]
+        if root is not None:
+            filters.append(tracemalloc.Filter(True, str(root / "*")))
+        snapshot = self._snapshot.filter_traces(filters)
+        return [
+            Allocation(_format_site(stat.traceback[0], root), stat.size, stat.count)
+            for stat in snapshot.statistics("lineno")[: self._limit]
+        ]
+
+
+@contextmanager
+def trace_allocations(
+    func: Callable[..., object],
+    limit: int = 5,
+) -> Iterator[AllocationTracer]:
+    """
+    Trace python allocations while the context is active, snapshots are
+    taken each time `func` returns (see AllocationTracer).
+    """
+    code = getattr(func, "__code__", None)
+    if not isinstance(code, CodeType):
+        raise TypeError(f"can only trace python functions, provided: {func!r}")
+
+    monitoring = sys.monitoring
+    tool_id = _free_tool_id()
+    tracer = AllocationTracer(limit)
+
+    monitoring.use_tool_id(tool_id, "slh")
+    monitoring.register_callback(
+        tool_id, monitoring.events.PY_RETURN, tracer.on_return
+    )
+    monitoring.set_local_events(tool_id, code, monitoring.events.PY_RETURN)
+    tracemalloc.start(_TRACEBACK_DEPTH)
+    try:
+        yield tracer
+    finally:
+        _, tracer.traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        monitoring.set_local_events(tool_id, code, 0)
+        monitoring.register_callback(tool_id, monitoring.events.PY_RETURN, None)
+        monitoring.free_tool_id(tool_id)
+
+
+def _maxrss(who: int) -> int:
+    peak = resource.getrusage(who).ru_maxrss
+    # linux reports kilobytes, macos bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _free_tool_id() -> int:
+    # 0-5 are assigned by convention (debugger, coverage, profiler, ...)
+    # prefer the ids which aren't, falling back to whatever is available
+    for tool_id in (3, 4, *range(6)):
+        if sys.monitoring.get_tool(tool_id) is None:
+            return tool_id
+    raise RuntimeError("no sys.monitoring tool ids are available")
+
+
+def _format_site(frame: tracemalloc.Frame, root: Path | None) -> str:
+    filename = Path(frame.filename)
+    if root is not None and filename.is_relative_to(root):
+        filename = filename.relative_to(root)
+    return f"{filename}:{frame.lineno}"
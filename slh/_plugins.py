@@ -1,6 +1,9 @@
+import importlib
+import json
+import os
+import sys
 from collections.abc import Callable
 from functools import lru_cache
-from importlib.metadata import entry_points
 from pathlib import Path
 from typing import Protocol
 
@@ -11,10 +14,38 @@ from ._user_config import user_config
 
 _GROUP_NAME = "slh"
 
+# maps languages to the entry points of the plugins providing them,
+# bump the version whenever the cache layout changes
+_CACHE_FILE_NAME = "plugins.json"
+_CACHE_VERSION = 1
+
+# directories of distribution metadata, declaring the entry points
+_METADATA_SUFFIXES = (".dist-info", ".egg-info")
+
 type Solution = Callable[[Path], int]
 
 
 class Plugin(Protocol):
+    """
+    Plugins may also provide optional capabilities, looked up with getattr:
+
+      - build_solutions(dayparts: list[DayPart]) -> int
+        Build the solutions of the dayparts ahead of time, all at once,
+        returning how many had to be (re)built.
+      - sample_solution(dp: DayPart, inputfile: Path, /) -> Mapping[str, int] | None
+        Collapsed stacks from natively sampling the solution, or None
+        if that isn't possible (see `slh run --profile`).
+      - time_solution(dp: DayPart, inputfile: Path, count: int, /)
+            -> tuple[int, list[int]] | None
+        Call the solution `count` times in a native timing loop, returning
+        the answer and each call's duration in ns, or None to be timed
+        from python instead.
+      - measure_peak_rss(dp: DayPart, inputfile: Path, /) -> int | None
+        Peak resident set size, in bytes, of a process solving once as
+        measured by that process, or None to measure the supervised
+        process and its children instead (see `slh run --memory`).
+    """
+
     LANGUAGE: str
     """
     Programming language used, e.g. "python", "c".
@@ -58,16 +89,10 @@ class Plugin(Protocol):
 @lru_cache(maxsize=1)
 def plugin() -> Plugin:
     target_language = user_config().language.lower()
-    plugins = _fetch_plugins()
-    candidates = [
-        plugin
-        for plugin in plugins
-        if plugin.LANGUAGE.lower() == target_language
-    ]
+    candidates, available_languages = _find_plugins(target_language)
 
     match len(candidates):
         case 0:
-            available_languages = {p.LANGUAGE.lower() for p in plugins}
             raise HandledError(
                 f"target language {target_language!r} is not in list of"
                 f" available languages: {available_languages}"
@@ -85,5 +110,98 @@ def plugin() -> Plugin:
             )
 
 
-def _fetch_plugins() -> list[Plugin]:
-    return [ep.load() for ep in entry_points(group=_GROUP_NAME)]
+def _find_plugins(language: str) -> tuple[list[Plugin], set[str]]:
+    """
+    Returns the plugins for the language and all available languages.
+    Only the plugins for the language are imported if the languages of
+    the installed plugins are cached, otherwise all plugins are imported
+    and the cache is refreshed.
+    """
+    fingerprint = _fingerprint()
+    cached = _read_cache(fingerprint)
+    if cached and cached.get(language):
+        try:
+            plugins = [_load_entry_point(value) for value in cached[language]]
+        except ImportError:
+            pass
+        else:
+            if all(p.LANGUAGE.lower() == language for p in plugins):
+                return plugins, set(cached)
+
+    languages: dict[str, list[str]] = {}
+    candidates = []
+    for value, candidate in _fetch_plugins():
+        candidate_language = candidate.LANGUAGE.lower()
+        languages.setdefault(candidate_language, []).append(value)
+        if candidate_language == language:
+            candidates.append(candidate)
+
+    _write_cache(fingerprint, languages)
+    return candidates, set(languages)
+
+
+def _fetch_plugins() -> list[tuple[str, Plugin]]:
+    # importlib.metadata is slow to import, only needed on a cache miss
+    from importlib.metadata import entry_points
+
+    return [(ep.value, ep.load()) for ep in entry_points(group=_GROUP_NAME)]
+
+
+def _load_entry_point(value: str) -> Plugin:
+    """
+    Load an entry point by its value, e.g. "module" or "module:attr".
+    """
+    module, _, attrs = value.partition(":")
+    obj = importlib.import_module(module.strip())
+    for attr in filter(None, attrs.strip().split(".")):
+        obj = getattr(obj, attr)
+    return obj  # type: ignore[return-value]
+
+
+def _cache_file() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "slh" / _CACHE_FILE_NAME
+
+
+def _fingerprint() -> list[object]:
+    """
+    Installing or removing a distribution changes the mtime of the
+    directory holding its metadata, i.e. one of the sys.path entries.
+    Entries without any metadata, e.g. the current directory, are left
+    out, files coming and going there don't affect the plugins.
+    """
+    fingerprint: list[object] = [_CACHE_VERSION, sys.prefix]
+    for entry in sys.path:
+        try:
+            with os.scandir(entry or ".") as it:
+                if not any(e.name.endswith(_METADATA_SUFFIXES) for e in it):
+                    continue
+            fingerprint.append([entry, os.stat(entry or ".").st_mtime_ns])
+        except OSError:
+            continue
+    return fingerprint
+
+
+def _read_cache(fingerprint: list[object]) -> dict[str, list[str]] | None:
+    try:
+        data = json.loads(_cache_file().read_text())
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+        return None
+    return data.get("languages")
+
+
+def _write_cache(fingerprint: list[object], languages: dict[str, list[str]]) -> None:
+    cache_file = _cache_file()
+    data = {"fingerprint": fingerprint, "languages": languages}
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # write then rename, concurrent invocations never see a partial file
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data))
+        tmp.replace(cache_file)
+    except OSError:
+        # caching is only an optimization
+        pass
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from collections.abc import Mapping
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+from types import CodeType
+from types import FrameType
+
+
+__all__ = [
+    "Profiler",
+    "HotFunction",
+    "Profile",
+    "profile_solution",
+    "profile_from_stacks",
+]
+
+
+# number of hot functions reported
+_TOP = 5
+
+# sampling interval, and how long a solution is repeatedly
+# called for so that fast solutions still collect enough samples
+_SAMPLE_INTERVAL = 0.001
+_MIN_SAMPLING_DURATION = 0.25
+
+
+class Profiler(StrEnum):
+    CPROFILE = "cprofile"
+    SAMPLING = "sampling"
+
+
+@dataclass(frozen=True, slots=True)
+class HotFunction:
+    name: str
+    own: float
+    """
+    Fraction of the profile spent in the function itself.
+    """
+    total: float
+    """
+    Fraction of the profile spent in the function, including its callees.
+    """
+
+
+@dataclass(frozen=True, slots=True)
+class Profile:
+    path: Path
+    """
+    Written profile, pstats or collapsed stacks (one `a;b;c count` per line).
+    """
+    hot_functions: list[HotFunction]
+    samples: int | None = None
+
+
+def profile_solution(
+    solution: Callable[[Path], object],
+    inputfile: Path,
+    profiler: Profiler,
+    stem: Path,
+    root: Path | None = None,
+) -> Profile:
+    """
+    Profile the solution, writing the profile next to `stem` with a
+    suffix matching the profiler. Function names are made relative to
+    `root` where possible.
+    """
+    match profiler:
+        case Profiler.CPROFILE:
+            return _profile_deterministic(solution, inputfile, stem, root)
+        case Profiler.SAMPLING:
+            stacks = _sample_stacks(solution, inputfile, root)
+            return profile_from_stacks(stacks, stem)
+        case _:
+            raise AssertionError(f"Should never happen: {profiler}")
+
+
+def profile_from_stacks(stacks: Mapping[str, int], stem: Path) -> Profile:
+    """
+    Write collapsed stacks, semicolon separated frames from the
+    outermost to the innermost, to `stem.collapsed` (the format
+    flamegraph tools expect) and summarize the hot functions.
+    """
+    path = stem.with_suffix(".collapsed")
+    path.write_text(
+        "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+    )
+
+    nsamples = sum(stacks.values())
+    own: Counter[str] = Counter()
+    total: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+
+    hot = [
+        HotFunction(name, count / nsamples, total[name] / nsamples)
+        for name, count in own.most_common(_TOP)
+    ]
+    return Profile(path, hot, nsamples)
+
+
+def _profile_deterministic(
+    solution: Callable[[Path], object],
+    inputfile: Path,
+    stem: Path,
+    root: Path | None,
+) -> Profile:
+    profile = cProfile.Profile()
+    profile.runcall(solution, inputfile)
+
+    path = stem.with_suffix(".pstats")
+    profile.dump_stats(path)
+
+    stats = pstats.Stats(profile)
+    total_tt = stats.total_tt or 1  # type: ignore[attr-defined]
+    entries = sorted(
+        stats.stats.items(),  # type: ignore[attr-defined]
+        key=lambda item: item[1][2],
+        reverse=True,
+    )
+    hot = [
+        HotFunction(
+            _format_function(filename, lineno, funcname, root),
+            tt / total_tt,
+            ct / total_tt,
+        )
+        for (filename, lineno, funcname), (_, _, tt, ct, _) in entries[:_TOP]
+    ]
+    return Profile(path, hot)
+
+
+def _sample_stacks(
+    solution: Callable[[Path], object],
+    inputfile: Path,
+    root: Path | None,
+) -> Counter[str]:
+    stacks: Counter[str] = Counter()
+    target = threading.get_ident()
+    done = threading.Event()
+
+    def sample() -> None:
+        while not done.wait(_SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(target)
+            if frame is not None and (stack := _collapse(frame, root)):
+                stacks[stack] += 1
+
+    # the sampler can only run once the solution gives up the gil
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(_SAMPLE_INTERVAL)
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        _call_repeatedly(solution, inputfile)
+    finally:
+        done.set()
+        sampler.join()
+        sys.setswitchinterval(switch_interval)
+
+    return stacks
+
+
+def _call_repeatedly(solution: Callable[[Path], object], inputfile: Path) -> None:
+    deadline = time.monotonic() + _MIN_SAMPLING_DURATION
+    while True:
+        solution(inputfile)
+        if time.monotonic() >= deadline:
+            break
+
+
+def _collapse(frame: FrameType, root: Path | None) -> str:
+    """
+    Frames below `_call_repeatedly`, outermost first, or an
+    empty string if the solution isn't being called.
+    """
+    frames: list[str] = []
+    current: FrameType | None = frame
+    while current is not None:
+        code = current.f_code
+        if code is _call_repeatedly.__code__:
+            return ";".join(reversed(frames))
+        frames.append(_format_code(code, root))
+        current = current.f_back
+    return ""
+
+
+def _format_code(code: CodeType, root: Path | None) -> str:
+    return _format_function(
+        code.co_filename, code.co_firstlineno, code.co_qualname, root
+    )
+
+
+def _format_function(
+    filename: str, lineno: int, funcname: str, root: Path | None
+) -> str:
+    if filename == "~":
+        # builtins, e.g. "<built-in method builtins.sorted>"
+        return funcname
+
+    path = Path(filename)
+    if root is not None and path.is_relative_to(root):
+        path = path.relative_to(root)
+    return f"{funcname} ({path}:{lineno})"
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import os
 import subprocess
 import sys
 from enum import Enum
@@ -14,8 +15,118 @@ THIS_DIR = Path(__file__).resolve().parent
 class HandledError(RuntimeError): ...
 
 
+# overrides the project root, also how it is handed down to child processes
+_ROOTDIR_ENV = "SLH_ROOTDIR"
+
+# symbolic refs may point at other symbolic refs, but not forever
+_MAX_SYMREF_DEPTH = 5
+
+
 @lru_cache(maxsize=1)
 def get_rootdir() -> Path:
+    """
+    Returns $SLH_ROOTDIR if set, otherwise the top level of the git work
+    tree containing the current directory. The result is exported as
+    $SLH_ROOTDIR so that child processes needn't resolve it again.
+    """
+    if rootdir := os.environ.get(_ROOTDIR_ENV):
+        return Path(rootdir)
+
+    toplevel = _find_git_toplevel(Path.cwd()) or _git_toplevel()
+    os.environ[_ROOTDIR_ENV] = str(toplevel)
+    return toplevel
+
+
+def _find_git_toplevel(start: Path) -> Path | None:
+    """
+    Walk up from start looking for .git, either the git directory or, for
+    worktrees and submodules, a file pointing at it ("gitdir: <path>").
+    Returns None whenever git itself should decide.
+    """
+    if "GIT_DIR" in os.environ or "GIT_WORK_TREE" in os.environ:
+        return None
+
+    for directory in (start, *start.parents):
+        dotgit = directory / ".git"
+        if dotgit.is_dir():
+            return directory if (dotgit / "HEAD").is_file() else None
+        if dotgit.is_file():
+            return directory if _is_valid_gitfile(dotgit) else None
+    return None
+
+
+def _is_valid_gitfile(gitfile: Path) -> bool:
+    gitdir = _read_gitfile(gitfile)
+    return gitdir is not None and (gitdir / "HEAD").is_file()
+
+
+def _read_gitfile(gitfile: Path) -> Path | None:
+    try:
+        content = gitfile.read_text().strip()
+    except OSError:
+        return None
+
+    if not content.startswith("gitdir:"):
+        return None
+    return gitfile.parent / content.removeprefix("gitdir:").strip()
+
+
+def read_git_head(start: Path) -> str | None:
+    """
+    Hash of the commit checked out in the work tree containing start, read
+    from its git directory (loose refs, then packed-refs) without running
+    git. Returns None whenever git itself should decide, e.g. with
+    $GIT_DIR, on an unborn branch or for a reftable repository.
+    """
+    toplevel = _find_git_toplevel(start)
+    if toplevel is None:
+        return None
+    dotgit = toplevel / ".git"
+    gitdir = dotgit if dotgit.is_dir() else _read_gitfile(dotgit)
+    if gitdir is None:
+        return None
+
+    # worktrees have a HEAD of their own, but share the refs
+    try:
+        commondir = gitdir / (gitdir / "commondir").read_text().strip()
+    except OSError:
+        commondir = gitdir
+
+    ref: str | None = "ref: HEAD"
+    for _ in range(_MAX_SYMREF_DEPTH):
+        if ref is None or not ref.startswith("ref:"):
+            break
+        ref = _read_ref(gitdir, commondir, ref.removeprefix("ref:").strip())
+
+    if ref is None or len(ref) not in (40, 64) or not _is_hex(ref):
+        return None
+    return ref
+
+
+def _read_ref(gitdir: Path, commondir: Path, name: str) -> str | None:
+    for directory in (gitdir, commondir):
+        try:
+            return (directory / name).read_text().strip()
+        except OSError:
+            pass
+
+    try:
+        packed = (commondir / "packed-refs").read_text()
+    except OSError:
+        return None
+    for line in packed.splitlines():
+        # "<hash> <name>", besides comments and peeled tags ("^<hash>")
+        commit, _, packed_name = line.partition(" ")
+        if packed_name == name:
+            return commit
+    return None
+
+
+def _is_hex(s: str) -> bool:
+    return all(c in "0123456789abcdef" for c in s)
+
+
+def _git_toplevel() -> Path:
     result = subprocess.run(
         ["git", "rev-parse", "--show-toplevel"],
         check=True,
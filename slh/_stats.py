@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import math
+import statistics
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+
+__all__ = [
+    "Summary",
+    "summarize",
+    "reject_outliers",
+    "percentile",
+]
+
+
+# two-sided 95% student's t critical values indexed by degrees of freedom,
+# past the end of the table the normal approximation is close enough
+_T_TABLE_95 = (
+    math.inf,
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+_Z_95 = 1.960
+
+# samples beyond this many interquartile ranges from the
+# quartiles are considered outliers (tukey's fences)
+_TUKEY_K = 1.5
+
+
+@dataclass(frozen=True, slots=True)
+class Summary:
+    """
+    Descriptive statistics of a set of duration samples (in ns).
+    """
+
+    samples: tuple[int, ...]
+    outliers: int = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.samples)
+
+    @property
+    def min(self) -> int:
+        return min(self.samples)
+
+    @property
+    def max(self) -> int:
+        return max(self.samples)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def stddev(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return statistics.stdev(self.samples)
+
+    @property
+    def p95(self) -> float:
+        return percentile(self.samples, 95)
+
+    def ci_halfwidth(self) -> float:
+        """
+        Half width of the 95% confidence interval of the mean.
+        """
+        if self.count < 2:
+            return math.inf
+        df = self.count - 1
+        t = _T_TABLE_95[df] if df < len(_T_TABLE_95) else _Z_95
+        return t * self.stddev / math.sqrt(self.count)
+
+    def relative_ci_halfwidth(self) -> float:
+        """
+        Half width of the 95% confidence interval relative to the mean,
+        e.g. 0.05 means the mean is known to within ±5%.
+        """
+        mean = self.mean
+        if mean == 0:
+            return 0.0 if self.ci_halfwidth() == 0 else math.inf
+        return self.ci_halfwidth() / mean
+
+
+def summarize(samples: Sequence[int], *, outliers: bool = True) -> Summary:
+    """
+    Summarize duration samples, by default dropping outliers first.
+    """
+    if not samples:
+        raise ValueError("cannot summarize an empty set of samples")
+
+    if not outliers:
+        return Summary(tuple(samples))
+
+    kept, rejected = reject_outliers(samples)
+    return Summary(tuple(kept), len(rejected))
+
+
+def reject_outliers(samples: Sequence[int]) -> tuple[list[int], list[int]]:
+    """
+    Partition samples into (kept, rejected) using tukey's fences.
+    Fewer than four samples are never rejected, there is not
+    enough data to tell noise from signal.
+    """
+    if len(samples) < 4:
+        return list(samples), []
+
+    q1, _, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+    iqr = q3 - q1
+    lo = q1 - _TUKEY_K * iqr
+    hi = q3 + _TUKEY_K * iqr
+
+    kept: list[int] = []
+    rejected: list[int] = []
+    for sample in samples:
+        (kept if lo <= sample <= hi else rejected).append(sample)
+    return kept, rejected
+
+
+def percentile(samples: Sequence[int], pct: int) -> float:
+    """
+    Linearly interpolated percentile, `pct` in the range [0, 100].
+    """
+    if not 0 <= pct <= 100:
+        raise ValueError(f"percentile must be within [0, 100], provided: {pct}")
+
+    ordered = sorted(samples)
+    pos = (len(ordered) - 1) * pct / 100
+    lo = math.floor(pos)
+    hi = math.ceil(pos)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import resource
+import signal
+import subprocess
+import time
+from collections.abc import Callable
+from ctypes import c_ulonglong
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+
+from ._memory import peak_rss
+from ._memory import reset_peak_rss
+
+
+__all__ = [
+    "Limits",
+    "Supervisor",
+    "LimitExceeded",
+    "TimeLimitExceeded",
+    "MemoryLimitExceeded",
+    "run_supervised",
+]
+
+
+# how often the supervising process checks in on the child
+_POLL_INTERVAL = 0.01
+
+# how subprocesses (e.g. a c executable) die when an allocation fails
+_ALLOCATION_FAILURE_SIGNALS = (signal.SIGKILL, signal.SIGSEGV, signal.SIGABRT)
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Limits:
+    timeout: float | None = None
+    """
+    Wall-clock seconds a single run may take.
+    """
+    max_memory: int | None = None
+    """
+    Maximum address space, in bytes, of the process(es) doing the work.
+    """
+
+    def __post_init__(self) -> None:
+        if self.timeout is not None and self.timeout <= 0:
+            raise ValueError(
+                f"timeout must be positive, provided: {self.timeout}"
+            )
+        if self.max_memory is not None and self.max_memory <= 0:
+            raise ValueError(
+                f"max_memory must be positive, provided: {self.max_memory}"
+            )
+
+
+class LimitExceeded(Exception): ...
+
+
+class TimeLimitExceeded(LimitExceeded):
+    def __init__(self, timeout: float) -> None:
+        super().__init__(f"time limit of {timeout} s exceeded")
+        self.timeout = timeout
+
+
+class MemoryLimitExceeded(LimitExceeded):
+    def __init__(self, max_memory: int) -> None:
+        super().__init__(f"memory limit of {max_memory} bytes exceeded")
+        self.max_memory = max_memory
+
+
+class Supervisor:
+    """
+    Handed to the supervised target in the child process. Limits only
+    apply once armed, so that setup (e.g. building) isn't limited, and
+    the timeout restarts on every tick. Memory is measured from arming
+    on as well.
+    """
+
+    def __init__(self, ticks: c_ulonglong, limits: Limits) -> None:
+        self._ticks = ticks
+        self._limits = limits
+        self._rss_baseline: int | None = None
+
+    def arm(self) -> None:
+        self._rss_baseline = reset_peak_rss()
+        if self._limits.max_memory is not None:
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            soft = self._limits.max_memory
+            if hard != resource.RLIM_INFINITY:
+                soft = min(soft, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+    def tick(self) -> None:
+        self._ticks.value += 1
+
+    def peak_rss(self) -> int:
+        """
+        Peak resident set size, in bytes, of the work since arming, see
+        `peak_rss` of the _memory module. 0 until armed.
+        """
+        if self._rss_baseline is None:
+            return 0
+        return peak_rss(self._rss_baseline)
+
+
+def run_supervised[R](
+    target: Callable[..., R],
+    *args: object,
+    limits: Limits,
+) -> R:
+    """
+    Call `target(supervisor, *args)` in a forked child process and return
+    its result. The target and args are inherited rather than pickled, so
+    e.g. closures are fine. Raises a LimitExceeded error if the child runs
+    out of time or memory, errors raised by target are re-raised.
+    """
+    ctx = multiprocessing.get_context("fork")
+    recv_conn, send_conn = ctx.Pipe(duplex=False)
+    ticks = ctx.Value("Q", 0, lock=False)
+
+    proc = ctx.Process(
+        target=_child,
+        args=(send_conn, ticks, limits, target, args),
+    )
+    proc.start()
+    send_conn.close()
+
+    try:
+        status, payload = _supervise(proc, recv_conn, ticks, limits)
+    finally:
+        _kill_group(proc)
+        recv_conn.close()
+
+    match status:
+        case "ok":
+            return payload  # type: ignore
+        case "error":
+            raise payload  # type: ignore
+        case "oom":
+            assert limits.max_memory is not None
+            raise MemoryLimitExceeded(limits.max_memory)
+        case _:
+            raise AssertionError(f"Should never happen: {status}")
+
+
+def _supervise(
+    proc: multiprocessing.process.BaseProcess,
+    conn: Connection,
+    ticks: c_ulonglong,
+    limits: Limits,
+) -> tuple[str, object]:
+    last_tick = 0
+    deadline = None
+    while True:
+        try:
+            if conn.poll(_POLL_INTERVAL):
+                return conn.recv()
+        except EOFError:
+            # child exited without reporting back
+            pass
+
+        if not proc.is_alive():
+            proc.join()
+            if proc.exitcode == -signal.SIGKILL and limits.max_memory:
+                # most likely the kernel's oom killer
+                return "oom", None
+            raise ChildProcessError(
+                f"supervised process exited unexpectedly: {proc.exitcode}"
+            )
+
+        if limits.timeout is None:
+            continue
+
+        now = time.monotonic()
+        if (tick := ticks.value) != last_tick:
+            last_tick = tick
+            deadline = now + limits.timeout
+        elif deadline is not None and now > deadline:
+            raise TimeLimitExceeded(limits.timeout)
+
+
+def _child(
+    conn: Connection,
+    ticks: c_ulonglong,
+    limits: Limits,
+    target: Callable[..., object],
+    args: tuple[object, ...],
+) -> None:
+    # own process group, so that anything target spawns can be killed with it
+    os.setpgrp()
+
+    supervisor = Supervisor(ticks, limits)
+    try:
+        result = target(supervisor, *args)
+    except MemoryError:
+        conn.send(("oom", None))
+    except Exception as ex:
+        if limits.max_memory and _crashed_near_memory_limit(
+            ex, supervisor, limits.max_memory
+        ):
+            # subprocesses (e.g. a c executable) don't raise MemoryError,
+            # they crash when an allocation fails
+            conn.send(("oom", None))
+            return
+        try:
+            conn.send(("error", ex))
+        except Exception:
+            conn.send(("error", RuntimeError(repr(ex))))
+    else:
+        conn.send(("ok", result))
+
+
+def _crashed_near_memory_limit(
+    ex: Exception, supervisor: Supervisor, max_memory: int
+) -> bool:
+    """
+    Whether a subprocess of the supervised work was killed by a signal
+    after coming within a factor of two of the limit, e.g. a failed
+    allocation while doubling a buffer. Only what it used since arming
+    counts, not what the child inherited from its parent. Other errors
+    are the solution's own, however much memory it used.
+    """
+    if not isinstance(ex, subprocess.CalledProcessError):
+        return False
+    if -ex.returncode not in _ALLOCATION_FAILURE_SIGNALS:
+        return False
+    return supervisor.peak_rss() * 2 >= max_memory
+
+
+def _kill_group(proc: multiprocessing.process.BaseProcess) -> None:
+    if proc.pid is not None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            # the child may not have made its own process group yet
+            pass
+    if proc.is_alive():
+        proc.kill()
+    proc.join()
@@ -3,23 +3,54 @@ Execute specified solutions, by default the most
 recent solution is executed.
 """
 
+import inspect
 import time
 from argparse import ArgumentParser
 from collections.abc import Callable
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import fields
+from functools import partial
+from pathlib import Path
 
 from ._commands import Command
 from ._commands import register_command
 from ._daypart import DayPart
 from ._daypart import get_selections
 from ._daypart import SelectionArgs
+from ._history import append_entry
+from ._history import compare_to_baseline
+from ._history import Comparison
+from ._history import Entry
+from ._history import get_commit
+from ._history import load_entries
+from ._memory import MemoryUsage
+from ._memory import trace_allocations
 from ._plugins import plugin
+from ._plugins import Solution
+from ._profile import Profile
+from ._profile import profile_from_stacks
+from ._profile import profile_solution
+from ._profile import Profiler
 from ._random_shit import Color
+from ._random_shit import get_rootdir
+from ._stats import summarize
+from ._stats import Summary
+from ._supervise import Limits
+from ._supervise import MemoryLimitExceeded
+from ._supervise import run_supervised
+from ._supervise import Supervisor
+from ._supervise import TimeLimitExceeded
 
 
 __all__ = [
     "main",
     "run_selections",
+    "benchmark_solution",
+    "BenchmarkOptions",
 ]
 
 
@@ -29,16 +60,70 @@ def main(
     parts: list[int],
     test: bool,
     count: int,
+    warmup: int,
+    adaptive: bool,
+    ci: float,
+    max_count: int,
+    compare: bool,
+    threshold: float,
+    jobs: int,
+    serial_timing: bool,
+    timeout: float | None,
+    max_memory: int | None,
+    memory: bool,
+    profile: Profiler | None,
+    server: bool,
     unknown_args: list[str],
 ) -> int:
-    args = _Args(all, days, parts, test, count)
+    args = _Args(
+        all,
+        days,
+        parts,
+        test,
+        count,
+        warmup,
+        adaptive,
+        ci,
+        max_count,
+        compare,
+        threshold,
+        jobs,
+        serial_timing,
+        timeout,
+        max_memory,
+        memory,
+        None if profile is None else Profiler(profile),
+    )
+    if server:
+        from .serve import forward_run
+
+        kwargs = {f.name: getattr(args, f.name) for f in fields(args)}
+        return forward_run({**kwargs, "unknown_args": unknown_args})
+
     dayparts = plugin().get_all_dayparts()
     selections = get_selections(dayparts, args)
 
     if args.test:
         return plugin().run_daypart_tests(selections, unknown_args)
     else:
-        return run_selections(selections, count=args.count)
+        benchmark = BenchmarkOptions(
+            count=args.count,
+            warmup=args.warmup,
+            adaptive=args.adaptive,
+            ci=args.ci / 100,
+            max_count=args.max_count,
+        )
+        return run_selections(
+            selections,
+            benchmark=benchmark,
+            compare=args.compare,
+            threshold=args.threshold / 100,
+            jobs=args.jobs,
+            serial_timing=args.serial_timing,
+            limits=args.limits(),
+            memory=args.memory,
+            profile=args.profile,
+        )
 
 
 def _fill_parser(parser: ArgumentParser) -> None:
@@ -48,94 +133,519 @@ def _fill_parser(parser: ArgumentParser) -> None:
     parser.add_argument("--days", type=int, action="append")
     parser.add_argument("--parts", type=int, action="append")
     parser.add_argument("--test", default=False, action="store_true")
-    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=1,
+        help="number of timed runs, the minimum number with --adaptive",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=0,
+        help="number of untimed runs before timing starts",
+    )
+    parser.add_argument(
+        "--adaptive",
+        default=False,
+        action="store_true",
+        help="keep timing until the confidence interval is within --ci",
+    )
+    parser.add_argument(
+        "--ci",
+        type=float,
+        default=2.0,
+        help="target 95%% confidence interval of the mean, in percent",
+    )
+    parser.add_argument(
+        "--max-count",
+        type=int,
+        default=1000,
+        help="upper bound on the number of timed runs with --adaptive",
+    )
+    parser.add_argument(
+        "--compare",
+        default=False,
+        action="store_true",
+        help="flag solutions that are slower than their recorded baseline",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="slowdown tolerated by --compare, in percent",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of dayparts to execute in parallel",
+    )
+    parser.add_argument(
+        "--serial-timing",
+        default=False,
+        action="store_true",
+        help="with --jobs only load solutions in parallel, time them serially",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="seconds a solution may run before it is stopped",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=int,
+        default=None,
+        help="megabytes of memory a solution may use before it is stopped",
+    )
+    parser.add_argument(
+        "--memory",
+        default=False,
+        action="store_true",
+        help="report peak memory usage and, for python, top allocation sites",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Profiler,
+        choices=list(Profiler),
+        nargs="?",
+        const=Profiler.SAMPLING,
+        default=None,
+        help="profile solutions, writing the profile into the day directory",
+    )
+    parser.add_argument(
+        "--server",
+        default=False,
+        action="store_true",
+        help="execute on the server started with `slh serve`",
+    )
 
 
 register_command(Command("run", main, _fill_parser))
 
 
-def run_selections(selections: list[DayPart], *, count: int = 1) -> int:
-    if count <= 0:
-        raise ValueError(f"count must be positive, provided: {count}")
+@dataclass(frozen=True, kw_only=True)
+class BenchmarkOptions:
+    count: int = 1
+    """
+    Number of timed runs, in adaptive mode the minimum number of runs.
+    """
+    warmup: int = 0
+    """
+    Number of untimed runs executed before timing starts.
+    """
+    adaptive: bool = False
+    """
+    Keep timing until the confidence interval of the mean is tight.
+    """
+    ci: float = 0.02
+    """
+    Target 95% confidence interval half width relative to the mean.
+    """
+    max_count: int = 1000
+    """
+    Upper bound on the number of timed runs in adaptive mode.
+    """
+
+    def __post_init__(self) -> None:
+        if self.count <= 0:
+            raise ValueError(f"count must be positive, provided: {self.count}")
+        if self.warmup < 0:
+            raise ValueError(
+                f"warmup must be non-negative, provided: {self.warmup}"
+            )
+        if self.ci <= 0:
+            raise ValueError(f"ci must be positive, provided: {self.ci}")
+        if self.adaptive and self.max_count < self.count:
+            raise ValueError(
+                f"max_count must be at least count ({self.count}),"
+                f" provided: {self.max_count}"
+            )
+
+
+# a single run, frozen so it can be shared as a default argument
+_DEFAULT_BENCHMARK = BenchmarkOptions()
 
-    rtc = 0
-    for dp in selections:
-        print(f"{dp.emoji} ({dp.day:02}/{dp.part}) ➡️ ", end="")
 
-        if not dp.is_solved() and len(selections) > 1:
-            print(f"{Color.YellowText.format("problem is unsolved")} 🤔")
-            continue
+@dataclass
+class Finished[R]:
+    result: R | None
+    duration: int
+    samples: list[int] = field(default_factory=list)
+    """
+    Individual timings when the solution was executed more than once,
+    `duration` is then the median after outliers are rejected.
+    """
+    load_duration: int | None = None
+    """
+    Time spent loading, e.g. building, the solution before it was timed.
+    """
+    memory: MemoryUsage | None = None
+    profile: Profile | None = None
 
-        solution = plugin().load_solution(dp)
 
-        total_time = 0
-        result = None
-        for _ in range(count):
-            result = time_it(solution, dp.inputfile)
+@dataclass
+class Cancelled:
+    duration: int
+
+
+@dataclass
+class TimedOut:
+    duration: int
+
+
+@dataclass
+class OutOfMemory:
+    max_memory: int
+
+
+type SolutionResult[R] = Finished[R] | Cancelled | TimedOut | OutOfMemory
+
+
+def run_selections(
+    selections: list[DayPart],
+    *,
+    benchmark: BenchmarkOptions = _DEFAULT_BENCHMARK,
+    compare: bool = False,
+    threshold: float = 0.1,
+    jobs: int = 1,
+    serial_timing: bool = False,
+    limits: Limits | None = None,
+    memory: bool = False,
+    profile: Profiler | None = None,
+) -> int:
+    """
+    Execute and report on the selected dayparts. With more than one job
+    the dayparts are executed in a process pool, results are still
+    reported in order. With `serial_timing` the pool only loads (e.g.
+    builds) the solutions and timing happens one daypart at a time.
+    With `limits` or `memory` each solution runs in a supervised child
+    process, the latter also measuring its memory usage. With `profile`
+    each solution is run again under the profiler.
+    """
+    if jobs <= 0:
+        raise ValueError(f"jobs must be positive, provided: {jobs}")
+
+    language = plugin().LANGUAGE.lower()
+    previous = load_entries(selections, language) if compare else []
+    runnable = [
+        dp for dp in selections if dp.is_solved() or len(selections) == 1
+    ]
+
+    if runnable and (build_solutions := getattr(plugin(), "build_solutions", None)):
+        start = time.monotonic_ns()
+        built = build_solutions(runnable)
+        duration = _format_duration(time.monotonic_ns() - start)
+        # nothing to report when every solution is up to date
+        if built:
+            print(f"🔨 built {built} solution(s) in {duration}")
+
+    rtc = 0
+    with _process_pool(jobs if len(runnable) > 1 else 1) as pool:
+        pending = _schedule(
+            pool, runnable, benchmark, serial_timing, limits, memory, profile
+        )
+
+        for dp in selections:
+            print(f"{dp.emoji} ({dp.day:02}/{dp.part}) ➡️ ", end="", flush=True)
+
+            if dp not in pending:
+                print(f"{Color.YellowText.format("problem is unsolved")} 🤔")
+                continue
+
+            result = _wait_for(pending[dp])
+
+            comparison = None
+            # timings of wrong answers would skew the baseline
+            if (
+                isinstance(result, Finished)
+                and result.result is not None
+                and (not dp.is_solved() or _is_correct(dp, result.result))
+            ):
+                entry = _history_entry(dp, language, result)
+                if compare:
+                    comparison = compare_to_baseline(entry, previous)
+                append_entry(entry)
+
+            rtc |= _report(dp, result, comparison, threshold)
             if isinstance(result, Cancelled):
-                break
+                return rtc
 
-            total_time += result.duration
-
-        assert result is not None
-        if isinstance(result, Finished):
-            result.duration = total_time // count
-
-        match result:
-            case Cancelled(duration):
-                dstr = _format_duration(duration)
-                print(
-                    f"{Color.YellowText.format(f"solution cancelled after {dstr}")} 🛑"
-                )
-                return 1
-
-            case Finished(None, _):
-                print(f"{Color.YellowText.format("no answer provided?!")} 👻")
-                rtc |= 1
-
-            case Finished(result, duration):
-                dstr = _format_duration(duration)
-                if dp.is_solved():
-                    correct = str(result) == dp.solutionfile.read_text()
-                    if correct:
-                        print(
-                            f"{Color.GreenText.format(f"{result = :15d}, duration = {dstr:>8s}")} ✅"
-                        )
-                    else:
-                        print(
-                            f"{Color.RedText.format(f"{result = :15d}, duration = {dstr:>8s}")} ❌"
-                        )
-                        rtc |= 1
+    return rtc
+
+
+def _report(
+    dp: DayPart,
+    result: SolutionResult[int],
+    comparison: Comparison | None,
+    threshold: float,
+) -> int:
+    rtc = 0
+    if comparison and comparison.regressed(threshold):
+        rtc |= 1
+
+    match result:
+        case Cancelled(duration):
+            dstr = _format_duration(duration)
+            print(
+                f"{Color.YellowText.format(f"solution cancelled after {dstr}")} 🛑"
+            )
+            return 1
+
+        case TimedOut(duration):
+            dstr = _format_duration(duration)
+            print(f"{Color.YellowText.format(f"solution timed out after {dstr}")} ⏰")
+            rtc |= 1
+
+        case OutOfMemory(max_memory):
+            mstr = _format_memory(max_memory)
+            print(
+                f"{Color.YellowText.format(f"solution exceeded memory limit of {mstr}")} 💥"
+            )
+            rtc |= 1
+
+        case Finished(None, _):
+            print(f"{Color.YellowText.format("no answer provided?!")} 👻")
+            rtc |= 1
+
+        case Finished(result, duration) as finished:
+            dstr = _format_duration(duration)
+            extras = _format_load(finished.load_duration)
+            extras += _format_peak(finished.memory)
+            if dp.is_solved():
+                if _is_correct(dp, result):
+                    print(
+                        f"{Color.GreenText.format(f"{result = :15d}, duration = {dstr:>8s}{extras}")} ✅"
+                    )
+                    _print_details(finished, comparison, threshold)
+                else:
+                    print(
+                        f"{Color.RedText.format(f"{result = :15d}, duration = {dstr:>8s}{extras}")} ❌"
+                    )
+                    _print_details(finished, comparison, threshold)
+                    rtc |= 1
+            else:
+                if dp.add_guess(str(result)):
+                    dp.solutionfile.write_text(str(result))
+                    print(
+                        f"{Color.BlueText.format(f"{result = }, duration = {dstr}{extras}")} 🚀"
+                    )
+                    _print_details(finished, comparison, threshold)
+                    from .submit import submit_daypart
+
+                    rtc |= submit_daypart(dp)
                 else:
-                    if dp.add_guess(str(result)):
-                        dp.solutionfile.write_text(str(result))
-                        print(
-                            f"{Color.BlueText.format(f"{result = }, duration = {dstr}")} 🚀"
-                        )
-                        from .submit import submit_daypart
-
-                        rtc |= submit_daypart(dp)
-                    else:
-                        print(
-                            f"{Color.RedText.format(f"{result = }, duration = {dstr}")} ❌"
-                        )
-                        rtc |= 1
+                    print(
+                        f"{Color.RedText.format(f"{result = }, duration = {dstr}{extras}")} ❌"
+                    )
+                    _print_details(finished, comparison, threshold)
+                    rtc |= 1
 
     return rtc
 
 
-@dataclass
-class Finished[R]:
-    result: R | None
-    duration: int
+def _is_correct(dp: DayPart, answer: int) -> bool:
+    return str(answer) == dp.solutionfile.read_text()
 
 
-@dataclass
-class Cancelled:
-    duration: int
+type _Pending = Callable[[], SolutionResult[int]]
+
+# a plugin's time_solution, see _benchmark_natively
+type _TimeSolution = Callable[[DayPart, Path, int], tuple[int, list[int]] | None]
+
+
+@contextmanager
+def _process_pool(jobs: int) -> Iterator[ProcessPoolExecutor | None]:
+    if jobs == 1:
+        yield None
+        return
+
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        yield pool
+    finally:
+        # everything is consumed unless cancelled, don't start anything new
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _schedule(
+    pool: ProcessPoolExecutor | None,
+    dayparts: list[DayPart],
+    benchmark: BenchmarkOptions,
+    serial_timing: bool,
+    limits: Limits | None = None,
+    memory: bool = False,
+    profile: Profiler | None = None,
+) -> dict[DayPart, _Pending]:
+    """
+    Returns a callback per daypart which blocks until its result is ready.
+    """
+    execute = partial(
+        _execute,
+        benchmark=benchmark,
+        limits=limits,
+        memory=memory,
+        profile=profile,
+    )
+    if pool is None:
+        return {dp: partial(execute, dp) for dp in dayparts}
+
+    if serial_timing:
+        loading = {dp: pool.submit(_load, dp) for dp in dayparts}
+
+        def after_loading(dp: DayPart) -> SolutionResult[int]:
+            load_duration = loading[dp].result()
+            result = execute(dp)
+            # loading again is cheap, report the initial load instead
+            if isinstance(result, Finished):
+                result.load_duration = load_duration
+            return result
+
+        return {dp: partial(after_loading, dp) for dp in dayparts}
+
+    return {dp: pool.submit(execute, dp).result for dp in dayparts}
+
+
+def _wait_for(pending: _Pending) -> SolutionResult[int]:
+    start = time.monotonic_ns()
+    try:
+        return pending()
+    except KeyboardInterrupt:
+        # ctrl-c while waiting on the pool, workers are interrupted as well
+        return Cancelled(time.monotonic_ns() - start)
 
 
-type SolutionResult[R] = Finished[R] | Cancelled
+def _execute(
+    dp: DayPart,
+    benchmark: BenchmarkOptions,
+    limits: Limits | None = None,
+    memory: bool = False,
+    profile: Profiler | None = None,
+) -> SolutionResult[int]:
+    start = time.monotonic_ns()
+    solution = plugin().load_solution(dp)
+    load_duration = time.monotonic_ns() - start
+    # plugins may time the solution without the overhead of calling it
+    time_solution = getattr(plugin(), "time_solution", None)
+
+    if limits is None and not memory:
+        result = None
+        if time_solution is not None:
+            result = _benchmark_natively(time_solution, dp, benchmark)
+        if result is None:
+            result = benchmark_solution(solution, dp.inputfile, benchmark)
+    else:
+        try:
+            result = run_supervised(
+                _execute_supervised,
+                solution,
+                time_solution,
+                dp,
+                benchmark,
+                memory,
+                limits=limits or Limits(),
+            )
+        except TimeLimitExceeded as ex:
+            return TimedOut(round(ex.timeout * 10**9))
+        except MemoryLimitExceeded as ex:
+            return OutOfMemory(ex.max_memory)
+
+    if isinstance(result, Finished):
+        result.load_duration = load_duration
+        # profiled separately, so that profiling overhead isn't timed
+        if profile is not None:
+            result.profile = _profile(dp, solution, profile)
+    return result
+
+
+def _execute_supervised(
+    supervisor: Supervisor,
+    solution: Solution,
+    time_solution: _TimeSolution | None,
+    dp: DayPart,
+    benchmark: BenchmarkOptions,
+    memory: bool,
+) -> SolutionResult[int]:
+    supervisor.arm()
+
+    def supervised(inputfile: Path, /) -> int:
+        supervisor.tick()
+        return solution(inputfile)
+
+    def run_benchmark() -> SolutionResult[int]:
+        # timed the same way as without supervision, so that the
+        # history only ever compares like with like
+        result = None
+        if time_solution is not None:
+            result = _benchmark_natively(
+                time_solution, dp, benchmark, supervisor.tick
+            )
+        if result is None:
+            result = benchmark_solution(supervised, dp.inputfile, benchmark)
+        return result
+
+    if not memory:
+        return run_benchmark()
+
+    # solutions wrapping a python function (see functools.wraps)
+    # can also have their allocations traced, snapshots are taken when
+    # the innermost function returns, e.g. beneath mapped_input
+    wrapped = inspect.unwrap(solution) if hasattr(solution, "__wrapped__") else None
+    if wrapped is None:
+        result = run_benchmark()
+        usage = MemoryUsage(_peak_rss(supervisor, dp))
+    else:
+        with trace_allocations(wrapped) as tracer:
+            result = run_benchmark()
+        usage = MemoryUsage(
+            _peak_rss(supervisor, dp),
+            tracer.traced_peak,
+            tracer.top_allocations(get_rootdir()),
+        )
+
+    if isinstance(result, Finished):
+        result.memory = usage
+    return result
+
+
+def _peak_rss(supervisor: Supervisor, dp: DayPart) -> int:
+    # the rusage of a child process includes what it used before exec,
+    # i.e. the size of this process, plugins running e.g. an executable
+    # can have it measure itself instead, at the cost of another run
+    measure_peak_rss = getattr(plugin(), "measure_peak_rss", None)
+    if measure_peak_rss is not None:
+        supervisor.tick()
+        peak = measure_peak_rss(dp, dp.inputfile)
+        if peak is not None:
+            return peak
+    return supervisor.peak_rss()
+
+
+def _profile(dp: DayPart, solution: Solution, profiler: Profiler) -> Profile:
+    stem = dp.outdir / f"part{dp.part}"
+    # python can only see the python side of e.g. a compiled
+    # solution, plugins may be able to sample it natively
+    if profiler is Profiler.SAMPLING and (
+        sample_solution := getattr(plugin(), "sample_solution", None)
+    ):
+        stacks = sample_solution(dp, dp.inputfile)
+        if stacks is not None:
+            return profile_from_stacks(stacks, stem)
+
+    return profile_solution(
+        solution, dp.inputfile, profiler, stem, get_rootdir()
+    )
+
+
+def _load(dp: DayPart) -> int:
+    """
+    Load (e.g. build) the solution, returning how long that took in ns.
+    """
+    start = time.monotonic_ns()
+    plugin().load_solution(dp)
+    return time.monotonic_ns() - start
 
 
 def time_it[
@@ -152,6 +662,164 @@ def time_it[
     return Finished(result, duration)
 
 
+def benchmark_solution(
+    solution: Solution,
+    inputfile: Path,
+    options: BenchmarkOptions = _DEFAULT_BENCHMARK,
+) -> SolutionResult[int]:
+    """
+    Time repeated executions of the solution, the returned
+    result carries all samples and the median duration.
+    """
+    for _ in range(options.warmup):
+        if isinstance(warmup := time_it(solution, inputfile), Cancelled):
+            return warmup
+
+    samples: list[int] = []
+    while True:
+        result = time_it(solution, inputfile)
+        if isinstance(result, Cancelled):
+            return result
+
+        samples.append(result.duration)
+        if _enough_samples(samples, options):
+            break
+
+    if len(samples) > 1:
+        result.duration = round(summarize(samples).median)
+        result.samples = samples
+    return result
+
+
+def _benchmark_natively(
+    time_solution: _TimeSolution,
+    dp: DayPart,
+    options: BenchmarkOptions,
+    tick: Callable[[], None] | None = None,
+) -> SolutionResult[int] | None:
+    """
+    Time the solution with the plugin's own timing loop, in batches until
+    enough samples are collected. Returns None if the plugin declines.
+    With `tick` (see Supervisor) the batches are single calls, ticking
+    before each, so that a timeout applies to every call.
+    """
+    start = time.monotonic_ns()
+    samples: list[int] = []
+    warmup = options.warmup
+    batch = warmup + options.count
+    try:
+        while True:
+            if tick is not None:
+                tick()
+                batch = 1
+            timed = time_solution(dp, dp.inputfile, batch)
+            if timed is None:
+                return None
+
+            answer, durations = timed
+            samples.extend(durations[warmup:])
+            warmup = max(warmup - len(durations), 0)
+            if _enough_samples(samples, options):
+                break
+            batch = min(options.count, options.max_count - len(samples))
+    except KeyboardInterrupt:
+        return Cancelled(time.monotonic_ns() - start)
+
+    if len(samples) == 1:
+        return Finished(answer, samples[0])
+    return Finished(answer, round(summarize(samples).median), samples)
+
+
+def _enough_samples(samples: list[int], options: BenchmarkOptions) -> bool:
+    if len(samples) < options.count:
+        return False
+    if not options.adaptive or len(samples) >= options.max_count:
+        return True
+    return summarize(samples).relative_ci_halfwidth() <= options.ci
+
+
+def _history_entry(dp: DayPart, language: str, result: Finished) -> Entry:
+    return Entry(
+        day=dp.day,
+        part=dp.part,
+        language=language,
+        commit=get_commit(),
+        samples=tuple(result.samples or [result.duration]),
+        peak_memory=result.memory.peak_rss if result.memory else None,
+    )
+
+
+def _print_details(
+    result: Finished,
+    comparison: Comparison | None,
+    threshold: float,
+) -> None:
+    if len(result.samples) > 1:
+        print(f"    📊 {_format_summary(summarize(result.samples))}")
+
+    if result.memory is not None and result.memory.traced_peak is not None:
+        peak = _format_memory(result.memory.traced_peak)
+        print(f"    🧠 traced python peak = {peak}")
+        for allocation in result.memory.top_allocations:
+            size = _format_memory(allocation.size)
+            blocks = f"{allocation.count} blocks"
+            print(f"       {size:>10s} in {blocks:>14s} at {allocation.site}")
+
+    if result.profile is not None:
+        _print_profile(result.profile)
+
+    if comparison is not None:
+        change = f"{comparison.change:+.1%}"
+        baseline = _format_duration(round(comparison.baseline))
+        if comparison.regressed(threshold):
+            print(
+                f"    {Color.RedText.format(f"regressed {change} vs baseline {baseline}")} 🐌"
+            )
+        else:
+            print(f"    {change} vs baseline {baseline} 🏎️")
+
+
+def _print_profile(profile: Profile) -> None:
+    path = profile.path.relative_to(get_rootdir())
+    samples = "" if profile.samples is None else f" ({profile.samples} samples)"
+    print(f"    🔥 profile written to {path}{samples}")
+    for hot in profile.hot_functions:
+        print(f"       own = {hot.own:6.1%}, total = {hot.total:6.1%}  {hot.name}")
+
+
+def _format_summary(summary: Summary) -> str:
+    def fmt(duration_ns: float) -> str:
+        return _format_duration(round(duration_ns))
+
+    outliers = f" ({summary.outliers} outliers)" if summary.outliers else ""
+    return (
+        f"min = {fmt(summary.min)}, median = {fmt(summary.median)},"
+        f" mean = {fmt(summary.mean)} ± {fmt(summary.stddev)},"
+        f" p95 = {fmt(summary.p95)}, n = {summary.count + summary.outliers}{outliers}"
+    )
+
+
+def _format_load(load_duration: int | None) -> str:
+    if load_duration is None:
+        return ""
+    return f", load = {_format_duration(load_duration):>8s}"
+
+
+def _format_peak(memory: MemoryUsage | None) -> str:
+    if memory is None:
+        return ""
+    return f", peak = {_format_memory(memory.peak_rss):>10s}"
+
+
+def _format_memory(nbytes: int) -> str:
+    size = float(nbytes)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
 def _format_duration(duration_ns: int) -> str:
     power = len(str(duration_ns)) - 1
     unit = power // 3
@@ -179,3 +847,23 @@ def _format_duration(duration_ns: int) -> str:
 class _Args(SelectionArgs):
     test: bool = False
     count: int = 1
+    warmup: int = 0
+    adaptive: bool = False
+    ci: float = 2.0
+    max_count: int = 1000
+    compare: bool = False
+    threshold: float = 10.0
+    jobs: int = 1
+    serial_timing: bool = False
+    timeout: float | None = None
+    max_memory: int | None = None
+    memory: bool = False
+    profile: Profiler | None = None
+
+    def limits(self) -> Limits | None:
+        if self.timeout is None and self.max_memory is None:
+            return None
+        return Limits(
+            timeout=self.timeout,
+            max_memory=None if self.max_memory is None else self.max_memory * 2**20,
+        )
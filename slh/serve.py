@@ -0,0 +1,258 @@
+"""
+Serve `slh run --server` requests, keeping the interpreter, plugin
+and unchanged solutions loaded between runs.
+"""
+
+from __future__ import annotations
+
+import importlib
+import io
+import json
+import os
+import socket
+import sys
+import traceback
+from argparse import ArgumentParser
+from collections.abc import Callable
+from contextlib import redirect_stderr
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import TextIO
+
+from ._commands import Command
+from ._commands import register_command
+from ._random_shit import get_rootdir
+from ._random_shit import HandledError
+
+
+__all__ = [
+    "main",
+    "socket_path",
+    "forward_run",
+]
+
+
+_SOCKET_NAME = ".slh-server.sock"
+
+
+def main() -> int:
+    try:
+        _serve(socket_path())
+    except HandledError as ex:
+        print("error:", ex, file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+def _fill_parser(parser: ArgumentParser) -> None:
+    parser.description = __doc__
+
+
+register_command(Command("serve", main, _fill_parser))
+
+
+def socket_path() -> Path:
+    return get_rootdir() / _SOCKET_NAME
+
+
+def forward_run(kwargs: dict[str, object]) -> int:
+    """
+    Execute `slh run` with the provided arguments on the running
+    server, relaying its output. Returns the run's exit code.
+    """
+    path = socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError) as err:
+            raise HandledError(
+                f"no server is listening on {path}, start one with `slh serve`"
+            ) from err
+
+        try:
+            return _request_run(client, kwargs)
+        except KeyboardInterrupt:
+            return 1
+
+
+def _request_run(client: socket.socket, kwargs: dict[str, object]) -> int:
+    with client.makefile("rw", encoding="utf-8") as f:
+        _send(f, {"run": kwargs, "isatty": sys.stdout.isatty()})
+
+        for line in f:
+            match json.loads(line):
+                case {"out": str(text)}:
+                    sys.stdout.write(text)
+                    sys.stdout.flush()
+                case {"err": str(text)}:
+                    sys.stderr.write(text)
+                    sys.stderr.flush()
+                case {"exit": int(rtc)}:
+                    return rtc
+                case message:
+                    raise HandledError(f"unexpected message from server: {message!r}")
+
+    raise HandledError("server disconnected before the run finished")
+
+
+def _serve(path: Path) -> None:
+    # import everything a run needs up front, that is the point
+    from . import run
+    from ._plugins import plugin
+
+    plugin()
+
+    with _listen(path) as server:
+        print(f"serving on {path}, stop with ctrl-c", flush=True)
+        tracker = _ModuleTracker(get_rootdir())
+        try:
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    _handle(conn, tracker, run.main)
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def _listen(path: Path) -> socket.socket:
+    if path.exists():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(path))
+            except ConnectionRefusedError:
+                # left behind by a server that didn't shut down cleanly
+                path.unlink()
+            else:
+                raise HandledError(f"a server is already listening on {path}")
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # only the current user may connect
+    umask = os.umask(0o177)
+    try:
+        server.bind(str(path))
+    except OSError as err:
+        server.close()
+        raise HandledError(f"unable to listen on {path}") from err
+    finally:
+        os.umask(umask)
+
+    server.listen()
+    return server
+
+
+def _handle(
+    conn: socket.socket,
+    tracker: _ModuleTracker,
+    run_main: Callable[..., int],
+) -> None:
+    with conn.makefile("rw", encoding="utf-8") as f:
+        request = json.loads(f.readline())
+        tracker.forget_changed()
+
+        out = _Stream(f, "out", request["isatty"])
+        err = _Stream(f, "err", request["isatty"])
+        try:
+            with redirect_stdout(out), redirect_stderr(err):
+                rtc = run_main(**request["run"], server=False)
+        except (BrokenPipeError, ConnectionResetError):
+            # the client went away, e.g. it was interrupted
+            return
+        except Exception:
+            err.write(traceback.format_exc())
+            rtc = 1
+        finally:
+            tracker.record()
+
+        try:
+            _send(f, {"exit": rtc})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def _send(f: TextIO, message: dict[str, object]) -> None:
+    f.write(f"{json.dumps(message)}\n")
+    f.flush()
+
+
+class _Stream(io.TextIOBase):
+    """
+    Relays writes to the client as `{name: text}` messages.
+    """
+
+    def __init__(self, f: TextIO, name: str, isatty: bool) -> None:
+        self._f = f
+        self._name = name
+        self._isatty = isatty
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self._isatty
+
+    def write(self, text: str) -> int:
+        if text:
+            _send(self._f, {self._name: text})
+        return len(text)
+
+
+class _ModuleTracker:
+    """
+    Keeps track of the modules imported from the project (e.g. dayNN.partN
+    solutions). Once one of them changes all of them are forgotten, so that
+    they are imported again, including anything depending on the change.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._mtimes: dict[str, int | None] = {}
+
+    def record(self) -> None:
+        self._mtimes = {
+            name: _mtime(path) for name, path in self._project_modules().items()
+        }
+
+    def forget_changed(self) -> list[str]:
+        """
+        Forget project modules if any changed, returning their names.
+        """
+        # new files, e.g. the next daypart, are only found with fresh caches
+        importlib.invalidate_caches()
+
+        modules = self._project_modules()
+        if all(
+            self._mtimes.get(name, _mtime(path)) == _mtime(path)
+            for name, path in modules.items()
+        ):
+            return []
+
+        for name in modules:
+            del sys.modules[name]
+        self._mtimes.clear()
+        return list(modules)
+
+    def _project_modules(self) -> dict[str, Path]:
+        modules = {}
+        for name, module in list(sys.modules.items()):
+            filename = getattr(module, "__file__", None)
+            if filename is None:
+                continue
+            path = Path(filename)
+            if not path.is_relative_to(self._root):
+                continue
+            parts = path.relative_to(self._root).parts
+            # e.g. a virtual environment inside the project
+            if parts[0].startswith(".") or "site-packages" in parts:
+                continue
+            modules[name] = path
+        return modules
+
+
+def _mtime(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
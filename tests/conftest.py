@@ -9,10 +9,14 @@ import pytest
 @pytest.fixture
 def rootdir():
     from slh import _daypart
+    from slh import _history
+    from slh import run
 
     startingdir = Path.cwd()
     with (
         patch.object(_daypart, "get_rootdir") as mock_get_rootdir,
+        patch.object(_history, "get_rootdir", mock_get_rootdir),
+        patch.object(run, "get_rootdir", mock_get_rootdir),
         TemporaryDirectory() as tempd,
     ):
         rootdir = Path(tempd) / "aoc1994"
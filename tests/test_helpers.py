@@ -1,8 +1,12 @@
+import os
 import re
 from dataclasses import dataclass
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from slh import _random_shit
 from slh._daypart import (
     DayPart,
     HandledError,
@@ -27,14 +31,139 @@ def test_daypart_next_returns_next_part():
     assert DayPart(13, 2).next() == (14, 1)
 
 
-def test_get_rootdir():
-    get_rootdir.cache_clear()
-
+def test_get_rootdir(fresh_rootdir):
     rootdir = get_rootdir()
 
     assert (rootdir / ".git").exists()
 
 
+@pytest.fixture
+def fresh_rootdir(monkeypatch):
+    # get_rootdir exports SLH_ROOTDIR, setting it first so that monkeypatch
+    # restores it afterwards, even when it wasn't set
+    monkeypatch.setenv("SLH_ROOTDIR", "")
+    monkeypatch.delenv("SLH_ROOTDIR")
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    monkeypatch.delenv("GIT_WORK_TREE", raising=False)
+    get_rootdir.cache_clear()
+    yield
+    get_rootdir.cache_clear()
+
+
+def _no_git(*args, **kwargs):
+    raise AssertionError(f"git should not be invoked: {args}")
+
+
+def test_get_rootdir_from_env(fresh_rootdir, monkeypatch, tmp_path):
+    monkeypatch.setenv("SLH_ROOTDIR", str(tmp_path))
+
+    with patch.object(_random_shit.subprocess, "run", _no_git):
+        assert get_rootdir() == tmp_path
+
+
+def test_get_rootdir_walks_up(fresh_rootdir, monkeypatch, tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (tmp_path / "day01").mkdir()
+    monkeypatch.chdir(tmp_path / "day01")
+
+    with patch.object(_random_shit.subprocess, "run", _no_git):
+        assert get_rootdir() == tmp_path
+
+    # exported for child processes
+    assert os.environ["SLH_ROOTDIR"] == str(tmp_path)
+
+
+def test_get_rootdir_worktree(fresh_rootdir, monkeypatch, tmp_path):
+    gitdir = tmp_path / "repo" / ".git" / "worktrees" / "wt"
+    gitdir.mkdir(parents=True)
+    (gitdir / "HEAD").write_text("ref: refs/heads/wt\n")
+    worktree = tmp_path / "wt"
+    worktree.mkdir()
+    (worktree / ".git").write_text("gitdir: ../repo/.git/worktrees/wt\n")
+    monkeypatch.chdir(worktree)
+
+    with patch.object(_random_shit.subprocess, "run", _no_git):
+        assert get_rootdir() == worktree
+
+
+def test_get_rootdir_falls_back_to_git(fresh_rootdir, monkeypatch, tmp_path):
+    (tmp_path / ".git").write_text("gitdir: does/not/exist\n")
+    monkeypatch.chdir(tmp_path)
+
+    with patch.object(_random_shit.subprocess, "run") as mock_run:
+        mock_run.return_value.stdout = "/some/where\n"
+        assert get_rootdir() == Path("/some/where")
+
+    mock_run.assert_called_once()
+
+
+_COMMIT = "0123456789abcdef0123456789abcdef01234567"
+
+
+def test_read_git_head_loose_ref(fresh_rootdir, tmp_path):
+    (tmp_path / ".git" / "refs" / "heads").mkdir(parents=True)
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (tmp_path / ".git" / "refs" / "heads" / "main").write_text(f"{_COMMIT}\n")
+
+    with patch.object(_random_shit.subprocess, "run", _no_git):
+        assert _random_shit.read_git_head(tmp_path / "day01") == _COMMIT
+
+
+def test_read_git_head_packed_ref(fresh_rootdir, tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (tmp_path / ".git" / "packed-refs").write_text(
+        "# pack-refs with: peeled fully-peeled sorted\n"
+        f"{'f' * 40} refs/heads/other\n"
+        f"{_COMMIT} refs/heads/main\n"
+        f"^{'e' * 40}\n"
+    )
+
+    with patch.object(_random_shit.subprocess, "run", _no_git):
+        assert _random_shit.read_git_head(tmp_path) == _COMMIT
+
+
+def test_read_git_head_detached(fresh_rootdir, tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text(f"{_COMMIT}\n")
+
+    assert _random_shit.read_git_head(tmp_path) == _COMMIT
+
+
+def test_read_git_head_worktree(fresh_rootdir, tmp_path):
+    common = tmp_path / "repo" / ".git"
+    gitdir = common / "worktrees" / "wt"
+    gitdir.mkdir(parents=True)
+    (gitdir / "HEAD").write_text("ref: refs/heads/wt\n")
+    (gitdir / "commondir").write_text("../..\n")
+    (common / "packed-refs").write_text(f"{_COMMIT} refs/heads/wt\n")
+    worktree = tmp_path / "wt"
+    worktree.mkdir()
+    (worktree / ".git").write_text("gitdir: ../repo/.git/worktrees/wt\n")
+
+    with patch.object(_random_shit.subprocess, "run", _no_git):
+        assert _random_shit.read_git_head(worktree) == _COMMIT
+
+
+@pytest.mark.parametrize(
+    "head", ["ref: refs/heads/unborn\n", "ref: refs/heads/.invalid\n", "garbage\n"]
+)
+def test_read_git_head_leaves_it_to_git(fresh_rootdir, tmp_path, head):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text(head)
+
+    assert _random_shit.read_git_head(tmp_path) is None
+
+
+def test_read_git_head_with_git_dir(fresh_rootdir, monkeypatch, tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text(f"{_COMMIT}\n")
+    monkeypatch.setenv("GIT_DIR", str(tmp_path / "elsewhere"))
+
+    assert _random_shit.read_git_head(tmp_path) is None
+
+
 @dataclass
 class SelectionTestCase:
     all: list[DayPart]
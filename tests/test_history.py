@@ -0,0 +1,107 @@
+import subprocess
+
+import pytest
+
+from slh._daypart import DayPart
+from slh._history import append_entry
+from slh._history import compare_to_baseline
+from slh._history import Comparison
+from slh._history import Entry
+from slh._history import get_commit
+from slh._history import history_file
+from slh._history import load_entries
+from slh._random_shit import HandledError
+
+
+@pytest.fixture(autouse=True)
+def auto_rootdir(rootdir):
+    pass
+
+
+def _entry(day=1, part=1, samples=(100,), language="python", **kwargs):
+    return Entry(
+        day=day,
+        part=part,
+        language=language,
+        commit="abc1234",
+        samples=tuple(samples),
+        **kwargs,
+    )
+
+
+def test_entry_json_round_trip():
+    entry = _entry(samples=(1, 2, 3), peak_memory=1024)
+
+    assert Entry.from_json(entry.to_json()) == entry
+
+
+def test_entry_duration_is_median_without_outliers():
+    assert _entry(samples=(10, 11, 12, 10, 11, 500)).duration == 11
+
+
+def test_load_entries_without_history():
+    assert load_entries() == []
+
+
+def test_append_and_load_entries():
+    first = _entry(day=1, part=1)
+    second = _entry(day=1, part=2)
+    third = _entry(day=2, part=1, language="c")
+    for entry in (first, second, third):
+        append_entry(entry)
+
+    assert load_entries() == [first, second, third]
+    assert load_entries([DayPart(1, 2)]) == [second]
+    assert load_entries(language="c") == [third]
+    assert load_entries([DayPart(1, 1)], language="c") == []
+
+
+def test_load_entries_invalid_history():
+    history_file().write_text("not json\n")
+
+    with pytest.raises(HandledError):
+        load_entries()
+
+
+def test_compare_without_baseline():
+    previous = [_entry(day=2), _entry(language="c")]
+
+    assert compare_to_baseline(_entry(), previous) is None
+
+
+def test_compare_uses_recent_entries():
+    previous = [_entry(samples=(1_000,))] + [_entry(samples=(100,))] * 5
+
+    comparison = compare_to_baseline(_entry(samples=(150,)), previous)
+
+    assert comparison == Comparison(baseline=100, latest=150)
+    assert comparison.change == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize(
+    ("latest", "regressed"),
+    [(100, False), (109, False), (111, True), (50, False)],
+)
+def test_comparison_regressed(latest, regressed):
+    assert Comparison(100, latest).regressed(0.1) is regressed
+
+
+def test_get_commit_abbreviates_consistently(rootdir, monkeypatch):
+    git = ["git", "-C", str(rootdir), "-c", "user.name=slh", "-c", "user.email=slh@x"]
+    subprocess.run([*git, "init", "-q"], check=True)
+    subprocess.run([*git, "config", "core.abbrev", "12"], check=True)
+    subprocess.run(
+        [*git, "-c", "commit.gpgsign=false", "commit", "--allow-empty", "-qm", "."],
+        check=True,
+    )
+
+    get_commit.cache_clear()
+    read = get_commit()
+    # git decides with $GIT_DIR set
+    monkeypatch.setenv("GIT_DIR", str(rootdir / ".git"))
+    get_commit.cache_clear()
+    asked = get_commit()
+    get_commit.cache_clear()
+
+    assert read is not None and len(read) == 7
+    assert asked == read
@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from slh._memory import peak_rss
+from slh._memory import reset_peak_rss
+from slh._memory import trace_allocations
+
+
+def _allocate(n):
+    data = [bytearray(1000) for _ in range(n)]
+    return len(data)
+
+
+def test_peak_rss_grows():
+    before = peak_rss()
+    data = bytearray(2**26)
+    data[::4096] = b"x" * len(data[::4096])
+
+    assert before > 0
+    assert peak_rss() >= before
+    assert peak_rss() >= 2**26
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="resetting the peak is linux only")
+def test_peak_rss_from_baseline():
+    data = bytearray(2**26)
+    data[::4096] = b"x" * len(data[::4096])
+    del data
+
+    baseline = reset_peak_rss()
+    assert peak_rss(baseline) < 2**26
+
+    data = bytearray(2**26)
+    data[::4096] = b"x" * len(data[::4096])
+    assert peak_rss(baseline) >= 2**25
+
+
+def test_trace_allocations_snapshots_on_return():
+    with trace_allocations(_allocate) as tracer:
+        _allocate(1000)
+
+    assert tracer.traced_peak >= 1000 * 1000
+    (top, *_) = tracer.top_allocations()
+    assert top.site.endswith("test_memory.py:12")
+    assert top.size >= 1000 * 1000
+    assert top.count >= 1000
+
+
+def test_trace_allocations_under_root(tmp_path):
+    with trace_allocations(_allocate) as tracer:
+        _allocate(10)
+
+    (top, *_) = tracer.top_allocations(Path(__file__).parent)
+    assert top.site == f"{Path(__file__).name}:12"
+    assert tracer.top_allocations(tmp_path) == []
+
+
+def test_trace_allocations_limit():
+    with trace_allocations(_allocate, limit=1) as tracer:
+        _allocate(10)
+
+    assert len(tracer.top_allocations()) == 1
+
+
+def test_trace_allocations_without_calls():
+    with trace_allocations(_allocate) as tracer:
+        pass
+
+    assert tracer.top_allocations() == []
+
+
+def test_trace_allocations_is_reentrant():
+    with trace_allocations(_allocate):
+        pass
+    with trace_allocations(_allocate) as tracer:
+        _allocate(10)
+
+    assert tracer.top_allocations()
+
+
+def test_trace_allocations_requires_python_function():
+    with pytest.raises(TypeError):
+        with trace_allocations(len):
+            pass
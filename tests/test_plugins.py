@@ -0,0 +1,119 @@
+import os
+import sys
+from types import ModuleType
+from unittest.mock import patch
+
+import pytest
+
+from slh import _plugins
+from slh._random_shit import HandledError
+from slh._user_config import UserConfig
+
+
+def _fake_plugin(name, language):
+    module = ModuleType(name)
+    module.LANGUAGE = language  # type: ignore[attr-defined]
+    return module
+
+
+@pytest.fixture
+def fake_plugins(tmp_path, monkeypatch):
+    """
+    Installs fake plugin modules, returning the names of imported modules.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    plugins = {
+        "fake_python_plugin": _fake_plugin("fake_python_plugin", "Python"),
+        "fake_c_plugin": _fake_plugin("fake_c_plugin", "C"),
+    }
+    imported = []
+
+    def import_module(name):
+        imported.append(name)
+        return plugins[name]
+
+    def fetch_plugins():
+        return [(name, import_module(name)) for name in plugins]
+
+    with (
+        patch.object(_plugins.importlib, "import_module", import_module),
+        patch.object(_plugins, "_fetch_plugins", side_effect=fetch_plugins) as fetch,
+    ):
+        yield imported, fetch
+
+    _plugins.plugin.cache_clear()
+
+
+def _plugin_for(language):
+    _plugins.plugin.cache_clear()
+    with patch.object(
+        _plugins, "user_config", return_value=UserConfig(language=language)
+    ):
+        return _plugins.plugin()
+
+
+def test_plugin_cached_only_imports_selected(fake_plugins):
+    imported, fetch = fake_plugins
+
+    assert _plugin_for("c").LANGUAGE == "C"
+    assert fetch.call_count == 1
+
+    imported.clear()
+    assert _plugin_for("c").LANGUAGE == "C"
+    assert fetch.call_count == 1
+    assert imported == ["fake_c_plugin"]
+
+
+def test_plugin_cache_invalidated_by_fingerprint(fake_plugins, tmp_path):
+    _, fetch = fake_plugins
+    site = tmp_path / "site-packages"
+    (site / "fake-1.0.dist-info").mkdir(parents=True)
+    _plugin_for("python")
+
+    with patch.object(sys, "path", [*sys.path, str(site)]):
+        _plugin_for("python")
+        assert fetch.call_count == 2
+
+        (site / "other-1.0.dist-info").mkdir()
+        _plugin_for("python")
+        assert fetch.call_count == 3
+
+
+def test_plugin_cache_ignores_current_directory(fake_plugins, tmp_path, monkeypatch):
+    _, fetch = fake_plugins
+    monkeypatch.chdir(tmp_path)
+
+    with patch.object(sys, "path", ["", *sys.path]):
+        _plugin_for("python")
+        (tmp_path / "input.txt").write_text("42")
+        _plugin_for("python")
+
+    assert fetch.call_count == 1
+
+
+def test_plugin_cache_ignores_corrupt_cache(fake_plugins):
+    _, fetch = fake_plugins
+    _plugin_for("python")
+    _plugins._cache_file().write_text("{")
+
+    assert _plugin_for("python").LANGUAGE == "Python"
+    assert fetch.call_count == 2
+
+
+def test_plugin_unknown_language(fake_plugins):
+    _, fetch = fake_plugins
+    _plugin_for("python")
+
+    with pytest.raises(HandledError, match="not in list of available languages"):
+        _plugin_for("rust")
+
+    # a missing language always rescans, it may have just been installed
+    assert fetch.call_count == 2
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("os", os), ("os:path", os.path), ("os : path.sep", os.path.sep)],
+)
+def test_load_entry_point(value, expected):
+    assert _plugins._load_entry_point(value) is expected
@@ -0,0 +1,77 @@
+import pstats
+
+import pytest
+
+from slh._profile import profile_from_stacks
+from slh._profile import profile_solution
+from slh._profile import Profiler
+
+
+def _inner(n):
+    return sum(i * i for i in range(n))
+
+
+def _solution(inputfile):
+    return _inner(int(inputfile.read_text()))
+
+
+@pytest.fixture
+def inputfile(tmp_path):
+    inputfile = tmp_path / "input.txt"
+    inputfile.write_text("100000")
+    return inputfile
+
+
+def test_profile_solution_cprofile(tmp_path, inputfile):
+    profile = profile_solution(
+        _solution, inputfile, Profiler.CPROFILE, tmp_path / "part1"
+    )
+
+    assert profile.path == tmp_path / "part1.pstats"
+    assert profile.samples is None
+    stats = pstats.Stats(str(profile.path))
+    assert any(func == "_inner" for _, _, func in stats.stats)  # type: ignore
+    assert any("<genexpr>" in hot.name for hot in profile.hot_functions)
+
+
+def test_profile_solution_sampling(tmp_path, inputfile):
+    profile = profile_solution(
+        _solution,
+        inputfile,
+        Profiler.SAMPLING,
+        tmp_path / "part1",
+        root=tmp_path.parent,
+    )
+
+    assert profile.path == tmp_path / "part1.collapsed"
+    assert profile.samples
+    lines = profile.path.read_text().splitlines()
+    assert sum(int(line.rpartition(" ")[2]) for line in lines) == profile.samples
+    # stacks start at the solution, not at the profiling machinery
+    assert all(line.startswith("_solution (") for line in lines)
+    assert any("_inner.<locals>.<genexpr> (" in h.name for h in profile.hot_functions)
+
+
+def test_profile_from_stacks(tmp_path):
+    stacks = {"main;parse": 1, "main;solve;step": 6, "main;solve": 2, "main": 1}
+
+    profile = profile_from_stacks(stacks, tmp_path / "part2")
+
+    assert profile.path.read_text() == (
+        "main 1\nmain;parse 1\nmain;solve 2\nmain;solve;step 6\n"
+    )
+    assert profile.samples == 10
+    assert [(h.name, h.own, h.total) for h in profile.hot_functions] == [
+        ("step", 0.6, 0.6),
+        ("solve", 0.2, 0.8),
+        ("parse", 0.1, 0.1),
+        ("main", 0.1, 1.0),
+    ]
+
+
+def test_profile_from_stacks_recursion_counted_once(tmp_path):
+    profile = profile_from_stacks({"f;f;f": 2}, tmp_path / "part1")
+
+    assert [(h.name, h.own, h.total) for h in profile.hot_functions] == [
+        ("f", 1.0, 1.0)
+    ]
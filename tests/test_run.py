@@ -1,6 +1,25 @@
+import functools
+import multiprocessing
+import runpy
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import Mock
+from unittest.mock import patch
+
 import pytest
 
+from slh import run
+from slh._daypart import DayPart
+from slh._history import load_entries
+from slh._profile import Profiler
+from slh._supervise import Limits
+from slh.run import _benchmark_natively
 from slh.run import _format_duration
+from slh.run import benchmark_solution
+from slh.run import BenchmarkOptions
+from slh.run import Cancelled
+from slh.run import Finished
+from slh.run import run_selections
 
 
 @pytest.mark.parametrize(
@@ -23,3 +42,489 @@ from slh.run import _format_duration
 )
 def test_format_duration(duration_ns: int, expected: str):
     assert _format_duration(duration_ns) == expected
+
+
+def _counting_solution():
+    calls = []
+
+    def solution(inputfile):
+        calls.append(inputfile)
+        return 42
+
+    return solution, calls
+
+
+def test_benchmark_solution_single_run_has_no_samples():
+    solution, calls = _counting_solution()
+
+    result = benchmark_solution(solution, Path("input.txt"))
+
+    assert isinstance(result, Finished)
+    assert result.result == 42
+    assert result.samples == []
+    assert len(calls) == 1
+
+
+def test_benchmark_solution_runs_warmup_and_count():
+    solution, calls = _counting_solution()
+
+    result = benchmark_solution(
+        solution, Path("input.txt"), BenchmarkOptions(count=5, warmup=3)
+    )
+
+    assert isinstance(result, Finished)
+    assert len(result.samples) == 5
+    assert len(calls) == 8
+
+
+def _fake_clock(durations_ns):
+    """
+    Replaces time.monotonic_ns so that consecutive
+    time_it calls measure the provided durations.
+    """
+    now = 0
+    ticks = []
+    for duration in durations_ns:
+        ticks.extend((now, now + duration))
+        now += duration
+    return patch.object(run.time, "monotonic_ns", side_effect=ticks)
+
+
+def test_benchmark_solution_duration_is_median():
+    with _fake_clock([10, 30, 20, 1_000, 20, 10]):
+        result = benchmark_solution(
+            lambda _: 1, Path("input.txt"), BenchmarkOptions(count=6)
+        )
+
+    assert isinstance(result, Finished)
+    assert result.samples == [10, 30, 20, 1_000, 20, 10]
+    # 1_000 is rejected as an outlier
+    assert result.duration == 20
+
+
+def test_benchmark_solution_adaptive_stops_when_stable():
+    with _fake_clock([5] * 100):
+        result = benchmark_solution(
+            lambda _: 1,
+            Path("input.txt"),
+            BenchmarkOptions(count=3, adaptive=True, max_count=100),
+        )
+
+    assert isinstance(result, Finished)
+    assert len(result.samples) == 3
+
+
+def test_benchmark_solution_adaptive_stops_at_max_count():
+    with _fake_clock([1_000, 3_000] * 50):
+        result = benchmark_solution(
+            lambda _: 1,
+            Path("input.txt"),
+            BenchmarkOptions(count=3, adaptive=True, ci=0.001, max_count=10),
+        )
+
+    assert isinstance(result, Finished)
+    assert len(result.samples) == 10
+
+
+def test_benchmark_solution_cancelled():
+    def solution(_):
+        raise KeyboardInterrupt
+
+    result = benchmark_solution(solution, Path("input.txt"), BenchmarkOptions(count=5))
+
+    assert isinstance(result, Cancelled)
+
+
+def _native_timer(durations_ns):
+    """
+    A plugin time_solution handing out the provided durations in batches.
+    """
+    durations = iter(durations_ns)
+    batches = []
+
+    def time_solution(dp, inputfile, count):
+        batches.append(count)
+        return 42, [next(durations) for _ in range(count)]
+
+    return time_solution, batches
+
+
+def test_benchmark_natively_drops_warmup():
+    time_solution, batches = _native_timer([1_000, 10, 30, 20])
+
+    result = _benchmark_natively(
+        time_solution, DayPart(1, 1), BenchmarkOptions(count=3, warmup=1)
+    )
+
+    assert result == Finished(42, 20, [10, 30, 20])
+    assert batches == [4]
+
+
+def test_benchmark_natively_single_run_has_no_samples():
+    time_solution, _ = _native_timer([10])
+
+    result = _benchmark_natively(time_solution, DayPart(1, 1), BenchmarkOptions())
+
+    assert result == Finished(42, 10)
+
+
+def test_benchmark_natively_adaptive_times_in_batches():
+    time_solution, batches = _native_timer([1_000, 3_000] * 50)
+
+    result = _benchmark_natively(
+        time_solution,
+        DayPart(1, 1),
+        BenchmarkOptions(count=4, adaptive=True, ci=0.001, max_count=10),
+    )
+
+    assert isinstance(result, Finished)
+    assert len(result.samples) == 10
+    assert batches == [4, 4, 2]
+
+
+def test_benchmark_natively_ticks_every_call():
+    time_solution, batches = _native_timer([1_000, 10, 30, 20])
+    ticks = []
+
+    result = _benchmark_natively(
+        time_solution,
+        DayPart(1, 1),
+        BenchmarkOptions(count=3, warmup=1),
+        lambda: ticks.append(len(batches)),
+    )
+
+    assert result == Finished(42, 20, [10, 30, 20])
+    assert batches == [1, 1, 1, 1]
+    assert ticks == [0, 1, 2, 3]
+
+
+def test_benchmark_natively_declined():
+    result = _benchmark_natively(
+        lambda dp, inputfile, count: None, DayPart(1, 1), BenchmarkOptions()
+    )
+
+    assert result is None
+
+
+def test_benchmark_natively_cancelled():
+    def time_solution(dp, inputfile, count):
+        raise KeyboardInterrupt
+
+    result = _benchmark_natively(time_solution, DayPart(1, 1), BenchmarkOptions())
+
+    assert isinstance(result, Cancelled)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"count": 0},
+        {"warmup": -1},
+        {"ci": 0},
+        {"count": 10, "adaptive": True, "max_count": 5},
+    ],
+    ids=repr,
+)
+def test_benchmark_options_validation(kwargs):
+    with pytest.raises(ValueError):
+        BenchmarkOptions(**kwargs)
+
+
+@pytest.fixture
+def mock_plugin():
+    with patch.object(run, "plugin") as mock:
+        mock.return_value.LANGUAGE = "python"
+        mock.return_value.load_solution.return_value = lambda _: 42
+        # optional capabilities
+        del mock.return_value.build_solutions
+        del mock.return_value.sample_solution
+        del mock.return_value.time_solution
+        del mock.return_value.measure_peak_rss
+        yield mock.return_value
+
+
+def _solved(dp: DayPart, answer: str) -> DayPart:
+    dp.outdir.mkdir(parents=True, exist_ok=True)
+    dp.solutionfile.write_text(answer)
+    dp.mark_solved()
+    return dp
+
+
+def test_run_selections_reports_in_order(rootdir, mock_plugin, capsys):
+    selections = [_solved(DayPart(1, 1), "42"), _solved(DayPart(1, 2), "7")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        rtc = run_selections(selections)
+
+    assert rtc == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("🔔 (01/1)") and lines[0].endswith("✅")
+    assert lines[1].startswith("🔔 (01/2)") and lines[1].endswith("❌")
+
+
+def test_run_selections_reports_load_duration(rootdir, mock_plugin, capsys):
+    selections = [_solved(DayPart(1, 1), "42")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        run_selections(selections)
+
+    assert ", load = " in capsys.readouterr().out
+
+
+def test_run_selections_times_natively(rootdir, mock_plugin, capsys):
+    mock_plugin.time_solution = lambda dp, inputfile, count: (42, [7] * count)
+    selections = [_solved(DayPart(1, 1), "42")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        run_selections(selections, benchmark=BenchmarkOptions(count=3))
+
+    lines = capsys.readouterr().out.splitlines()
+    assert "duration =   7.0 ns" in lines[0]
+    assert lines[1].startswith("    📊 min = 7.0 ns")
+    [entry] = load_entries()
+    assert entry.samples == (7, 7, 7)
+
+
+def test_run_selections_times_natively_when_supervised(rootdir, mock_plugin, capsys):
+    mock_plugin.time_solution = lambda dp, inputfile, count: (42, [7] * count)
+    selections = [_solved(DayPart(1, 1), "42")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        run_selections(
+            selections, benchmark=BenchmarkOptions(count=3), limits=Limits(timeout=5)
+        )
+
+    assert "duration =   7.0 ns" in capsys.readouterr().out
+    [entry] = load_entries()
+    assert entry.samples == (7, 7, 7)
+
+
+def test_run_selections_builds_ahead(rootdir, mock_plugin, capsys):
+    mock_plugin.build_solutions = Mock(return_value=2)
+    selections = [_solved(DayPart(1, 1), "42"), _solved(DayPart(1, 2), "7")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        run_selections(selections)
+
+    mock_plugin.build_solutions.assert_called_once_with(selections)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("🔨 built 2 solution(s) in ")
+    assert lines[1].startswith("🔔 (01/1)")
+
+
+def test_run_selections_builds_ahead_up_to_date(rootdir, mock_plugin, capsys):
+    mock_plugin.build_solutions = Mock(return_value=0)
+    selections = [_solved(DayPart(1, 1), "42")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        run_selections(selections)
+
+    mock_plugin.build_solutions.assert_called_once_with(selections)
+    assert capsys.readouterr().out.startswith("🔔 (01/1)")
+
+
+def test_run_selections_records_history(rootdir, mock_plugin):
+    selections = [_solved(DayPart(1, 1), "42")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        run_selections(selections, benchmark=BenchmarkOptions(count=3))
+
+    (entry,) = load_entries()
+    assert entry.daypart == DayPart(1, 1)
+    assert entry.language == "python"
+    assert len(entry.samples) == 3
+
+
+def test_run_selections_skips_history_of_wrong_answers(rootdir, mock_plugin):
+    selections = [_solved(DayPart(1, 1), "42"), _solved(DayPart(1, 2), "7")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        run_selections(selections)
+
+    (entry,) = load_entries()
+    assert entry.daypart == DayPart(1, 1)
+
+
+def test_run_selections_invalid_jobs(mock_plugin):
+    with pytest.raises(ValueError):
+        run_selections([], jobs=0)
+
+
+def _fake_execute(dp, benchmark, limits=None, memory=False, profile=None):
+    return Finished(dp.day * 10 + dp.part, 1)
+
+
+@pytest.mark.parametrize("serial_timing", [False, True])
+def test_schedule_in_pool(serial_timing):
+    dayparts = [DayPart(1, 1), DayPart(1, 2), DayPart(2, 1)]
+
+    with (
+        patch.object(run, "_execute", _fake_execute),
+        patch.object(run, "_load", return_value=7) as mock_load,
+        ThreadPoolExecutor(2) as pool,
+    ):
+        pending = run._schedule(pool, dayparts, BenchmarkOptions(), serial_timing)
+        results = {dp: wait() for dp, wait in pending.items()}
+
+    assert list(results) == dayparts
+    assert [r.result for r in results.values()] == [11, 12, 21]
+    assert mock_load.call_count == (3 if serial_timing else 0)
+    if serial_timing:
+        assert all(r.load_duration == 7 for r in results.values())
+
+
+_forks_workers = pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="the pool's workers need to inherit the mocked plugin",
+)
+
+
+def _fails_on_day2(dp):
+    def solution(_):
+        if dp.day == 2:
+            raise KeyError("nope")
+        return 42
+
+    return solution
+
+
+@_forks_workers
+def test_run_selections_in_process_pool(rootdir, mock_plugin, capsys):
+    mock_plugin.load_solution.side_effect = _fails_on_day2
+    selections = [
+        _solved(DayPart(1, 1), "42"),
+        _solved(DayPart(1, 2), "7"),
+        DayPart(2, 1),
+    ]
+
+    with patch.object(DayPart, "is_solved", lambda dp: dp.day == 1):
+        rtc = run_selections(selections, jobs=2, limits=Limits(timeout=5))
+
+    assert rtc == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("🔔 (01/1)") and lines[0].endswith("✅")
+    assert lines[1].startswith("🔔 (01/2)") and lines[1].endswith("❌")
+    assert "problem is unsolved" in lines[2]
+    (entry,) = load_entries()
+    assert entry.daypart == DayPart(1, 1)
+
+
+@_forks_workers
+def test_run_selections_in_process_pool_reraises(rootdir, mock_plugin):
+    mock_plugin.load_solution.side_effect = _fails_on_day2
+    selections = [_solved(DayPart(1, 1), "42"), _solved(DayPart(2, 1), "42")]
+
+    with (
+        patch.object(DayPart, "is_solved", return_value=True),
+        pytest.raises(KeyError),
+    ):
+        run_selections(selections, jobs=2)
+
+
+def test_run_selections_memory(rootdir, mock_plugin, capsys):
+    selections = [_solved(DayPart(1, 1), "42")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        rtc = run_selections(selections, memory=True)
+
+    assert rtc == 0
+    assert ", peak = " in capsys.readouterr().out
+    (entry,) = load_entries()
+    assert entry.peak_memory is not None and entry.peak_memory > 0
+
+
+def test_run_selections_memory_measured_by_plugin(rootdir, mock_plugin, capsys):
+    mock_plugin.measure_peak_rss = lambda dp, inputfile: 3 * 2**20
+    selections = [_solved(DayPart(1, 1), "42")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        rtc = run_selections(selections, memory=True)
+
+    assert rtc == 0
+    assert ", peak =    3.0 MiB" in capsys.readouterr().out
+    (entry,) = load_entries()
+    assert entry.peak_memory == 3 * 2**20
+
+
+_SOLVE_SOURCE = """\
+def solve(inputdata):
+    data = [bytes(1000) for _ in range(1000)]
+    return 42 + len(data) - 1000
+"""
+
+
+def _load_solve(dp: DayPart):
+    # a solution file under the rootdir, where allocation sites are listed
+    partfile = dp.outdir / f"part{dp.part}.py"
+    partfile.parent.mkdir(parents=True, exist_ok=True)
+    partfile.write_text(_SOLVE_SOURCE)
+    return runpy.run_path(str(partfile))["solve"]
+
+
+def test_run_selections_memory_traces_python(rootdir, mock_plugin, capsys):
+    solve = _load_solve(DayPart(1, 1))
+
+    @functools.wraps(solve)
+    def solution(_):
+        # e.g. reading the input, not part of the solution
+        inputdata = bytes(2 * 10**6)
+        return solve(inputdata)
+
+    mock_plugin.load_solution.return_value = solution
+    selections = [_solved(DayPart(1, 1), "42")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        rtc = run_selections(selections, memory=True)
+
+    assert rtc == 0
+    out = capsys.readouterr().out
+    assert "🧠 traced python peak = " in out
+    assert "day01/part1.py:2" in out
+    assert f"{Path(__file__).name}:" not in out
+
+
+def test_run_selections_memory_traces_innermost_python(rootdir, mock_plugin, capsys):
+    solve = _load_solve(DayPart(1, 1))
+
+    # e.g. the python plugin's wrapper around a mapped_input solution
+    @functools.wraps(solve)
+    def mapped(inputdata):
+        return solve(inputdata)
+
+    @functools.wraps(mapped)
+    def solution(_):
+        return mapped("")
+
+    mock_plugin.load_solution.return_value = solution
+    selections = [_solved(DayPart(1, 1), "42")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        run_selections(selections, memory=True)
+
+    assert "day01/part1.py:2" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("profiler", list(Profiler))
+def test_run_selections_profile(rootdir, mock_plugin, capsys, profiler):
+    selections = [_solved(DayPart(1, 1), "42")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        rtc = run_selections(selections, profile=profiler)
+
+    assert rtc == 0
+    suffix = ".pstats" if profiler is Profiler.CPROFILE else ".collapsed"
+    assert f"🔥 profile written to day01/part1{suffix}" in capsys.readouterr().out
+    assert (rootdir / "day01" / f"part1{suffix}").exists()
+
+
+def test_run_selections_profile_plugin_sampling(rootdir, mock_plugin, capsys):
+    mock_plugin.sample_solution = lambda dp, inputfile: {"main;solve": 3, "main": 1}
+    selections = [_solved(DayPart(1, 1), "42")]
+
+    with patch.object(DayPart, "is_solved", return_value=True):
+        run_selections(selections, profile=Profiler.SAMPLING)
+
+    out = capsys.readouterr().out
+    assert "day01/part1.collapsed (4 samples)" in out
+    assert "own =  75.0%, total =  75.0%  solve" in out
+    assert "own =  25.0%, total = 100.0%  main" in out
@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+import socket
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from slh import serve
+from slh._random_shit import HandledError
+
+
+def _exchange(run_main, kwargs):
+    """
+    Handle a single request over a socket pair, returning the exit code
+    received by the client. The server is forked as it redirects stdout.
+    """
+    server, client = socket.socketpair()
+    tracker = serve._ModuleTracker(Path("/nonexistent"))
+    proc = multiprocessing.get_context("fork").Process(
+        target=serve._handle, args=(server, tracker, run_main)
+    )
+    proc.start()
+    server.close()
+    try:
+        with client:
+            return serve._request_run(client, kwargs)
+    finally:
+        proc.join()
+
+
+def test_forward_run_relays_output(capsys):
+    def run_main(days, server):
+        assert server is False
+        print(f"days = {days}")
+        print("oops", file=sys.stderr)
+        return 3
+
+    assert _exchange(run_main, {"days": [1, 2]}) == 3
+
+    out, err = capsys.readouterr()
+    assert out == "days = [1, 2]\n"
+    assert err == "oops\n"
+
+
+def test_forward_run_reports_errors(capsys):
+    def run_main(server):
+        raise ValueError("nope")
+
+    assert _exchange(run_main, {}) == 1
+
+    _, err = capsys.readouterr()
+    assert "ValueError: nope" in err
+
+
+def test_forward_run_without_server(tmp_path):
+    with patch.object(serve, "socket_path", return_value=tmp_path / "sock"):
+        with pytest.raises(HandledError, match="slh serve"):
+            serve.forward_run({})
+
+
+def test_listen_replaces_stale_socket(tmp_path):
+    path = tmp_path / "sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+
+    with serve._listen(path):
+        assert path.stat().st_mode & 0o777 == 0o600
+
+
+def test_listen_refuses_second_server(tmp_path):
+    path = tmp_path / "sock"
+
+    with serve._listen(path):
+        with pytest.raises(HandledError, match="already listening"):
+            serve._listen(path)
+
+
+def test_module_tracker_forgets_changed_modules(tmp_path, monkeypatch):
+    (tmp_path / "day01").mkdir()
+    (tmp_path / "day01" / "__init__.py").touch()
+    partfile = tmp_path / "day01" / "part1.py"
+    partfile.write_text("ANSWER = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    tracker = serve._ModuleTracker(tmp_path)
+
+    try:
+        import day01.part1  # type: ignore[import-not-found]
+
+        tracker.record()
+        assert tracker.forget_changed() == []
+        assert day01.part1.ANSWER == 1
+
+        partfile.write_text("ANSWER = 2\n")
+        stat = partfile.stat()
+        os.utime(partfile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert set(tracker.forget_changed()) == {"day01", "day01.part1"}
+        assert "day01.part1" not in sys.modules
+
+        import day01.part1  # type: ignore[import-not-found]  # noqa: F811
+
+        assert day01.part1.ANSWER == 2
+    finally:
+        sys.modules.pop("day01.part1", None)
+        sys.modules.pop("day01", None)
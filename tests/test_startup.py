@@ -0,0 +1,82 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# cumulative import time of the cli, generous to tolerate slow machines
+_STARTUP_BUDGET_US = 150_000
+
+
+# runs the cli with the provided arguments, listing imported modules on stderr
+_LIST_IMPORTS = """
+import sys
+from slh._main import main
+try:
+    main(sys.argv[1:])
+finally:
+    print(*sys.modules, sep="\\n", file=sys.stderr)
+"""
+
+
+def _imported_modules(*argv: str) -> set[str]:
+    proc = subprocess.run(
+        [sys.executable, "-c", _LIST_IMPORTS, *argv],
+        cwd=_REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    return set(proc.stderr.splitlines())
+
+
+def _import_times(*args: str) -> dict[str, int]:
+    """
+    Cumulative import time in μs of every module imported by
+    `python -X importtime *args`.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=_REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "slh.next",
+        "slh.serve",
+        "slh.submit",
+        "urllib.request",
+        "html.parser",
+    ],
+)
+def test_run_does_not_import_other_commands(module):
+    modules = _imported_modules("run", "--help")
+
+    assert "slh.run" in modules
+    assert module not in modules
+
+
+def test_help_does_not_import_commands():
+    modules = _imported_modules("--help")
+
+    assert "slh._main" in modules
+    assert not {"slh.next", "slh.run", "slh.serve", "slh.submit"} & modules
+
+
+def test_startup_within_budget():
+    best = min(_import_times("-c", "import slh._main")["slh"] for _ in range(3))
+
+    assert best < _STARTUP_BUDGET_US
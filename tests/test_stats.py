@@ -0,0 +1,96 @@
+import math
+
+import pytest
+
+from slh._stats import percentile
+from slh._stats import reject_outliers
+from slh._stats import summarize
+from slh._stats import Summary
+
+
+def test_summary_statistics():
+    summary = Summary((4, 1, 3, 2, 5))
+
+    assert summary.count == 5
+    assert summary.min == 1
+    assert summary.max == 5
+    assert summary.mean == 3
+    assert summary.median == 3
+    assert summary.stddev == pytest.approx(math.sqrt(2.5))
+    assert summary.p95 == pytest.approx(4.8)
+
+
+def test_summary_single_sample():
+    summary = Summary((7,))
+
+    assert summary.stddev == 0
+    assert summary.p95 == 7
+    assert summary.ci_halfwidth() == math.inf
+
+
+def test_summary_ci_halfwidth():
+    summary = Summary((10, 12, 14))
+
+    # t(df=2) = 4.303, stddev = 2
+    assert summary.ci_halfwidth() == pytest.approx(4.303 * 2 / math.sqrt(3))
+    assert summary.relative_ci_halfwidth() == pytest.approx(
+        4.303 * 2 / math.sqrt(3) / 12
+    )
+
+
+def test_summary_ci_uses_normal_approximation_for_many_samples():
+    samples = tuple(range(100))
+    summary = Summary(samples)
+
+    assert summary.ci_halfwidth() == pytest.approx(1.96 * summary.stddev / 10)
+
+
+def test_summary_constant_samples_are_precise():
+    assert Summary((0, 0, 0)).relative_ci_halfwidth() == 0
+    assert Summary((5, 5, 5)).relative_ci_halfwidth() == 0
+
+
+def test_reject_outliers():
+    kept, rejected = reject_outliers([10, 11, 12, 10, 11, 500])
+
+    assert kept == [10, 11, 12, 10, 11]
+    assert rejected == [500]
+
+
+def test_reject_outliers_needs_enough_samples():
+    kept, rejected = reject_outliers([1, 2, 1_000])
+
+    assert kept == [1, 2, 1_000]
+    assert rejected == []
+
+
+def test_summarize_drops_outliers():
+    summary = summarize([10, 11, 12, 10, 11, 500])
+
+    assert summary.samples == (10, 11, 12, 10, 11)
+    assert summary.outliers == 1
+
+
+def test_summarize_keep_outliers():
+    summary = summarize([10, 11, 12, 10, 11, 500], outliers=False)
+
+    assert summary.count == 6
+    assert summary.outliers == 0
+
+
+def test_summarize_empty():
+    with pytest.raises(ValueError):
+        summarize([])
+
+
+@pytest.mark.parametrize(
+    ("pct", "expected"),
+    [(0, 1), (50, 2.5), (100, 4), (25, 1.75)],
+)
+def test_percentile(pct, expected):
+    assert percentile([4, 2, 3, 1], pct) == pytest.approx(expected)
+
+
+def test_percentile_out_of_range():
+    with pytest.raises(ValueError):
+        percentile([1, 2], 101)
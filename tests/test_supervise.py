@@ -0,0 +1,157 @@
+import os
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from slh._supervise import Limits
+from slh._supervise import MemoryLimitExceeded
+from slh._supervise import run_supervised
+from slh._supervise import TimeLimitExceeded
+
+
+def _add(supervisor, a, b):
+    supervisor.arm()
+    supervisor.tick()
+    return a + b
+
+
+def _raise(supervisor):
+    raise KeyError("nope")
+
+
+def _sleep(supervisor, setup, run):
+    time.sleep(setup)
+    supervisor.arm()
+    supervisor.tick()
+    time.sleep(run)
+    return "done"
+
+
+def _allocate(supervisor, nbytes):
+    supervisor.arm()
+    supervisor.tick()
+    return len(bytearray(nbytes))
+
+
+def _allocate_and_fail(supervisor, nbytes, command):
+    supervisor.arm()
+    supervisor.tick()
+    data = bytearray(nbytes)
+    data[::4096] = b"x" * len(data[::4096])
+    subprocess.run(command, check=True)
+
+
+def _peak_rss(supervisor):
+    supervisor.arm()
+    return supervisor.peak_rss()
+
+
+def _spawn_and_wait(supervisor, pidfile):
+    supervisor.arm()
+    supervisor.tick()
+    proc = subprocess.Popen(["sleep", "30"])
+    pidfile.write_text(str(proc.pid))
+    proc.wait()
+
+
+def test_run_supervised_returns_result():
+    assert run_supervised(_add, 1, 2, limits=Limits(timeout=5)) == 3
+
+
+def test_run_supervised_reraises_errors():
+    with pytest.raises(KeyError):
+        run_supervised(_raise, limits=Limits(timeout=5))
+
+
+def test_run_supervised_timeout():
+    start = time.monotonic()
+    with pytest.raises(TimeLimitExceeded):
+        run_supervised(_sleep, 0, 30, limits=Limits(timeout=0.2))
+
+    assert time.monotonic() - start < 5
+
+
+def test_run_supervised_setup_is_not_timed():
+    assert run_supervised(_sleep, 0.5, 0, limits=Limits(timeout=0.2)) == "done"
+
+
+def test_run_supervised_memory_limit():
+    with pytest.raises(MemoryLimitExceeded):
+        run_supervised(_allocate, 2**34, limits=Limits(max_memory=2**30))
+
+
+def test_run_supervised_setup_errors_are_not_out_of_memory():
+    # the child's inherited memory alone is well over twice the limit
+    with pytest.raises(KeyError):
+        run_supervised(_raise, limits=Limits(max_memory=2**20))
+
+
+@pytest.mark.parametrize("signal", ["SEGV", "ABRT", "KILL"])
+def test_run_supervised_subprocess_crash_near_memory_limit(signal):
+    with pytest.raises(MemoryLimitExceeded):
+        run_supervised(
+            _allocate_and_fail,
+            2**28,
+            ["sh", "-c", f"kill -{signal} $$"],
+            limits=Limits(max_memory=2**29),
+        )
+
+
+@pytest.mark.parametrize(
+    ("command", "error"),
+    [
+        (["sh", "-c", "exit 1"], subprocess.CalledProcessError),
+        (["does-not-exist"], FileNotFoundError),
+    ],
+)
+def test_run_supervised_errors_near_memory_limit_are_not_out_of_memory(
+    command, error
+):
+    with pytest.raises(error):
+        run_supervised(
+            _allocate_and_fail,
+            2**28,
+            command,
+            limits=Limits(max_memory=2**29),
+        )
+
+
+def test_run_supervised_peak_excludes_parent():
+    data = bytearray(2**27)
+    data[::4096] = b"x" * len(data[::4096])
+
+    assert run_supervised(_peak_rss, limits=Limits()) < 2**26
+
+
+def test_run_supervised_kills_subprocesses(tmp_path):
+    pidfile = tmp_path / "pid"
+    with pytest.raises(TimeLimitExceeded):
+        run_supervised(_spawn_and_wait, pidfile, limits=Limits(timeout=0.2))
+
+    pid = int(pidfile.read_text())
+    for _ in range(100):
+        if not _is_running(pid):
+            break
+        time.sleep(0.01)
+    else:
+        pytest.fail("subprocess was not killed")
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # killed but not yet reaped
+    stat = Path(f"/proc/{pid}/stat")
+    return not stat.exists() or stat.read_text().split()[2] != "Z"
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"timeout": 0}, {"timeout": -1}, {"max_memory": 0}], ids=repr
+)
+def test_limits_validation(kwargs):
+    with pytest.raises(ValueError):
+        Limits(**kwargs)